@@ -5,7 +5,7 @@
 bl_info = {
     "name": "Star",
     "author": "Your Name",
-    "version": (0, 0, 2),
+    "version": (0, 0, 3),
     "blender": (5, 0, 0),
     "location": "Object > Add",
     "description": "Add a star shaped mesh to the scene",
@@ -14,9 +14,11 @@ bl_info = {
 
 from math import pi, sin, cos
 import bpy
+import gpu
 from bpy.types import Operator
 from bpy.props import IntProperty, FloatProperty
 from bpy_extras.object_utils import object_data_add
+from mathutils import Vector
 
 # help function to check that that the outer radius is
 # always larger than the inner radius.
@@ -109,6 +111,209 @@ class OBJECT_OT_add_star(Operator):
         return context.mode == "OBJECT"
 
 
+# Every change in the redo panel of the operator above undoes it and runs it again,
+# creating a new mesh each time. The operator below lets you size the star with the
+# mouse instead, while only its outline is drawn as an overlay, and adds the mesh
+# just once, when the star is placed. The outline is one batch that is kept between
+# redraws: moving the mouse only refills its vertex buffer, and only a different
+# number of points needs a new one. The shader is created the first time it is
+# needed, so the add-on can still be enabled in background mode.
+preview_shader = None
+PREVIEW_COLOR = (1.0, 0.5, 0.0, 1.0)  # orange, like the outline of a selected object
+PREVIEW_WIDTH = 2.0  # pixels
+
+
+def outline_shader():
+    """Return the shader for the outline, creating it the first time."""
+    global preview_shader
+    if preview_shader is None:
+        preview_shader = gpu.shader.from_builtin("POLYLINE_UNIFORM_COLOR")
+    return preview_shader
+
+
+class StarOutline:
+    """The outline of a star, ready to be drawn with a single call."""
+
+    def __init__(self):
+        self.points = 0
+        self.coordinates = None
+        self.batch = None  # GPU resources can only be created while drawing, see upload()
+        self.changed = False
+
+    def update(self, points, inner_radius, outer_radius, center):
+        """
+        Calculate the vertices of the outline, the same ones star_geometry() calculates.
+
+        :param points: The number of points of the star
+        :param inner_radius: The distance from the center to the indented vertices
+        :param outer_radius: The distance from the center to the tips
+        :param center: The location of the star
+        """
+        import numpy as np
+
+        if points != self.points:
+            # the directions of the tips and the indents only change with the number of points
+            angles = np.arange(2 * points) * (pi / points)
+            directions = np.column_stack((-np.sin(angles), np.cos(angles), np.zeros(2 * points)))
+            self.directions = directions.astype(np.float32)  # what the vertex buffer holds
+            self.radii = np.empty((2 * points, 1), dtype=np.float32)
+            self.points = points
+            self.batch = None
+        self.radii[0::2] = outer_radius
+        self.radii[1::2] = inner_radius
+        self.coordinates = self.directions * self.radii + np.array(center, dtype=np.float32)
+        self.changed = True
+
+    def upload(self):
+        """Create the GPU buffers or refresh the vertex buffer if the outline changed."""
+        import numpy as np
+
+        if self.batch is None:
+            count = 2 * self.points
+            fmt = gpu.types.GPUVertFormat()
+            fmt.attr_add(id="pos", comp_type="F32", len=3, fetch_mode="FLOAT")
+            self.vbo = gpu.types.GPUVertBuf(fmt, count)
+            # each vertex is connected to the next one, wrapping around at the end
+            edges = np.column_stack((np.arange(count), np.roll(np.arange(count), -1))).astype(np.int32)
+            ibo = gpu.types.GPUIndexBuf(type="LINES", seq=edges)
+            self.batch = gpu.types.GPUBatch(type="LINES", buf=self.vbo, elem=ibo)
+            self.changed = True
+        if self.changed:
+            self.vbo.attr_fill("pos", self.coordinates)
+            self.changed = False
+
+    def draw(self, color, width):
+        """Draw the outline."""
+        self.upload()
+        shader = outline_shader()
+        shader.bind()
+        shader.uniform_float("color", color)
+        shader.uniform_float("viewportSize", gpu.state.viewport_get()[2:])
+        shader.uniform_float("lineWidth", width)
+        self.batch.draw(shader)
+
+
+def draw_outline(outline):
+    """
+    Draw handler of OBJECT_OT_add_star_interactive, while it is running.
+
+    It gets the StarOutline and not the operator, because if the handler is ever
+    left behind, it must not touch an operator that Blender has already freed.
+    """
+    outline.draw(PREVIEW_COLOR, PREVIEW_WIDTH)
+
+
+class OBJECT_OT_add_star_interactive(Operator):
+    bl_idname = "object.add_star_interactive"
+    bl_label = "Place star"
+    bl_description = (
+        "Size a star at the 3D cursor with the mouse, the wheel changes the number of points, "
+        "shift sets the inner radius"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+
+    points: IntProperty(
+        name="Points",
+        description="Number of points on the star",
+        default=5,
+        min=3,
+    )
+
+    inner_radius: FloatProperty(
+        name="Inner radius",
+        description="Distance from center to indented vertices",
+        default=1.0,
+        min=0.0,
+        update=update_outer_radius,
+    )
+
+    outer_radius: FloatProperty(
+        name="Outer radius",
+        description="Distance from center to point tips",
+        default=1.5,
+        min=0.0,
+        update=update_inner_radius,
+    )
+
+    # the mesh is added exactly like OBJECT_OT_add_star does, at the 3D cursor,
+    # so once placed, the star can be tweaked in the redo panel like any other
+    star_geometry = OBJECT_OT_add_star.star_geometry
+    execute = OBJECT_OT_add_star.execute
+
+    @classmethod
+    def poll(cls, context):
+        """Enable operator only in Object mode, in a 3d view."""
+        return context.mode == "OBJECT" and context.area is not None and context.area.type == "VIEW_3D"
+
+    def invoke(self, context, event):
+        """Start showing the outline at the 3D cursor."""
+        self.center = context.scene.cursor.location.copy()
+        # dragging changes both radii, keeping their ratio
+        self.ratio = self.inner_radius / self.outer_radius if self.outer_radius > 0 else 1.0
+        self.outline = StarOutline()
+        self.handler = bpy.types.SpaceView3D.draw_handler_add(draw_outline, (self.outline,), "WINDOW", "POST_VIEW")
+        self.update(context)
+        context.window_manager.modal_handler_add(self)
+        return {"RUNNING_MODAL"}
+
+    def modal(self, context, event):
+        """Change the star with the mouse, and add it or cancel."""
+        if context.area is None:  # the area we were drawing in was closed
+            return self.finish(context, confirm=False)
+        if event.type == "MOUSEMOVE":
+            distance = self.mouse_distance(context, event)
+            if distance is not None:
+                if event.shift:
+                    self.inner_radius = min(distance, self.outer_radius)
+                    self.ratio = self.inner_radius / self.outer_radius if self.outer_radius > 0 else 1.0
+                else:
+                    self.outer_radius = distance
+                    self.inner_radius = distance * self.ratio
+                self.update(context)
+        elif event.type in {"WHEELUPMOUSE", "NUMPAD_PLUS", "WHEELDOWNMOUSE", "NUMPAD_MINUS"} and event.value == "PRESS":
+            step = 10 if event.ctrl else 1
+            self.points = max(self.points + (step if event.type in {"WHEELUPMOUSE", "NUMPAD_PLUS"} else -step), 3)
+            self.update(context)
+        elif event.type in {"LEFTMOUSE", "RET", "NUMPAD_ENTER"} and event.value == "PRESS":
+            return self.finish(context, confirm=True)
+        elif event.type in {"RIGHTMOUSE", "ESC"} and event.value == "PRESS":
+            return self.finish(context, confirm=False)
+        elif event.type in {"MIDDLEMOUSE", "TRACKPADPAN", "TRACKPADZOOM"}:
+            return {"PASS_THROUGH"}  # let the view be navigated
+        return {"RUNNING_MODAL"}
+
+    def mouse_distance(self, context, event):
+        """Return the distance from the center to the mouse, in the horizontal plane through the center, or None."""
+        from bpy_extras.view3d_utils import region_2d_to_origin_3d, region_2d_to_vector_3d
+        from mathutils.geometry import intersect_line_plane
+
+        coord = (event.mouse_region_x, event.mouse_region_y)
+        origin = region_2d_to_origin_3d(context.region, context.region_data, coord)
+        direction = region_2d_to_vector_3d(context.region, context.region_data, coord)
+        location = intersect_line_plane(origin, origin + direction, self.center, Vector((0, 0, 1)))
+        return None if location is None else (location - self.center).length
+
+    def update(self, context):
+        """Recalculate the outline and redraw."""
+        self.outline.update(self.points, self.inner_radius, self.outer_radius, self.center)
+        context.area.header_text_set(
+            f"Points: {self.points}  Outer radius: {self.outer_radius:.3f}  Inner radius: {self.inner_radius:.3f}"
+        )
+        context.area.tag_redraw()
+
+    def finish(self, context, confirm):
+        """Stop showing the outline, and add the star if confirmed."""
+        bpy.types.SpaceView3D.draw_handler_remove(self.handler, "WINDOW")
+        if context.area is not None:
+            context.area.header_text_set(None)
+            context.area.tag_redraw()
+        return self.execute(context) if confirm else {"CANCELLED"}
+
+    def cancel(self, context):
+        """Called by Blender instead of modal() when it stops the operator itself, for example when a file is loaded."""
+        self.finish(context, confirm=False)
+
+
 # Note: best practice is to put all imports at the beginning
 # but we want make a clear distinction between operator
 # implementation and registration.
@@ -120,17 +325,20 @@ from bpy.types import VIEW3D_MT_add
 def menu_func(self, context):
     """Add the star operator to the Object menu."""
     self.layout.operator(OBJECT_OT_add_star.bl_idname)
+    self.layout.operator(OBJECT_OT_add_star_interactive.bl_idname)
 
 
 def register():
     """Register the add-on classes and menu."""
     register_class(OBJECT_OT_add_star)
+    register_class(OBJECT_OT_add_star_interactive)
     VIEW3D_MT_add.append(menu_func)
 
 
 def unregister():
     """Unregister the add-on classes and menu."""
     VIEW3D_MT_add.remove(menu_func)
+    unregister_class(OBJECT_OT_add_star_interactive)
     unregister_class(OBJECT_OT_add_star)
 
 
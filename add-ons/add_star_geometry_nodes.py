@@ -0,0 +1,263 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+bl_info = {
+    "name": "Star",
+    "author": "Your Name",
+    "version": (0, 0, 5),
+    "blender": (5, 0, 0),
+    "location": "Object > Add",
+    "description": "Add a star shaped mesh to the scene",
+    "category": "Object",
+}
+
+import bpy
+from bpy.types import Operator
+from bpy.props import IntProperty, FloatProperty
+from bpy_extras.object_utils import object_data_add
+
+# help function to check that that the outer radius is
+# always larger than the inner radius.
+# Note that the comparisons are strict, i.e. do NOT
+# check for equality to prevent infinite recursion!
+
+
+def update_outer_radius(self, context):
+    """make sure outer radius > inner radius"""
+    if self.inner_radius > self.outer_radius:
+        self.outer_radius = self.inner_radius
+
+
+def update_inner_radius(self, context):
+    """make sure inner radius <= outer radius"""
+    if self.outer_radius < self.inner_radius:
+        self.inner_radius = self.outer_radius
+
+
+# all stars in a file share a single node group with this name
+NODE_GROUP_NAME = "Star"
+
+
+def star_node_group():
+    """
+    Return the geometry nodes tree that generates a star, creating it if needed.
+
+    :return: The node group
+    :rtype: bpy.types.GeometryNodeTree
+
+    The tree is created only once per file; every star object gets a
+    Geometry Nodes modifier that points to it and only differs in the
+    values of the Points, Inner radius and Outer radius inputs.
+
+    The nodes build the same geometry as add_star.py: a circle with twice
+    as many vertices as points, where every even vertex is moved to the
+    outer radius and every odd vertex to the inner radius. A uv map is
+    stored as a top down projection.
+    """
+    node_group = bpy.data.node_groups.get(NODE_GROUP_NAME)
+    if node_group is not None and node_group.bl_idname == "GeometryNodeTree":
+        return node_group
+
+    node_group = bpy.data.node_groups.new(NODE_GROUP_NAME, "GeometryNodeTree")
+    node_group.is_modifier = True
+
+    # the interface defines the sockets that show up in the modifier panel
+    interface = node_group.interface
+    interface.new_socket(name="Geometry", in_out="OUTPUT", socket_type="NodeSocketGeometry")
+    points = interface.new_socket(name="Points", in_out="INPUT", socket_type="NodeSocketInt")
+    points.default_value = 5
+    points.min_value = 3
+    inner = interface.new_socket(name="Inner radius", in_out="INPUT", socket_type="NodeSocketFloat")
+    inner.default_value = 1.0
+    inner.min_value = 0.0
+    outer = interface.new_socket(name="Outer radius", in_out="INPUT", socket_type="NodeSocketFloat")
+    outer.default_value = 1.5
+    outer.min_value = 0.0
+
+    nodes = node_group.nodes
+    links = node_group.links
+
+    group_input = nodes.new("NodeGroupInput")
+    group_output = nodes.new("NodeGroupOutput")
+
+    # vertices = 2 * points
+    double = nodes.new("ShaderNodeMath")
+    double.operation = "MULTIPLY"
+    double.inputs[1].default_value = 2
+    links.new(group_input.outputs["Points"], double.inputs[0])
+
+    circle = nodes.new("GeometryNodeMeshCircle")
+    circle.fill_type = "NGON"
+    circle.inputs["Radius"].default_value = 1.0
+    links.new(double.outputs[0], circle.inputs["Vertices"])
+
+    # index % 2 is 0 for tips and 1 for the indented vertices
+    index = nodes.new("GeometryNodeInputIndex")
+    odd = nodes.new("ShaderNodeMath")
+    odd.operation = "MODULO"
+    odd.inputs[1].default_value = 2
+    links.new(index.outputs[0], odd.inputs[0])
+
+    # radius = odd * (inner - outer) + outer
+    difference = nodes.new("ShaderNodeMath")
+    difference.operation = "SUBTRACT"
+    links.new(group_input.outputs["Inner radius"], difference.inputs[0])
+    links.new(group_input.outputs["Outer radius"], difference.inputs[1])
+    radius = nodes.new("ShaderNodeMath")
+    radius.operation = "MULTIPLY_ADD"
+    links.new(odd.outputs[0], radius.inputs[0])
+    links.new(difference.outputs[0], radius.inputs[1])
+    links.new(group_input.outputs["Outer radius"], radius.inputs[2])
+
+    # the circle has radius 1, so scaling the position by the radius puts it in place
+    position = nodes.new("GeometryNodeInputPosition")
+    scale = nodes.new("ShaderNodeVectorMath")
+    scale.operation = "SCALE"
+    links.new(position.outputs[0], scale.inputs[0])
+    links.new(radius.outputs[0], scale.inputs["Scale"])
+
+    set_position = nodes.new("GeometryNodeSetPosition")
+    links.new(circle.outputs["Mesh"], set_position.inputs["Geometry"])
+    links.new(scale.outputs[0], set_position.inputs["Position"])
+
+    # uv = position.xy / (2 * outer radius) + 0.5, just like planar_uv() in add_star_with_operators.py
+    uv_factor = nodes.new("ShaderNodeMath")
+    uv_factor.operation = "DIVIDE"
+    uv_factor.inputs[0].default_value = 0.5
+    links.new(group_input.outputs["Outer radius"], uv_factor.inputs[1])
+    uv_position = nodes.new("GeometryNodeInputPosition")
+    uv_scale = nodes.new("ShaderNodeVectorMath")
+    uv_scale.operation = "SCALE"
+    links.new(uv_position.outputs[0], uv_scale.inputs[0])
+    links.new(uv_factor.outputs[0], uv_scale.inputs["Scale"])
+    uv_offset = nodes.new("ShaderNodeVectorMath")
+    uv_offset.operation = "ADD"
+    uv_offset.inputs[1].default_value = (0.5, 0.5, 0.0)
+    links.new(uv_scale.outputs[0], uv_offset.inputs[0])
+
+    store_uv = nodes.new("GeometryNodeStoreNamedAttribute")
+    store_uv.data_type = "FLOAT2"
+    store_uv.domain = "CORNER"
+    store_uv.inputs["Name"].default_value = "UVMap"
+    links.new(set_position.outputs["Geometry"], store_uv.inputs["Geometry"])
+    links.new(uv_offset.outputs[0], store_uv.inputs["Value"])
+
+    links.new(store_uv.outputs["Geometry"], group_output.inputs["Geometry"])
+
+    # not needed for anything but it makes the tree readable if you open it in the node editor
+    for column, node in enumerate(
+        (group_input, double, circle, set_position, store_uv, group_output)
+    ):
+        node.location = (column * 200, 0)
+    for column, node in enumerate((index, odd, difference, radius, scale), start=1):
+        node.location = (column * 200 - 100, -250)
+    for column, node in enumerate((uv_factor, uv_position, uv_scale, uv_offset), start=2):
+        node.location = (column * 200 - 100, -500)
+
+    return node_group
+
+
+def set_modifier_input(modifier, name, value):
+    """
+    Set the value of a Geometry Nodes modifier input by its name.
+
+    :param modifier: A Geometry Nodes modifier
+    :param name: The name of the input socket in the node group interface
+    :param value: The new value
+
+    Modifier inputs are stored as id properties keyed by the socket
+    identifier (something like "Socket_1"), not by the visible name.
+    """
+    identifier = modifier.node_group.interface.items_tree[name].identifier
+    modifier[identifier] = value
+
+
+class OBJECT_OT_add_star(Operator):
+    bl_idname = "object.add_star"
+    bl_label = "Add star"
+    bl_description = "Add a star shaped mesh to the scene"
+    bl_options = {"REGISTER", "UNDO"}
+
+    points: IntProperty(
+        name="Points",
+        description="Number of points on the star",
+        default=5,
+        min=3,
+        soft_max=20,
+    )
+
+    inner_radius: FloatProperty(
+        name="Inner radius",
+        description="Distance from center to indented vertices",
+        default=1.0,
+        min=0.001,
+        update=update_outer_radius,
+    )
+
+    outer_radius: FloatProperty(
+        name="Outer radius",
+        description="Distance from center to point tips",
+        default=1.5,
+        min=0.0001,
+        update=update_inner_radius,
+    )
+
+    def execute(self, context):
+        """Create a star object with a Geometry Nodes modifier and some extra modifiers."""
+        # the geometry is generated by the modifier, so the mesh itself stays empty
+        mesh = bpy.data.meshes.new(name="Star")
+        star = object_data_add(context, mesh, operator=None, name=None)
+
+        # the points and radii stay editable in the modifier panel
+        mod = star.modifiers.new(name="Star", type="NODES")
+        mod.node_group = star_node_group()
+        set_modifier_input(mod, "Points", self.points)
+        set_modifier_input(mod, "Inner radius", self.inner_radius)
+        set_modifier_input(mod, "Outer radius", self.outer_radius)
+
+        # add solidify modifier
+        mod = star.modifiers.new(name="Solidify", type="SOLIDIFY")
+        mod.thickness = 0.1
+
+        # add a bevel modifier
+        mod = star.modifiers.new(name="Bevel", type="BEVEL")
+        mod.offset_type = "WIDTH"
+        mod.width = 0.03
+        mod.segments = 5
+
+        return {"FINISHED"}
+
+    @classmethod
+    def poll(cls, context):
+        """Enable operator only in Object mode."""
+        return context.mode == "OBJECT"
+
+
+# Note: best practice is to put all imports at the beginning
+# but we want make a clear distinction between operator
+# implementation and registration.
+
+from bpy.utils import register_class, unregister_class
+from bpy.types import VIEW3D_MT_add
+
+
+def menu_func(self, context):
+    """Add the star operator to the Add menu."""
+    self.layout.operator(OBJECT_OT_add_star.bl_idname)
+
+
+def register():
+    """Register the add-on classes and menu."""
+    register_class(OBJECT_OT_add_star)
+    VIEW3D_MT_add.append(menu_func)
+
+
+def unregister():
+    """Unregister the add-on classes and menu."""
+    VIEW3D_MT_add.remove(menu_func)
+    unregister_class(OBJECT_OT_add_star)
+
+
+if __name__ == "__main__":
+    register()
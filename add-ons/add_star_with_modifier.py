@@ -14,7 +14,11 @@ bl_info = {
 
 import bpy
 from bpy.types import Operator
-from bpy.props import IntProperty, FloatProperty
+from bpy.props import IntProperty, FloatProperty, EnumProperty
+
+# the planar uv map is the same as in the previous version of this add-on, so we import it
+# from there; add_star_with_operators.py has to be installed too, but does not have to be enabled
+from add_star_with_operators import planar_uv
 
 # help function to check that that the outer radius is
 # always larger than the inner radius.
@@ -63,6 +67,16 @@ class OBJECT_OT_add_star(Operator):
         update=update_inner_radius,
     )
 
+    uv_method: EnumProperty(
+        name="UV method",
+        description="How to create the uv map",
+        items=[
+            ("SMART_PROJECT", "Smart project", "Unwrap with the smart project operator"),
+            ("PLANAR", "Planar", "Calculate a top down projection directly (fast for many points)"),
+        ],
+        default="SMART_PROJECT",
+    )
+
     def set_vertex_selection_mode(self):
         """Save current selection mode and switch to vertex selection mode."""
         self.old_selection_modes = [
@@ -96,11 +110,16 @@ class OBJECT_OT_add_star(Operator):
 
         # select all and create a uv map.smart_project even works if the camera is not aligned
         bpy.ops.mesh.select_all(action="SELECT")
-        bpy.ops.uv.smart_project(rotate_method="AXIS_ALIGNED_X")
+        if self.uv_method == "SMART_PROJECT":
+            bpy.ops.uv.smart_project(rotate_method="AXIS_ALIGNED_X")
 
         self.restore_selection_mode()
         bpy.ops.object.mode_set(mode="OBJECT")
 
+        # mesh data is only up to date in object mode, so we calculate the planar uv map here
+        if self.uv_method == "PLANAR":
+            planar_uv(context.active_object.data, self.outer_radius)
+
         # add solidify modifier
         mod = context.active_object.modifiers.new(name="Solidify", type="SOLIDIFY")
         mod.thickness = 0.1
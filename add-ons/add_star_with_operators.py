@@ -14,7 +14,7 @@ bl_info = {
 
 import bpy
 from bpy.types import Operator
-from bpy.props import IntProperty, FloatProperty
+from bpy.props import IntProperty, FloatProperty, EnumProperty
 
 # help function to check that that the outer radius is
 # always larger than the inner radius.
@@ -34,6 +34,35 @@ def update_inner_radius(self, context):
         self.inner_radius = self.outer_radius
 
 
+def planar_uv(mesh, radius):
+    """
+    Map the uv coordinates of a flat star directly from its vertex positions.
+
+    :param mesh: The star mesh, in object mode
+    :param radius: The outer radius of the star
+
+    The star lies in the xy-plane, so a top down projection scaled by
+    the outer radius maps it onto the unit uv square. For a flat star this
+    looks like what smart_project gives, without its island margins, but it
+    takes a few NumPy operations instead of an operator that analyzes every face.
+    add_star_with_modifier.py uses this function as well.
+    """
+    import numpy as np  # not at the top: importing NumPy takes longer than loading the add-on
+
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co.shape = (-1, 3)
+
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+
+    # every loop gets the uv of the vertex it points to
+    uv = co[loop_vertices, :2] / (2 * radius) + 0.5
+
+    uv_layer = mesh.uv_layers.active or mesh.uv_layers.new(name="UVMap")
+    uv_layer.data.foreach_set("uv", uv.ravel())
+
+
 class OBJECT_OT_add_star(Operator):
     bl_idname = "object.add_star"
     bl_label = "Add star"
@@ -64,6 +93,16 @@ class OBJECT_OT_add_star(Operator):
         update=update_inner_radius,
     )
 
+    uv_method: EnumProperty(
+        name="UV method",
+        description="How to create the uv map",
+        items=[
+            ("SMART_PROJECT", "Smart project", "Unwrap with the smart project operator"),
+            ("PLANAR", "Planar", "Calculate a top down projection directly (fast for many points)"),
+        ],
+        default="SMART_PROJECT",
+    )
+
     def set_vertex_selection_mode(self):
         """Save current selection mode and switch to vertex selection mode."""
         self.old_selection_modes = [
@@ -97,10 +136,15 @@ class OBJECT_OT_add_star(Operator):
 
         # select all and create a uv map.smart_project even works if the camera is not aligned
         bpy.ops.mesh.select_all(action="SELECT")
-        bpy.ops.uv.smart_project(rotate_method="AXIS_ALIGNED_X")
+        if self.uv_method == "SMART_PROJECT":
+            bpy.ops.uv.smart_project(rotate_method="AXIS_ALIGNED_X")
 
         self.restore_selection_mode()
         bpy.ops.object.mode_set(mode="OBJECT")
+
+        # mesh data is only up to date in object mode, so we calculate the planar uv map here
+        if self.uv_method == "PLANAR":
+            planar_uv(context.active_object.data, self.outer_radius)
         return {"FINISHED"}
 
     @classmethod
@@ -0,0 +1,320 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import bpy
+import gpu
+
+from bpy.app.handlers import persistent
+from bpy.utils import register_class, unregister_class
+from bpy.types import VIEW3D_PT_overlay_object
+
+bl_info = {
+    "name": "Bounding box overlay",
+    "author": "Michel Anders (varkenvarken)",
+    "version": (0, 0, 1),
+    "blender": (5, 0, 0),
+    "location": "Overlays (Object)",
+    "description": "Draw world space bounding boxes of all selected objects",
+    "category": "Overlay",
+    "doc_url": "https://github.com/varkenvarken/Blender-add-on-development",
+}
+
+# Nothing is created at import or register time that is not needed right away:
+# the shader and the handlers only when the overlay is switched on, and NumPy is
+# imported by the functions that use it. This keeps enabling the add-on cheap,
+# and it can be loaded in background mode, where there is no GPU to create a shader.
+uniform_shader = None
+
+
+def line_shader():
+    """Return the shader for the bounding boxes, creating it the first time."""
+    global uniform_shader
+    if uniform_shader is None:
+        # UNIFORM_COLOR is deprecated, so use POLYLINE_UNIFORM_COLOR
+        uniform_shader = gpu.shader.from_builtin("POLYLINE_UNIFORM_COLOR")
+    return uniform_shader
+
+
+# the corners in Object.bound_box are connected by these edges
+BOX_EDGES = (
+    (0, 1),
+    (1, 2),
+    (2, 3),
+    (3, 0),
+    (4, 5),
+    (5, 6),
+    (6, 7),
+    (7, 4),
+    (0, 4),
+    (1, 5),
+    (2, 6),
+    (3, 7),
+)
+
+
+def world_corners(corners, matrices):
+    """
+    Transform the bounding box corners of many objects to world space at once.
+
+    :param corners: An array of shape (n, 8, 3) with Object.bound_box values
+    :param matrices: An array of shape (n, 4, 4) with world matrices
+    :return: An array of shape (n, 8, 3)
+    """
+    return corners @ matrices[:, :3, :3].transpose(0, 2, 1) + matrices[:, None, :3, 3]
+
+
+class BoundingBoxes:
+    """
+    The bounding boxes of a set of objects, ready to be drawn with a single call.
+
+    The world space corners of all boxes live in one NumPy array that is kept
+    between redraws. When some objects change, only their eight corners are
+    recalculated and the array is copied to the existing GPU vertex buffer.
+    The index buffer with the edges only depends on the number of objects,
+    so it is created just once.
+    """
+
+    def __init__(self, objects):
+        """
+        :param objects: A bpy_prop_collection of objects, for example view_layer.objects.selected
+        """
+        import numpy as np
+
+        self.objects = list(objects)
+        self.slot = {ob: i for i, ob in enumerate(self.objects)}
+        n = len(self.objects)
+
+        # foreach_get flattens each matrix column by column, hence the transpose
+        corners = np.empty(n * 24, dtype=np.float32)
+        objects.foreach_get("bound_box", corners)
+        matrices = np.empty(n * 16, dtype=np.float32)
+        objects.foreach_get("matrix_world", matrices)
+        self.corners = world_corners(
+            corners.reshape(n, 8, 3), matrices.reshape(n, 4, 4).transpose(0, 2, 1)
+        )
+
+        self.dirty = set()
+        self.batch = None  # GPU resources can only be created while drawing, see upload()
+
+    def __len__(self):
+        return len(self.objects)
+
+    def tag(self, ob):
+        """Mark an object as changed, if it is one of ours."""
+        if ob in self.slot:
+            self.dirty.add(ob)
+
+    def update(self):
+        """
+        Recalculate the corners of all objects that were tagged as changed.
+
+        :return: True if the corners of any object changed, removed objects keep their last corners
+        :rtype: bool
+        """
+        if not self.dirty:
+            return False
+        import numpy as np
+
+        dirty = []
+        for ob in self.dirty:
+            try:
+                dirty.append((self.slot[ob], ob.bound_box, ob.matrix_world))
+            except ReferenceError:  # the object was removed, just leave its last position
+                pass
+        self.dirty.clear()
+        if dirty:
+            slots, corners, matrices = zip(*dirty)
+            self.corners[list(slots)] = world_corners(
+                np.array(corners, dtype=np.float32), np.array(matrices, dtype=np.float32)
+            )
+        return bool(dirty)
+
+    def upload(self):
+        """Create the GPU buffers or refresh the vertex buffer if something changed."""
+        import numpy as np
+
+        changed = self.update()
+        if self.batch is None:
+            fmt = gpu.types.GPUVertFormat()
+            fmt.attr_add(id="pos", comp_type="F32", len=3, fetch_mode="FLOAT")
+            self.vbo = gpu.types.GPUVertBuf(fmt, len(self.objects) * 8)
+            self.vbo.attr_fill("pos", self.corners.reshape(-1, 3))
+            edges = np.array(BOX_EDGES, dtype=np.int32)[None, :, :] + 8 * np.arange(len(self.objects), dtype=np.int32)[:, None, None]
+            ibo = gpu.types.GPUIndexBuf(type="LINES", seq=edges.reshape(-1, 2))
+            self.batch = gpu.types.GPUBatch(type="LINES", buf=self.vbo, elem=ibo)
+        elif changed:
+            self.vbo.attr_fill("pos", self.corners.reshape(-1, 3))
+
+    def draw(self, color, width):
+        """Draw all bounding boxes."""
+        self.upload()
+        uniform_shader = line_shader()
+        uniform_shader.bind()
+        uniform_shader.uniform_float("color", color)
+        uniform_shader.uniform_float("viewportSize", gpu.state.viewport_get()[2:])
+        uniform_shader.uniform_float("lineWidth", width)
+        self.batch.draw(uniform_shader)
+
+
+# the bounding boxes currently shown, or None
+boxes = None
+
+
+def draw_handler_post_view():
+    """
+    This handler is responsible for drawing the bounding boxes in the 3d view.
+    """
+    if boxes is not None and len(boxes) and bpy.context.scene.show_bounding_boxes:
+        prefs = bpy.context.preferences.addons[__name__].preferences
+        boxes.draw(prefs.linecolor, prefs.linewidth)
+
+
+def selection_changed(scene):
+    """
+    Check whether the selected objects differ from the ones we have boxes for.
+
+    Only called for depsgraph updates that include the scene itself,
+    which is what happens when the selection changes.
+    """
+    selected = bpy.context.view_layer.objects.selected
+    return boxes is None or len(selected) != len(boxes) or any(ob not in boxes.slot for ob in selected)
+
+
+@persistent
+def depsgraph_update_post(scene, depsgraph):
+    """
+    Keep track of which objects changed since the previous update.
+
+    The depsgraph tells us exactly which objects were moved or got new geometry,
+    so we never have to check all selected objects ourselves.
+    """
+    global boxes
+
+    if not scene.show_bounding_boxes:
+        return
+    if depsgraph.id_type_updated("SCENE") and selection_changed(scene):
+        boxes = BoundingBoxes(bpy.context.view_layer.objects.selected)
+        return
+    if boxes is not None:
+        for update in depsgraph.updates:
+            if isinstance(update.id, bpy.types.Object) and (
+                update.is_updated_transform or update.is_updated_geometry
+            ):
+                boxes.tag(update.id.original)
+
+
+def redraw():
+    """
+    Utility function to mark all areas in all screens for redraw.
+    """
+    for s in bpy.data.screens:
+        for a in s.areas:
+            a.tag_redraw()
+
+
+# the draw handler, while the overlay is switched on
+handler = None
+
+
+def add_handlers():
+    """Start drawing and tracking changes; the handlers are called very often, so only while the overlay is on."""
+    global handler
+    if handler is None:
+        handler = bpy.types.SpaceView3D.draw_handler_add(
+            draw_handler_post_view, (), "WINDOW", "POST_VIEW"
+        )
+    if depsgraph_update_post not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(depsgraph_update_post)
+
+
+def remove_handlers():
+    global handler
+    if handler is not None:
+        bpy.types.SpaceView3D.draw_handler_remove(handler, "WINDOW")
+        handler = None
+    if depsgraph_update_post in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(depsgraph_update_post)
+
+
+def update_show_bounding_boxes(self, context):
+    """Start with fresh boxes when the overlay is switched on and forget them when it is switched off."""
+    global boxes
+    if self.show_bounding_boxes:
+        boxes = BoundingBoxes(context.view_layer.objects.selected)
+        add_handlers()
+    else:
+        boxes = None
+        remove_handlers()
+    redraw()
+
+
+@persistent
+def load_post(*args):
+    """The overlay might be switched on in the file that was just loaded, the update function is not called then."""
+    global boxes
+    # the depsgraph handler only collects new boxes when the selection changes, so we do it here
+    if bpy.context.scene.show_bounding_boxes:
+        boxes = BoundingBoxes(bpy.context.view_layer.objects.selected)
+        add_handlers()
+    else:
+        boxes = None
+        remove_handlers()
+
+
+def overlay_options(self, context):
+    """Add UI elements to the overlay panel"""
+    self.layout.prop(context.scene, "show_bounding_boxes")
+
+
+class BoundingBoxOverlayPreferences(bpy.types.AddonPreferences):
+    bl_idname = __name__
+
+    linecolor: bpy.props.FloatVectorProperty(
+        name="Line color",
+        size=4,
+        default=(1, 0.5, 0, 1),  # orange
+        description="Color of the bounding boxes",
+        subtype="COLOR",
+    )  # type: ignore
+    linewidth: bpy.props.FloatProperty(
+        name="Line width",
+        description="Width of the bounding box lines in pixels",
+        default=2,
+        min=1,
+        soft_max=10,
+    )  # type: ignore
+
+    def draw(self, context):
+        row = self.layout.row()
+        row.prop(self, "linecolor")
+        row.prop(self, "linewidth")
+
+
+def register():
+    # the draw and depsgraph handlers are added when the overlay is switched on, see update_show_bounding_boxes()
+    bpy.app.handlers.load_post.append(load_post)
+    register_class(BoundingBoxOverlayPreferences)
+    VIEW3D_PT_overlay_object.append(overlay_options)
+    bpy.types.Scene.show_bounding_boxes = bpy.props.BoolProperty(
+        name="Bounding boxes",
+        description="Show the bounding boxes of all selected objects",
+        default=False,
+        update=update_show_bounding_boxes,
+    )
+
+
+def unregister():
+    global boxes
+
+    remove_handlers()
+    bpy.app.handlers.load_post.remove(load_post)
+    VIEW3D_PT_overlay_object.remove(overlay_options)
+    unregister_class(BoundingBoxOverlayPreferences)
+    del bpy.types.Scene.show_bounding_boxes
+    # make sure we do not keep references to any objects
+    boxes = None
+
+
+if __name__ == "__main__":
+    register()
@@ -2,16 +2,29 @@
 #
 # SPDX-License-Identifier: GPL-2.0-or-later
 
+import csv
+from functools import lru_cache
+from itertools import repeat
+from pathlib import Path
+from time import perf_counter
+
 import blf
 import bpy
 import gpu
 
-from bpy_extras import view3d_utils
+from bpy.app.handlers import persistent
 from gpu_extras.batch import batch_for_shader
 from mathutils import Vector
 from bpy.utils import register_class, unregister_class
 from bpy.types import VIEW3D_PT_overlay_object
 
+try:
+    # profile the operator if the operator_profiler add-on is installed
+    from operator_profiler import profiled
+except ImportError:
+    def profiled(cls):
+        return cls
+
 bl_info = {
     "name": "Distance overlay",
     "author": "Michel Anders (varkenvarken)",
@@ -23,8 +36,31 @@ bl_info = {
     "doc_url": "https://github.com/varkenvarken/Blender-add-on-development",
 }
 
-# UNIFORM_COLOR is deprecated, so use POLYLINE_UNIFORM_COLOR
-uniform_shader = gpu.shader.from_builtin("POLYLINE_UNIFORM_COLOR")
+# Nothing is created at import or register time that is not needed right away:
+# the shader and the draw handlers only when the overlay is switched on, and
+# NumPy is imported by the functions that use it (importing it takes longer than
+# loading the rest of the add-on). This keeps enabling the add-on cheap, and
+# it can be loaded in background mode, where there is no GPU to create a shader.
+uniform_shader = None
+flat_shader = None
+
+
+def line_shader():
+    """Return the shader for the distance lines, creating it the first time."""
+    global uniform_shader
+    if uniform_shader is None:
+        # UNIFORM_COLOR is deprecated, so use POLYLINE_UNIFORM_COLOR
+        uniform_shader = gpu.shader.from_builtin("POLYLINE_UNIFORM_COLOR")
+    return uniform_shader
+
+
+def colored_line_shader():
+    """Return the shader for distance lines with a color per vertex, creating it the first time."""
+    global flat_shader
+    if flat_shader is None:
+        # with FLAT_COLOR every segment gets the color of its first vertex, we give both vertices the same color anyway
+        flat_shader = gpu.shader.from_builtin("POLYLINE_FLAT_COLOR")
+    return flat_shader
 
 
 def draw_line(p0, p1, color, width):
@@ -35,6 +71,7 @@ def draw_line(p0, p1, color, width):
     :param p1: Vector
     :param color: Vector (4 elements, rgba)
     """
+    uniform_shader = line_shader()
     batch = batch_for_shader(uniform_shader, "LINES", {"pos": [p0, p1]})
     uniform_shader.bind()
     uniform_shader.uniform_float("color", color)
@@ -43,6 +80,639 @@ def draw_line(p0, p1, color, width):
     batch.draw(uniform_shader)
 
 
+def band_colors(distances, thresholds, colors):
+    """
+    Return the color of every distance, based on the band it falls in.
+
+    :param distances: An array of shape (n,)
+    :param thresholds: The (near, far) distances that separate the bands
+    :param colors: The (too close, ok, too far) rgba colors
+    :return: An array of shape (n, 4)
+
+    A distance exactly equal to a threshold counts as ok.
+    """
+    import numpy as np
+
+    near, far = thresholds
+    band = (distances >= near).astype(np.intp) + (distances > far)
+    return np.asarray(colors, dtype=np.float32)[band]
+
+
+def draw_colored_lines(starts, ends, colors, width):
+    """
+    Draw many lines, each with its own color, with a single draw call.
+
+    :param starts: An array of shape (n, 3)
+    :param ends: An array of shape (n, 3)
+    :param colors: An array of shape (n, 4) with rgba colors
+    :param width: The line width in pixels
+    """
+    import numpy as np
+
+    if len(starts) == 0:
+        return
+    # LINES takes the vertices in pairs: start 0, end 0, start 1, end 1, ...
+    pos = np.stack((starts, ends), axis=1).reshape(-1, 3).astype(np.float32)
+    color = np.repeat(colors, 2, axis=0)
+    shader = colored_line_shader()
+    batch = batch_for_shader(shader, "LINES", {"pos": pos, "color": color})
+    shader.bind()
+    shader.uniform_float("viewportSize", gpu.state.viewport_get()[2:])
+    shader.uniform_float("lineWidth", width)
+    batch.draw(shader)
+
+
+# the label utilities below are identical to the ones in snippets/overlay_text.py,
+# except that they import NumPy themselves (see the comment at the top)
+# add-ons are installed as single files, so we cannot import them from there
+
+
+def project(coords, region, rv3d):
+    """
+    Convert many 3d coordinates to 2d locations inside a VIEW3D region at once.
+
+    :param coords: An array of shape (n, 3)
+    :param region: The region, for example bpy.context.region
+    :param rv3d: The 3d region data, for example bpy.context.space_data.region_3d
+    :return: An array of shape (n, 2) and a boolean array that is True for points in front of the viewer
+
+    This does exactly what bpy_extras.view3d_utils.location_3d_to_region_2d() does,
+    but for all points in a single matrix multiplication.
+    """
+    import numpy as np
+
+    matrix = np.array(rv3d.perspective_matrix, dtype=np.float64)
+    clip = coords @ matrix[:3, :3].T + matrix[:3, 3]
+    w = coords @ matrix[3, :3] + matrix[3, 3]
+    in_front = w > 0
+    w = np.where(in_front, w, 1)
+    half = np.array((region.width / 2, region.height / 2))
+    return half + half * clip[:, :2] / w[:, None], in_front
+
+
+@lru_cache(maxsize=65536)
+def format_label(fmt, value):
+    """Return a formatted label, remembering the result so the same label is formatted only once."""
+    return fmt.format(value)
+
+
+class LabelCache:
+    """
+    Draw many labels at 3d positions without doing the same work every redraw.
+
+    - the 2d positions and texts are only recalculated if the view, the region
+      size, the coordinates or the values changed since the previous redraw
+    - labels outside the region or behind the viewer are dropped
+    - if a bin size is given, the region is divided into square bins and only
+      one label is drawn per bin, so the number of labels drawn is limited by
+      the size of the region, not by the number of points (and they don't overlap)
+    """
+
+    def __init__(self, fmt="{}", bin_size=32):
+        """
+        :param fmt: A format string for the label values
+        :param bin_size: The size of a bin in pixels, or None to draw all visible labels
+        """
+        self.fmt = fmt
+        self.bin_size = bin_size
+        self.key = None
+        self.coords = None
+        self.values = None
+        self.labels = []
+
+    def unchanged(self, key, coords, values):
+        """Check if the view, coordinates and values are the same as the previous time."""
+        import numpy as np
+
+        return (
+            key == self.key
+            and self.coords is not None
+            and np.array_equal(coords, self.coords)
+            and (values is None) == (self.values is None)
+            and (values is None or np.array_equal(values, self.values))
+        )
+
+    def layout(self, coords, values, region, rv3d):
+        """
+        Return a list of (x, y, text) tuples for the labels that should be drawn.
+
+        :param coords: An array of shape (n, 3) with the 3d positions of the labels
+        :param values: An array with n values to format, or None to use the index of each position
+        :param region: The region, for example bpy.context.region
+        :param rv3d: The 3d region data, for example bpy.context.space_data.region_3d
+        """
+        import numpy as np
+
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        key = (region.width, region.height, tuple(v for row in rv3d.perspective_matrix for v in row))
+        if self.unchanged(key, coords, values):
+            return self.labels
+        self.key = key
+        self.coords = coords.copy()
+        self.values = None if values is None else np.array(values)
+
+        positions, visible = project(coords, region, rv3d)
+        visible &= (positions[:, 0] >= 0) & (positions[:, 0] < region.width)
+        visible &= (positions[:, 1] >= 0) & (positions[:, 1] < region.height)
+        indices = np.flatnonzero(visible)
+
+        if self.bin_size and len(indices):
+            bins = (positions[indices] // self.bin_size).astype(np.int64)
+            columns = region.width // self.bin_size + 1
+            # np.unique returns the first occurrence of every bin
+            _, first = np.unique(bins[:, 1] * columns + bins[:, 0], return_index=True)
+            indices = indices[np.sort(first)]
+
+        self.labels = [
+            (
+                x,
+                y,
+                format_label(self.fmt, i.item() if values is None else self.values[i].item()),
+            )
+            for i, (x, y) in zip(indices, positions[indices].tolist())
+        ]
+        return self.labels
+
+    def draw(self, font_id, coords, values, region, rv3d):
+        """
+        Draw the labels with the current font settings.
+
+        :param font_id: The blf font id
+        See layout() for the other parameters.
+        """
+        for x, y, text in self.layout(coords, values, region, rv3d):
+            blf.position(font_id, x, y, 0)
+            blf.draw(font_id, text)
+
+
+distance_labels = LabelCache(fmt="{:.4f}", bin_size=None)  # limit the label to 4 decimal digits
+
+
+# the poll cache below is identical in distance_overlay.py and rig_curve.py
+# add-ons are installed as single files, so they cannot share it
+
+
+class PollCache:
+    """
+    Remember which operators can run, so poll() does not have to check again on every redraw.
+
+    Menus and panels call poll() many times per second. Only positive results are
+    remembered, for the view layer, active object and mode they were checked in,
+    and all of them are forgotten as soon as Blender reports a change: a depsgraph
+    update (which includes selection changes), a new active object or mode
+    (via the message bus), undo, redo or loading a file.
+
+    A negative result is never remembered: checking again is cheap when the answer
+    is no (no active object, or one of the wrong type), and a stale no would make
+    scripts that call the operator right after setting up a scene fail. A stale yes
+    is possible in such scripts, so execute() should not rely on poll() alone.
+    """
+
+    def __init__(self):
+        self.passed = set()
+        self.owner = object()  # identifies our message bus subscriptions
+
+    def poll(self, cls, context, check):
+        """
+        Return the cached result for this operator, or call check(context) if there is none.
+
+        :param cls: The operator class
+        :param context: The Blender context
+        :param check: A function that does the actual (uncached) check
+        """
+        active = context.active_object
+        key = (cls, context.view_layer.as_pointer(), active.as_pointer() if active else 0, context.mode)
+        if key in self.passed:
+            return True
+        if check(context):
+            self.passed.add(key)
+            return True
+        return False
+
+    def clear(self, *args):
+        """Forget all results (any arguments are ignored so this can be used as a callback)."""
+        self.passed.clear()
+
+    def subscribe(self):
+        """Clear the cache when the active object or its mode changes."""
+        for key in ((bpy.types.LayerObjects, "active"), (bpy.types.Object, "mode")):
+            bpy.msgbus.subscribe_rna(key=key, owner=self.owner, args=(), notify=self.clear)
+
+    def unsubscribe(self):
+        bpy.msgbus.clear_by_owner(self.owner)
+
+
+poll_cache = PollCache()
+
+
+@persistent
+def clear_poll_cache(*args):
+    """Handler for anything that might change the outcome of a poll()."""
+    poll_cache.clear()
+
+
+@persistent
+def subscribe_poll_cache(*args):
+    """Handler for load_post: loading a file removes all message bus subscriptions."""
+    poll_cache.clear()
+    poll_cache.subscribe()
+
+
+POLL_CACHE_HANDLERS = ("depsgraph_update_post", "undo_post", "redo_post")
+
+
+def register_poll_cache():
+    poll_cache.subscribe()
+    for name in POLL_CACHE_HANDLERS:
+        getattr(bpy.app.handlers, name).append(clear_poll_cache)
+    bpy.app.handlers.load_post.append(subscribe_poll_cache)
+
+
+def unregister_poll_cache():
+    bpy.app.handlers.load_post.remove(subscribe_poll_cache)
+    for name in POLL_CACHE_HANDLERS:
+        getattr(bpy.app.handlers, name).remove(clear_poll_cache)
+    poll_cache.unsubscribe()
+    poll_cache.clear()
+
+
+def has_targets(context):
+    """
+    Check if there is an active object and at least one other selected object.
+
+    This stops at the first selected object that isn't the active one,
+    so it does not get slower if there are many selected objects.
+    """
+    active = context.active_object
+    return active is not None and any(ob != active for ob in context.view_layer.objects.selected)
+
+
+# geometry types a BVH tree can be built for; other objects (empties, lights, ...) are treated as a single point
+GEOMETRY_TYPES = {"MESH", "CURVE", "SURFACE", "FONT", "META"}
+# the maximum number of times the closest points are projected back and forth
+REFINE_STEPS = 16
+
+
+def object_surface(ob, depsgraph, samples):
+    """
+    Return a BVH tree of the evaluated geometry of an object and a sample of its vertices.
+
+    :param ob: The object
+    :param depsgraph: An evaluated depsgraph
+    :param samples: The maximum number of vertices in the sample
+    :return: A (BVHTree, list of Vectors) tuple, both in object space, or None if the object has no faces
+
+    This is the only part whose cost depends on the size of the mesh,
+    so the result is cached, see SurfaceDistances.surface().
+    """
+    import numpy as np
+    from mathutils.bvhtree import BVHTree
+
+    if ob.type not in GEOMETRY_TYPES:
+        return None
+    ob_eval = ob.evaluated_get(depsgraph)
+    mesh = ob_eval.to_mesh()
+    try:
+        n = len(mesh.vertices)
+        if n == 0 or len(mesh.polygons) == 0:
+            return None
+        co = np.empty(n * 3, dtype=np.float64)
+        mesh.vertices.foreach_get("co", co)
+        stride = -(-n // samples)  # rounded up, so we get at most samples vertices spread over the whole mesh
+        sample = [Vector(v) for v in co.reshape(-1, 3)[::stride].tolist()]
+    finally:
+        ob_eval.to_mesh_clear()
+    return BVHTree.FromObject(ob, depsgraph), sample
+
+
+def nearest(surface, matrix, inverse, point):
+    """
+    Return the point on a surface nearest to a point, in world space.
+
+    :param surface: The result of object_surface()
+    :param matrix: The world matrix of the object
+    :param inverse: The inverse of the world matrix
+    :param point: A point in world space
+    :return: A Vector; the origin of the object if it has no surface
+    """
+    if surface is None:
+        return matrix.translation
+    location = surface[0].find_nearest(inverse @ point)[0]
+    return matrix.translation if location is None else matrix @ location
+
+
+def closest_points(a, b):
+    """
+    Find the closest points on two surfaces.
+
+    :param a: A (surface, world matrix) tuple, see object_surface()
+    :param b: Same for the other object
+    :return: A (point on a, point on b) tuple in world space
+
+    The sample vertices of each surface are projected onto the other one, and the
+    closest pair found is then refined by projecting it back and forth until it no
+    longer gets closer. That takes a fixed number of nearest point queries, each
+    costing time proportional to the logarithm of the number of triangles.
+    The result is the true minimum unless the sample is so sparse that it misses
+    the region where the surfaces come closest.
+    """
+    (surface_a, matrix_a), (surface_b, matrix_b) = a, b
+    inverse_a, inverse_b = matrix_a.inverted(), matrix_b.inverted()
+
+    best = None
+    for surface, matrix, other in ((surface_a, matrix_a, b), (surface_b, matrix_b, a)):
+        for co in surface[1] if surface else [Vector()]:
+            p = matrix @ co
+            q = nearest(other[0], other[1], inverse_b if other is b else inverse_a, p)
+            d = (q - p).length_squared
+            if best is None or d < best[0]:
+                best = (d, p, q) if other is b else (d, q, p)
+
+    d, p, q = best
+    for _ in range(REFINE_STEPS):
+        p2 = nearest(surface_a, matrix_a, inverse_a, q)
+        q2 = nearest(surface_b, matrix_b, inverse_b, p2)
+        d2 = (q2 - p2).length_squared
+        if d2 >= d:
+            break
+        d, p, q = d2, p2, q2
+    return p, q
+
+
+class SurfaceDistances:
+    """
+    The closest points between the surfaces of the active object and each target.
+
+    - a BVH tree and a sample of the vertices are kept for every mesh (objects without
+      modifiers that share a mesh share these as well) and are only rebuilt after the
+      depsgraph reported a change in its geometry
+    - the closest points of a pair of objects are kept as long as neither of them moved
+      and their geometry did not change
+    - recalculating stops when the time budget of a redraw is used up: pairs that were
+      not done yet are drawn between the origins and done in the next redraws
+
+    So redrawing costs next to nothing if nothing changed, and at most the time budget
+    (plus one pair) if something did, however large the meshes are. Only building a
+    BVH tree takes time proportional to the size of the mesh, once per change.
+    """
+
+    def __init__(self):
+        self.surfaces = {}  # object or mesh -> object_surface()
+        self.points = {}  # (active, target) -> (point on active, point on target, matrix of active, matrix of target)
+        self.pending = False  # True if not all pairs could be done in the previous redraw
+
+    def clear(self):
+        self.surfaces.clear()
+        self.points.clear()
+
+    def tag(self, id):
+        """Forget everything that depends on the geometry of an object or mesh."""
+        self.surfaces.pop(id, None)
+        for pair in [pair for pair in self.points if id in pair]:
+            del self.points[pair]
+
+    def surface(self, ob, depsgraph, samples):
+        """Return the cached surface of an object, building it if needed."""
+        key = ob.data if ob.type == "MESH" and len(ob.modifiers) == 0 else ob
+        surface = self.surfaces.get(key, False)
+        if surface is False:
+            surface = self.surfaces[key] = object_surface(ob, depsgraph, samples)
+        return surface
+
+    def endpoints(self, active, targets, depsgraph, samples, budget):
+        """
+        Return a list of (point on active, point on target) tuples for all targets.
+
+        :param samples: The maximum number of sample vertices per surface
+        :param budget: The number of seconds we may spend recalculating
+
+        A ReferenceError is raised if the active object was removed, removed targets are skipped.
+        """
+        start = perf_counter()
+        self.pending = False
+        lines = []
+        matrix = active.matrix_world
+        for ob in targets:
+            try:
+                if ob is active:
+                    continue
+                cached = self.points.get((active, ob))
+                if cached is not None and cached[2] == matrix and cached[3] == ob.matrix_world:
+                    lines.append(cached[:2])
+                elif perf_counter() - start < budget:
+                    p, q = closest_points(
+                        (self.surface(active, depsgraph, samples), matrix),
+                        (self.surface(ob, depsgraph, samples), ob.matrix_world),
+                    )
+                    self.points[(active, ob)] = (p, q, matrix.copy(), ob.matrix_world.copy())
+                    lines.append((p, q))
+                else:
+                    self.pending = True
+                    lines.append((matrix.translation, ob.matrix_world.translation))
+            except ReferenceError:
+                print("target object removed")
+        return lines
+
+
+surface_distances = SurfaceDistances()
+
+
+@persistent
+def track_geometry(scene, depsgraph):
+    """Handler that tells the surface distances which objects and meshes got new geometry."""
+    if not surface_distances.surfaces:
+        return
+    # objects using a mesh that changed are reported as well, so their pairs will be recalculated too
+    for update in depsgraph.updates:
+        if update.is_updated_geometry and isinstance(update.id, (bpy.types.Object, bpy.types.Mesh)):
+            ob = update.id.original
+            surface_distances.tag(ob)
+            if isinstance(ob, bpy.types.Object):
+                surface_distances.tag(ob.data)
+
+
+def endpoints():
+    """
+    Return a list of (start, end) tuples for the lines from the active object to each target.
+
+    In SURFACE mode these are the closest points on the surfaces, otherwise the locations of the objects.
+    A ReferenceError is raised if the active object was removed, removed targets are skipped.
+    """
+    if bpy.context.scene.distance_mode == "SURFACE":
+        prefs = bpy.context.preferences.addons[__name__].preferences
+        lines = surface_distances.endpoints(
+            active, targets, bpy.context.evaluated_depsgraph_get(), prefs.samples, prefs.budget / 1000
+        )
+        if surface_distances.pending and not bpy.app.timers.is_registered(finish_lines):
+            bpy.app.timers.register(finish_lines, first_interval=0.0)  # finish the remaining pairs in the next redraw
+        return lines
+    lines = []
+    for ob in targets:
+        try:
+            if ob is not active:
+                lines.append((active.location, ob.location))  # the location access will trigger a ReferenceError if removed
+        except ReferenceError:
+            print("target object removed")
+    return lines
+
+
+# the lines shown by both draw handlers, as (key, array), see current_lines()
+drawn_lines = None
+
+
+def current_lines():
+    """
+    Return the lines of endpoints() as an array of shape (n, 2, 3).
+
+    The lines are only calculated again after a depsgraph update, a frame change or a change of the distance mode,
+    so the line and label handlers of a redraw share them, and in SURFACE mode do not each spend a time budget.
+    """
+    import numpy as np
+
+    global drawn_lines
+
+    scene = bpy.context.scene
+    key = (scene.frame_current, scene.distance_mode, bpy.context.preferences.addons[__name__].preferences.samples)
+    if drawn_lines is None or drawn_lines[0] != key:
+        lines = np.array([start[:] + end[:] for start, end in endpoints()], dtype=np.float64).reshape(-1, 2, 3)
+        drawn_lines = (key, lines)
+    return drawn_lines[1]
+
+
+@persistent
+def forget_lines(*args):
+    """Handler that makes the next redraw calculate the lines again, see current_lines()."""
+    global drawn_lines
+    drawn_lines = None
+
+
+def finish_lines():
+    """Timer that lets the next redraw calculate the surface distances that did not fit in the time budget."""
+    forget_lines()
+    redraw()
+
+
+# the columns of an exported report, see export_distances()
+REPORT_COLUMNS = ("frame", "active", "target", "distance", "midpoint_x", "midpoint_y", "midpoint_z")
+REPORT_FORMATS = (".csv", ".npy")
+
+
+def is_alive(ob):
+    """Return False if the object was removed."""
+    try:
+        ob.name
+    except ReferenceError:
+        return False
+    return True
+
+
+def measure(active, targets, mode, depsgraph, samples):
+    """
+    Return the distances from the active object to each target and the midpoints of the lines.
+
+    :param targets: A list of objects, none of them removed or the active object itself
+    :param mode: "ORIGIN" or "SURFACE", see Scene.distance_mode
+    :return: A (distances, midpoints) tuple of arrays with shapes (n,) and (n, 3)
+
+    Unlike endpoints() this has no time budget and keeps nothing: the surfaces are
+    cached only for this call (targets sharing a mesh still share its surface), so
+    measuring many objects neither fills the cache of the overlay nor keeps memory
+    in use after the call.
+    """
+    import numpy as np
+
+    lines = np.empty((len(targets), 2, 3), dtype=np.float64)
+    if mode == "SURFACE":
+        surfaces = SurfaceDistances()
+        a = (surfaces.surface(active, depsgraph, samples), active.matrix_world)
+        for i, ob in enumerate(targets):
+            p, q = closest_points(a, (surfaces.surface(ob, depsgraph, samples), ob.matrix_world))
+            lines[i] = (p, q)
+    else:
+        lines[:, 0] = active.location
+        lines[:, 1] = [ob.location[:] for ob in targets]
+    starts, ends = lines[:, 0], lines[:, 1]
+    return np.linalg.norm(ends - starts, axis=1), (starts + ends) / 2
+
+
+def export_distances(
+    filepath, active, targets, scene, frames=None, mode="ORIGIN", depsgraph=None, samples=1000, chunk_size=10000
+):
+    """
+    Write the distances from an object to many others to a CSV or NumPy (.npy) file.
+
+    :param filepath: The file to write, the extension selects the format
+    :param active: The object to measure from
+    :param targets: The objects to measure to; the active object and removed objects are skipped
+    :param scene: The scene, needed to step through the frames
+    :param frames: An iterable of frame numbers, by default only the current frame
+    :param mode: "ORIGIN" or "SURFACE", see Scene.distance_mode
+    :param depsgraph: An evaluated depsgraph, only needed in SURFACE mode
+    :param samples: The number of sample vertices per surface, see object_surface()
+    :param chunk_size: The number of targets measured and written at a time
+    :return: The number of rows written
+
+    Every row has the columns in REPORT_COLUMNS, one row per target per frame.
+    Rows are measured and written chunk_size targets at a time, so memory use does
+    not depend on the number of targets or frames. A .npy file has a structured
+    dtype with the fields frame, active, target, distance and midpoint (3 floats);
+    its size is known in advance, so it is written through a memory map.
+    The current frame is restored afterwards.
+    """
+    import numpy as np
+
+    filepath = Path(filepath)
+    if filepath.suffix.lower() not in REPORT_FORMATS:
+        raise ValueError(f"{filepath.name}: can only export to {', '.join(REPORT_FORMATS)} files")
+    targets = sorted((ob for ob in targets if ob is not active and is_alive(ob)), key=lambda ob: ob.name)
+    frames = [scene.frame_current] if frames is None else list(frames)
+    rows = len(frames) * len(targets)
+    current = scene.frame_current
+
+    if filepath.suffix.lower() == ".npy":
+        width = max([len(active.name)] + [len(ob.name) for ob in targets])
+        dtype = [("frame", "i4"), ("active", f"U{width}"), ("target", f"U{width}"), ("distance", "f8"), ("midpoint", "f8", 3)]
+        report = np.lib.format.open_memmap(filepath, mode="w+", dtype=dtype, shape=(rows,))
+    else:
+        f = open(filepath, "w", newline="")
+        writer = csv.writer(f)
+        writer.writerow(REPORT_COLUMNS)
+    try:
+        row = 0
+        for frame in frames:
+            if frame != scene.frame_current:
+                scene.frame_set(frame)
+            for i in range(0, len(targets), chunk_size):
+                chunk = targets[i : i + chunk_size]
+                distances, midpoints = measure(active, chunk, mode, depsgraph, samples)
+                names = [ob.name for ob in chunk]
+                if filepath.suffix.lower() == ".npy":
+                    block = report[row : row + len(chunk)]
+                    block["frame"] = frame
+                    block["active"] = active.name
+                    block["target"] = names
+                    block["distance"] = distances
+                    block["midpoint"] = midpoints
+                else:
+                    writer.writerows(
+                        zip(repeat(frame), repeat(active.name), names, distances.tolist(), *midpoints.T.tolist())
+                    )
+                row += len(chunk)
+    finally:
+        if filepath.suffix.lower() == ".npy":
+            report.flush()
+            del report
+        else:
+            f.close()
+        if scene.frame_current != current:
+            scene.frame_set(current)
+    return rows
+
+
+# the objects the overlay measures, set by the distance_overlay operator
+active = None
+targets = set()
+
 # this global variable controls whether the overlays are shown or not.
 # it it set by toggling the corresponding property in the current Scene
 # (this is not going to work properly with multiple scenes!)
@@ -71,14 +741,21 @@ def draw_handler_post_view():
         try:
             name = active.name  # will trigger a ReferenceError if removed
             if active:
-                for ob in targets:
-                    try:
-                        if ob is not active:
-                            draw_line(
-                                active.location, ob.location, line_color, width
-                            )  # the location access will trigger a ReferenceError if removed
-                    except ReferenceError:
-                        print("target object removed")
+                prefs = bpy.context.preferences.addons[__name__].preferences
+                lines = current_lines()
+                if prefs.use_bands:
+                    import numpy as np
+
+                    starts, ends = lines[:, 0], lines[:, 1]
+                    colors = band_colors(
+                        np.linalg.norm(ends - starts, axis=1),
+                        (prefs.near_distance, prefs.far_distance),
+                        (prefs.near_color, prefs.ok_color, prefs.far_color),
+                    )
+                    draw_colored_lines(starts, ends, colors, width)
+                else:
+                    for start, end in lines.tolist():
+                        draw_line(Vector(start), Vector(end), line_color, width)
         except ReferenceError:
             print("active object removed")
 
@@ -87,6 +764,8 @@ def draw_handler_post_pixel():
     """
     This handler is responsible for drawing the distance labels as a 2d overlay.
     """
+    import numpy as np
+
     global active
     global targets
     global show_distances
@@ -104,30 +783,24 @@ def draw_handler_post_pixel():
         fontsize = bpy.context.preferences.addons[__name__].preferences.fontsize
         fontcolor = Vector((1, 1, 1, 1))  # white
 
+        blf.size(font_id, fontsize)
+        blf.color(font_id, *fontcolor)  # color expects separate r,g,b,a arguments, so we unpack fontcolor
+
         try:
             name = active.name  # will trigger a ReferenceError if removed
             if active:
-                for ob in targets:
-                    try:
-                        if ob is not active:
-                            # we want to position the label halfway between two objects
-                            coords_3d = (
-                                (active.location + ob.location) / 2
-                            )  # the location access will trigger a ReferenceError if removed
-
-                            # those coordinates need to be converted from 3d to a 2d location inside the VIEW3D area
-                            coords_2d = view3d_utils.location_3d_to_region_2d(
-                                region=bpy.context.region,
-                                rv3d=bpy.context.space_data.region_3d,
-                                coord=coords_3d,
-                            )
-                            length = (active.location - ob.location).length
-                            blf.position(0, *coords_2d, 0)  # coords_2d is two elements, so we add the missing z coordinate explicitly here
-                            blf.size(font_id, fontsize)
-                            blf.color(font_id, *fontcolor)  # color expects separate r,g,b,a arguments, so we unpack fontcolor
-                            blf.draw(font_id, f"{length:.4f}")  # limit the label to 4 decmal digits
-                    except ReferenceError:
-                        print("target object removed")
+                lines = current_lines()  # calculated by the line handler of this redraw already
+                starts, ends = lines[:, 0], lines[:, 1]
+                # we want to position each label halfway along its line
+                # the label cache converts those coordinates from 3d to a 2d location inside the VIEW3D area
+                # but only if the view or the objects actually changed since the previous redraw
+                distance_labels.draw(
+                    font_id,
+                    (starts + ends) / 2,
+                    np.linalg.norm(ends - starts, axis=1),
+                    bpy.context.region,
+                    bpy.context.space_data.region_3d,
+                )
         except ReferenceError:
             print("active object removed")
 
@@ -144,6 +817,7 @@ def redraw():
             a.tag_redraw()
 
 
+@profiled
 class OBJECT_OT_distance_overlay(bpy.types.Operator):
     """
     The primary operator of the add-on.
@@ -158,23 +832,27 @@ class OBJECT_OT_distance_overlay(bpy.types.Operator):
 
     @classmethod
     def poll(cls, context):
-        return (
-            context.active_object is not None
-            and len(set(context.selected_objects).union([context.active_object]))
-            >= 2  # make sure to count active object only once
-        )
+        return poll_cache.poll(cls, context, has_targets)
 
     def execute(self, context):
         global active
         global targets
 
+        # poll() might be based on a cached result, see PollCache
+        if not has_targets(context):
+            self.report({"WARNING"}, "Select at least one object besides the active one")
+            return {"CANCELLED"}
+
         active = context.active_object
+        surface_distances.clear()  # trees of objects that are no longer shown would be kept alive otherwise
         targets = set(context.selected_objects)  # might or might not contain the active object
         targets.difference_update([context.active_object])  # remove the active object from the targets if it is there
+        forget_lines()
         context.scene.show_distances = True  # this will also trigger setting the global  show_distances
         redraw()
         return {"FINISHED"}
 
+@profiled
 class OBJECT_OT_distance_overlay_remove(bpy.types.Operator):
     """
     Operator to remove objects from the distance draw list.
@@ -193,10 +871,66 @@ class OBJECT_OT_distance_overlay_remove(bpy.types.Operator):
 
         active = None
         targets = set()
+        surface_distances.clear()
+        forget_lines()
         context.scene.show_distances = False  # this will also trigger setting the global  show_distances
         redraw()
         return {"FINISHED"}
 
+@profiled
+class OBJECT_OT_distance_overlay_export(bpy.types.Operator):
+    """
+    Operator to write the distances of the overlay to a file.
+    """
+    bl_idname = "object.distance_overlay_export"
+    bl_label = "Export distances"
+    bl_description = "Write the distances in the distance draw list to a CSV or NumPy (.npy) file"
+    bl_options = {"REGISTER"}
+
+    filepath: bpy.props.StringProperty(name="File Path", subtype="FILE_PATH")  # type: ignore
+    filter_glob: bpy.props.StringProperty(default="*.csv;*.npy", options={"HIDDEN"})  # type: ignore
+    use_frame_range: bpy.props.BoolProperty(
+        name="Frame range", description="Export a row per target for every frame in the range", default=False
+    )  # type: ignore
+    frame_start: bpy.props.IntProperty(name="Start", default=1)  # type: ignore
+    frame_end: bpy.props.IntProperty(name="End", default=250)  # type: ignore
+
+    @classmethod
+    def poll(cls, context):
+        return active is not None and len(targets) > 0
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "distances.csv"
+        self.frame_start = context.scene.frame_start
+        self.frame_end = context.scene.frame_end
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        frames = range(self.frame_start, self.frame_end + 1) if self.use_frame_range else None
+        prefs = context.preferences.addons[__name__].preferences
+        try:
+            rows = export_distances(
+                self.filepath,
+                active,
+                targets,
+                context.scene,
+                frames,
+                context.scene.distance_mode,
+                context.evaluated_depsgraph_get(),
+                prefs.samples,
+            )
+        except (OSError, ValueError) as e:
+            self.report({"ERROR"}, str(e))
+            return {"CANCELLED"}
+        except ReferenceError:
+            self.report({"ERROR"}, "The active object was removed")
+            return {"CANCELLED"}
+        self.report({"INFO"}, f"{rows} distances written to {self.filepath}")
+        return {"FINISHED"}
+
+
 def overlay_options(self, context):
     """Add UI elements to the overlay panel"""
     self.layout.label(text="Distances")
@@ -206,6 +940,55 @@ def overlay_options(self, context):
         OBJECT_OT_distance_overlay.bl_idname, text="Set objects"
     )
     row.operator(OBJECT_OT_distance_overlay_remove.bl_idname, text="Clear")
+    row.operator(OBJECT_OT_distance_overlay_export.bl_idname, text="Export")
+    self.layout.row().prop(context.scene, "distance_mode", expand=True)
+
+
+# the draw handlers, while the overlay is switched on
+handler = None
+label_handler = None
+
+# the app handlers that keep the surface distances up to date, while the overlay is switched on
+GEOMETRY_HANDLERS = ("depsgraph_update_post", "frame_change_post")
+
+
+def add_handlers():
+    global handler
+    global label_handler
+
+    if handler is None:
+        # this is post view, i.e. a 3D overlay
+        handler = bpy.types.SpaceView3D.draw_handler_add(
+            draw_handler_post_view, (), "WINDOW", "POST_VIEW"
+        )
+    if label_handler is None:
+        # this is post pixel, i.e. a 2D overlay
+        label_handler = bpy.types.SpaceView3D.draw_handler_add(
+            draw_handler_post_pixel, (), "WINDOW", "POST_PIXEL"
+        )
+    for name in GEOMETRY_HANDLERS:
+        if track_geometry not in getattr(bpy.app.handlers, name):
+            getattr(bpy.app.handlers, name).append(track_geometry)
+    if forget_lines not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(forget_lines)
+
+
+def remove_handlers():
+    global handler
+    global label_handler
+
+    if handler is not None:
+        bpy.types.SpaceView3D.draw_handler_remove(handler, "WINDOW")
+        handler = None
+    if label_handler is not None:
+        bpy.types.SpaceView3D.draw_handler_remove(label_handler, "WINDOW")
+        label_handler = None
+    for name in GEOMETRY_HANDLERS:
+        if track_geometry in getattr(bpy.app.handlers, name):
+            getattr(bpy.app.handlers, name).remove(track_geometry)
+    if forget_lines in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(forget_lines)
+    forget_lines()
 
 
 def update_show_distances(self, context):
@@ -214,6 +997,11 @@ def update_show_distances(self, context):
     # so we tie it to a BoolProperty that can.
     global show_distances
     show_distances = self.show_distances
+    # draw handlers are called on every redraw of every 3d view, so only add them while there is something to draw
+    if show_distances:
+        add_handlers()
+    else:
+        remove_handlers()
     return None
 
 
@@ -237,58 +1025,127 @@ class DistanceOverlayPreferences(bpy.types.AddonPreferences):
         description="Color of the distance lines",
         subtype="COLOR",
     )  # type: ignore
+    use_bands: bpy.props.BoolProperty(
+        name="Color by distance",
+        description="Color the lines by distance band (too close, ok, too far) instead of using the line color",
+        default=False,
+    )  # type: ignore
+    near_distance: bpy.props.FloatProperty(
+        name="Too close",
+        description="Lines shorter than this are too close",
+        default=1.0,
+        min=0.0,
+        subtype="DISTANCE",
+    )  # type: ignore
+    far_distance: bpy.props.FloatProperty(
+        name="Too far",
+        description="Lines longer than this are too far",
+        default=10.0,
+        min=0.0,
+        subtype="DISTANCE",
+    )  # type: ignore
+    near_color: bpy.props.FloatVectorProperty(
+        name="Too close color",
+        size=4,
+        default=(1, 0, 0, 1),  # red
+        description="Color of lines that are too short",
+        subtype="COLOR",
+    )  # type: ignore
+    ok_color: bpy.props.FloatVectorProperty(
+        name="Ok color",
+        size=4,
+        default=(0, 1, 0, 1),  # green
+        description="Color of lines between the two distances",
+        subtype="COLOR",
+    )  # type: ignore
+    far_color: bpy.props.FloatVectorProperty(
+        name="Too far color",
+        size=4,
+        default=(1, 0.5, 0, 1),  # orange
+        description="Color of lines that are too long",
+        subtype="COLOR",
+    )  # type: ignore
+    samples: bpy.props.IntProperty(
+        name="Samples",
+        description="Maximum number of vertices per object used as starting points to find the closest surface points",
+        default=1000,
+        min=1,
+        soft_max=100000,
+    )  # type: ignore
+    budget: bpy.props.FloatProperty(
+        name="Time budget",
+        description="Maximum time in milliseconds spent on updating surface distances per redraw",
+        default=20,
+        min=1,
+        soft_max=100,
+    )  # type: ignore
 
     def draw(self, context):
         # note unlike with operators there is no default draw implementation so if you don´t add it, you see nothing
         layout = self.layout
         row = layout.row()
         row.prop(self, "linecolor")
+        row = layout.row(heading="Bands")
+        row.prop(self, "use_bands")
+        row = layout.row()
+        row.active = self.use_bands
+        row.prop(self, "near_distance")
+        row.prop(self, "far_distance")
+        row = layout.row()
+        row.active = self.use_bands
+        row.prop(self, "near_color", text="")
+        row.prop(self, "ok_color", text="")
+        row.prop(self, "far_color", text="")
         row = layout.row(heading="Labels")
         row.prop(self, "fontsize", text="Size")
         row.prop(self, "fontshadow", text="Shadow")
+        row = layout.row(heading="Surface distance")
+        row.prop(self, "samples")
+        row.prop(self, "budget")
 
 def register():
-    global handler
-    global label_handler
-    # this is post view, i.e. a 3D overlay
-    handler = bpy.types.SpaceView3D.draw_handler_add(
-        draw_handler_post_view, (), "WINDOW", "POST_VIEW"
-    )
-    # this is post pixel, i.e. a 2D overlay
-    label_handler = bpy.types.SpaceView3D.draw_handler_add(
-        draw_handler_post_pixel, (), "WINDOW", "POST_PIXEL"
-    )
+    # the draw handlers are added when the overlay is switched on, see update_show_distances()
     register_class(OBJECT_OT_distance_overlay)
     register_class(OBJECT_OT_distance_overlay_remove)
+    register_class(OBJECT_OT_distance_overlay_export)
     register_class(DistanceOverlayPreferences)
     VIEW3D_PT_overlay_object.append(overlay_options)
+    register_poll_cache()
     # custom property. Needs to be added somewhere, View3DOverlay overlay type itself would seem a good a choice
     # but that doesn´t work so we add it to the Scene instead.
     bpy.types.Scene.show_distances = bpy.props.BoolProperty(
         name="Show distances", default=False, update=update_show_distances
     )
+    bpy.types.Scene.distance_mode = bpy.props.EnumProperty(
+        name="Distance",
+        items=[
+            ("ORIGIN", "Origins", "Distance between the origins of the objects"),
+            ("SURFACE", "Surfaces", "Distance between the closest points on the surfaces of the objects"),
+        ],
+        default="ORIGIN",
+        update=lambda self, context: redraw(),
+    )
 
 
 def unregister():
-    global handler
-    global label_handler
     global active
     global targets
     global show_distances
 
-    if handler is not None:
-        bpy.types.SpaceView3D.draw_handler_remove(handler, "WINDOW")
-    if label_handler is not None:
-        bpy.types.SpaceView3D.draw_handler_remove(label_handler, "WINDOW")
+    remove_handlers()
     VIEW3D_PT_overlay_object.remove(overlay_options)
+    unregister_poll_cache()
     unregister_class(OBJECT_OT_distance_overlay)
     unregister_class(OBJECT_OT_distance_overlay_remove)
+    unregister_class(OBJECT_OT_distance_overlay_export)
     unregister_class(DistanceOverlayPreferences)
     # a bit of final cleanup so that when we disable and then disable the whole add-on any remembered state is not immediately shown
     # also: in order for Python's garbage collection to work, we must not keep references to objects
     active = None
     targets = set()
+    surface_distances.clear()
     bpy.types.Scene.show_distances = False
+    del bpy.types.Scene.distance_mode
 
 
 if __name__ == "__main__":
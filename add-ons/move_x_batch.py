@@ -0,0 +1,573 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+bl_info = {
+    "name": "Simple Move X Operator",
+    "author": "Your Name",
+    "version": (0, 0, 5),
+    "blender": (5, 0, 0),
+    "location": "Object > Move X",
+    "description": "Move, rotate or scale all selected objects along an axis",
+    "category": "Object",
+}
+
+from itertools import product
+
+import bpy
+import numpy as np
+from bpy.types import Operator
+from bpy.props import (
+    BoolProperty,
+    FloatProperty,
+    FloatVectorProperty,
+    EnumProperty,
+    StringProperty,
+    IntProperty,
+)
+from bpy_extras.anim_utils import action_ensure_channelbag_for_slot
+
+try:
+    # profile the operator if the operator_profiler add-on is installed
+    from operator_profiler import profiled
+except ImportError:
+    def profiled(cls):
+        return cls
+
+
+def object_collection(context, collection_name):
+    """
+    Return the objects to transform as a bpy_prop_collection.
+
+    :param context: The Blender context
+    :param collection_name: The name of a collection, or an empty string for the selected objects
+    :return: A collection of objects that supports foreach_get() and foreach_set()
+
+    We deliberately do not return context.selected_objects, because that is a plain
+    Python list, and a list cannot read or write an attribute of all its members
+    in a single call.
+    """
+    if collection_name:
+        return bpy.data.collections[collection_name].all_objects
+    return context.view_layer.objects.selected
+
+
+def world_matrices(objects):
+    """
+    Return the world matrices of a collection of objects.
+
+    :param objects: A bpy_prop_collection of objects, see object_collection()
+    :return: An array of shape (n, 4, 4)
+    :rtype: np.ndarray
+    """
+    n = len(objects)
+    # foreach_get flattens each matrix column by column, hence the transpose
+    flat = np.empty(n * 16, dtype=np.float32)
+    objects.foreach_get("matrix_world", flat)
+    return flat.reshape(n, 4, 4).transpose(0, 2, 1).astype(np.float64)
+
+
+def property_weights(objects, name, default=0.0):
+    """
+    Return the value of a custom property for every object.
+
+    :param objects: A collection of objects
+    :param name: The name of the custom property
+    :param default: The value to use for objects that do not have the property or where it is not a number
+    :return: An array with a value for each object
+    :rtype: np.ndarray
+
+    Custom properties are not RNA properties, so foreach_get() cannot read them
+    and we have to fall back to a list comprehension. A custom property can also
+    hold a string, an ID pointer or a group, which numpy cannot convert, so only
+    int and float values are used.
+    """
+    values = [ob.get(name, default) for ob in objects]
+    return np.array([value if isinstance(value, (int, float)) else default for value in values], dtype=np.float64)
+
+
+def falloff_weights(positions, center, radius):
+    """
+    Return a weight that decreases smoothly from 1 at the center to 0 at the radius.
+
+    :param positions: An array of shape (n, 3)
+    :param center: A vector with 3 elements
+    :param radius: The distance at which the weight becomes 0
+    :return: An array with a weight for each position
+    :rtype: np.ndarray
+    """
+    distance = np.linalg.norm(positions - np.asarray(center), axis=1)
+    t = np.clip(1 - distance / max(radius, 1e-6), 0, 1)
+    return t * t * (3 - 2 * t)  # smoothstep
+
+
+def lattice_values(cells, seed):
+    """Return a pseudo random value in the range [-1, 1] for each integer lattice point."""
+    h = (cells[:, 0] * 73856093) ^ (cells[:, 1] * 19349663) ^ (cells[:, 2] * 83492791)
+    h = h ^ ((seed * 2654435761) & 0x7FFFFFFF)
+    h = (h ^ (h >> 13)) * 1274126177  # integer overflow just wraps around, which is fine here
+    return (h & 0xFFFF) / 0xFFFF * 2 - 1
+
+
+def noise_weights(positions, scale, seed=0):
+    """
+    Return smooth value noise in the range [-1, 1] sampled at each position.
+
+    :param positions: An array of shape (n, 3)
+    :param scale: The size of the noise features
+    :param seed: Different seeds give different (but repeatable) noise
+    :return: An array with a weight for each position
+    :rtype: np.ndarray
+
+    mathutils.noise can only be evaluated one point at a time, so this is a
+    simple value noise that interpolates random values on an integer lattice
+    for all positions at once.
+    """
+    points = positions / max(scale, 1e-6)
+    cells = np.floor(points).astype(np.int64)
+    t = points - cells
+    t = t * t * (3 - 2 * t)
+    result = np.zeros(len(points))
+    for corner in product((0, 1), repeat=3):
+        weight = np.prod(np.where(corner, t, 1 - t), axis=1)
+        result += weight * lattice_values(cells + corner, seed)
+    return result
+
+
+def top_level_indices(objects):
+    """
+    Map every object to the index of its highest ancestor that is also in the list.
+
+    :param objects: A list of objects
+    :return: An array with for each object the index of the object it follows
+    :rtype: np.ndarray
+
+    An object without a parent in the list maps to itself. Just like with
+    Blender's own transform tools, children of a transformed parent should not
+    be transformed a second time but simply follow along.
+    """
+    index = {ob: i for i, ob in enumerate(objects)}
+    leaders = np.arange(len(objects))
+    for i, ob in enumerate(objects):
+        parent = ob.parent
+        while parent is not None:
+            if parent in index:
+                leaders[i] = index[parent]
+            parent = parent.parent
+    return leaders
+
+
+def delta_matrices(matrices, mode, axis, amounts):
+    """
+    Calculate a transformation for each object, relative to its own origin.
+
+    :param matrices: An array of shape (n, 4, 4) with world matrices
+    :param mode: "TRANSLATE", "ROTATE" or "SCALE"
+    :param axis: A unit vector with 3 elements
+    :param amounts: An array of n distances, angles (radians) or scale factors
+    :return: An array of shape (n, 4, 4) that transforms the old world matrices into new ones
+    :rtype: np.ndarray
+    """
+    n = len(matrices)
+    delta = np.zeros((n, 4, 4))
+    delta[:] = np.identity(4)
+    outer = np.outer(axis, axis)
+    if mode == "TRANSLATE":
+        delta[:, :3, 3] = amounts[:, None] * axis
+        return delta
+    if mode == "ROTATE":
+        # Rodrigues' rotation formula, for all angles at once
+        cross = np.array(
+            [
+                [0, -axis[2], axis[1]],
+                [axis[2], 0, -axis[0]],
+                [-axis[1], axis[0], 0],
+            ]
+        )
+        cos = np.cos(amounts)[:, None, None]
+        sin = np.sin(amounts)[:, None, None]
+        linear = cos * np.identity(3) + sin * cross + (1 - cos) * outer
+    else:  # SCALE: only the component along the axis is scaled
+        linear = np.identity(3) + (amounts[:, None, None] - 1) * outer
+    # rotate and scale around the origin of each object: p' = L (p - o) + o
+    origins = matrices[:, :3, 3]
+    delta[:, :3, :3] = linear
+    delta[:, :3, 3] = origins - np.einsum("nij,nj->ni", linear, origins)
+    return delta
+
+
+def transform_objects(objects, mode, axis, amounts):
+    """
+    Transform a collection of objects in world space in a single pass.
+
+    :param objects: A bpy_prop_collection of objects, see object_collection()
+    :param mode: "TRANSLATE", "ROTATE" or "SCALE"
+    :param axis: A vector with 3 elements, it does not have to be normalized
+    :param amounts: A single amount or an array with an amount for each object,
+        for example calculated with one of the *_weights() functions
+
+    The world and local matrices are read with foreach_get() and the local
+    matrices are written with a single foreach_set(), so the cost is dominated
+    by NumPy, not by Python attribute access.
+
+    Only objects that do not follow a transformed ancestor are changed, the
+    others keep their local matrix and simply follow along. We do not write
+    matrix_world, because Blender converts that to a local matrix using the
+    world matrix the parent had at the last depsgraph update, so a child
+    whose (unselected) parent follows a transformed grandparent would get
+    the transformation twice.
+    """
+    n = len(objects)
+    if n == 0:
+        return
+    axis = np.array(axis, dtype=np.float64)
+    axis /= np.linalg.norm(axis)
+    amounts = np.broadcast_to(np.asarray(amounts, dtype=np.float64), (n,))
+
+    # only objects that do not follow an ancestor are transformed
+    keep = np.flatnonzero(top_level_indices(list(objects)) == np.arange(n))
+    world = world_matrices(objects)[keep]
+    basis = basis_matrices(objects)
+    # world = parent @ basis, where parent also includes the parent inverse matrix
+    parent_inverse = np.linalg.pinv(world @ np.linalg.pinv(basis[keep]))
+    delta = delta_matrices(world, mode, axis, amounts[keep])
+    basis[keep] = parent_inverse @ delta @ world
+
+    objects.foreach_set("matrix_basis", basis.transpose(0, 2, 1).astype(np.float32).ravel())
+
+
+def basis_matrices(objects):
+    """Like world_matrices(), but for the local transformation (location, rotation and scale) of each object."""
+    n = len(objects)
+    flat = np.empty(n * 16, dtype=np.float32)
+    objects.foreach_get("matrix_basis", flat)
+    return flat.reshape(n, 4, 4).transpose(0, 2, 1).astype(np.float64)
+
+
+def decompose(matrices):
+    """
+    Split matrices into location, XYZ euler rotation and scale.
+
+    :param matrices: An array of shape (n, 4, 4) without shear
+    :return: Three arrays of shape (n, 3)
+    :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+    """
+    location = matrices[:, :3, 3]
+    scale = np.linalg.norm(matrices[:, :3, :3], axis=1)  # length of each column
+    # a negative determinant means the object is mirrored; we put that in the x scale
+    scale[np.linalg.det(matrices[:, :3, :3]) < 0, 0] *= -1
+    r = matrices[:, :3, :3] / np.where(scale == 0, 1, scale)[:, None, :]
+    # Blender's XYZ euler order means R = Rz @ Ry @ Rx
+    rotation = np.column_stack(
+        (
+            np.arctan2(r[:, 2, 1], r[:, 2, 2]),
+            np.arctan2(-r[:, 2, 0], np.hypot(r[:, 0, 0], r[:, 1, 0])),
+            np.arctan2(r[:, 1, 0], r[:, 0, 0]),
+        )
+    )
+    return location, rotation, scale
+
+
+def fraction_of(mode, amounts, fraction):
+    """Return a fraction of the amounts, where for scaling no change means a factor of 1."""
+    if mode == "SCALE":
+        return 1 + (amounts - 1) * fraction
+    return amounts * fraction
+
+
+def set_keyframes(fcurve, frames, values):
+    """
+    Replace the keyframes of an fcurve in a range of frames.
+
+    :param fcurve: The fcurve
+    :param frames: An array of increasing frame numbers
+    :param values: An array with a value for each frame
+
+    Keyframes outside the range are kept, although they lose any handle
+    and interpolation settings they had. All points are written with a
+    single foreach_set() instead of a keyframe_insert() for every frame.
+    """
+    points = fcurve.keyframe_points
+    old = np.empty(len(points) * 2, dtype=np.float32)
+    points.foreach_get("co", old)
+    old = old.reshape(-1, 2)
+    old = old[(old[:, 0] < frames[0]) | (old[:, 0] > frames[-1])]
+
+    co = np.concatenate((old, np.column_stack((frames, values))))
+    co = co[np.argsort(co[:, 0], kind="stable")]
+
+    points.clear()
+    points.add(len(co))
+    points.foreach_set("co", co.astype(np.float32).ravel())
+    fcurve.update()  # recalculates the handles
+
+
+def object_channelbag(ob):
+    """
+    Return the channelbag that holds the fcurves of an object, creating an action if needed.
+
+    Since Blender 4.4 fcurves are stored per slot in an action instead of
+    directly in the action, which is why this is a bit more involved than
+    just accessing ob.animation_data.action.fcurves.
+    """
+    animation_data = ob.animation_data or ob.animation_data_create()
+    if animation_data.action is None:
+        animation_data.action = bpy.data.actions.new(name=f"{ob.name}Action")
+    if animation_data.action_slot is None:
+        animation_data.action_slot = animation_data.action.slots.new(id_type="OBJECT", name=ob.name)
+    return action_ensure_channelbag_for_slot(animation_data.action, animation_data.action_slot)
+
+
+def bake_objects(objects, mode, axis, amounts, frames):
+    """
+    Animate a transformation over a range of frames by writing keyframes directly.
+
+    :param objects: A bpy_prop_collection of objects, see object_collection()
+    :param mode: "TRANSLATE", "ROTATE" or "SCALE"
+    :param axis: A vector with 3 elements, it does not have to be normalized
+    :param amounts: A single amount or an array with an amount for each object
+    :param frames: An array of increasing frame numbers
+    :return: The number of objects that were not keyed because their rotation mode is not XYZ euler
+    :rtype: int
+
+    The transformation starts at the current state on the first frame and
+    reaches the full amount on the last frame. We calculate the local
+    location, rotation or scale of every object for every frame with NumPy
+    and then write each fcurve with a single foreach_set(), so the work done
+    in Python grows with the number of objects, not with the number of frames.
+
+    Just like with transform_objects(), children of a transformed object
+    simply follow it, so they don't get keyframes.
+    Scaling along an axis that is not aligned with the local axes of an
+    object results in shear, which cannot be keyed and is ignored.
+    """
+    n = len(objects)
+    if n == 0:
+        return 0
+    axis = np.array(axis, dtype=np.float64)
+    axis /= np.linalg.norm(axis)
+    amounts = np.broadcast_to(np.asarray(amounts, dtype=np.float64), (n,))
+    frames = np.asarray(frames, dtype=np.float64)
+
+    # only objects that do not follow an ancestor get keyframes
+    items = list(objects)
+    keep = np.flatnonzero(top_level_indices(items) == np.arange(n))
+    obs = [items[i] for i in keep]
+    world = world_matrices(objects)[keep]
+    basis = basis_matrices(objects)[keep]
+    amounts = amounts[keep]
+    # world = parent @ basis, where parent also includes the parent inverse matrix
+    parent_inverse = np.linalg.pinv(world @ np.linalg.pinv(basis))
+
+    fractions = (frames - frames[0]) / max(frames[-1] - frames[0], 1)
+    channel = {"TRANSLATE": 0, "ROTATE": 1, "SCALE": 2}[mode]
+    values = np.empty((len(frames), len(obs), 3))
+    for f, fraction in enumerate(fractions):
+        delta = delta_matrices(world, mode, axis, fraction_of(mode, amounts, fraction))
+        values[f] = decompose(parent_inverse @ delta @ world)[channel]
+
+    if mode == "ROTATE":
+        # arctan2 jumps from pi to -pi, but the animation should be smooth and start
+        # at the current values, which may lie outside the range [-pi, pi]
+        values = np.unwrap(values, axis=0)
+        current = np.empty(n * 3, dtype=np.float32)
+        objects.foreach_get("rotation_euler", current)
+        current = current.reshape(n, 3)[keep]
+        values += 2 * np.pi * np.round((current - values[0]) / (2 * np.pi))
+
+    path = ("location", "rotation_euler", "scale")[channel]
+    skipped = 0
+    for i, ob in enumerate(obs):
+        if mode == "ROTATE" and ob.rotation_mode != "XYZ":
+            skipped += 1
+            continue
+        fcurves = object_channelbag(ob).fcurves
+        for index in range(3):
+            fcurve = fcurves.find(path, index=index) or fcurves.new(path, index=index)
+            set_keyframes(fcurve, frames, values[:, i, index])
+    return skipped
+
+
+@profiled
+class OBJECT_OT_move_x(Operator):
+    bl_idname = "object.move_x"
+    bl_label = "Move X"
+    bl_options = {"REGISTER", "UNDO"}
+
+    mode: EnumProperty(
+        name="Mode",
+        items=[
+            ("TRANSLATE", "Move", "Move along the axis"),
+            ("ROTATE", "Rotate", "Rotate around the axis"),
+            ("SCALE", "Scale", "Scale along the axis"),
+        ],
+        default="TRANSLATE",
+    )
+
+    axis: FloatVectorProperty(
+        name="Axis", description="Axis in world space", default=(1, 0, 0), subtype="XYZ"
+    )
+
+    amount: FloatProperty(
+        name="Amount", description="Amount to move along the axis", default=1.0
+    )
+
+    angle: FloatProperty(
+        name="Angle", description="Angle to rotate around the axis", default=0.0, subtype="ANGLE"
+    )
+
+    factor: FloatProperty(
+        name="Factor", description="Factor to scale along the axis", default=1.0
+    )
+
+    collection: StringProperty(
+        name="Collection",
+        description="Transform all objects in this collection instead of the selected objects",
+        default="",
+    )
+
+    source: EnumProperty(
+        name="Per object",
+        description="How much of the amount is applied to each object",
+        items=[
+            ("CONSTANT", "Constant", "Apply the full amount to every object"),
+            ("PROPERTY", "Custom property", "Multiply the amount by a custom property of each object"),
+            ("FALLOFF", "Falloff", "Apply less of the amount the further an object is from a center"),
+            ("NOISE", "Noise", "Multiply the amount by a noise value between -1 and 1"),
+        ],
+        default="CONSTANT",
+    )
+
+    property_name: StringProperty(
+        name="Property", description="Name of the custom property", default="offset"
+    )
+
+    center: FloatVectorProperty(
+        name="Center", description="Center of the falloff", default=(0, 0, 0), subtype="XYZ"
+    )
+
+    radius: FloatProperty(
+        name="Radius", description="Distance at which the falloff reaches zero", default=10.0, min=0.0
+    )
+
+    noise_scale: FloatProperty(
+        name="Noise scale", description="Size of the noise features", default=1.0, min=0.001
+    )
+
+    seed: IntProperty(name="Seed", description="Random seed for the noise", default=0, min=0)
+
+    bake: BoolProperty(
+        name="Animate",
+        description="Insert keyframes that animate the transformation over a range of frames",
+        default=False,
+    )
+
+    frame_start: IntProperty(name="Start", description="First frame of the animation", default=1)
+
+    frame_end: IntProperty(name="End", description="Last frame of the animation", default=250)
+
+    def weights(self, objects):
+        """
+        Calculate the fraction of the amount that applies to each object.
+
+        :param objects: A bpy_prop_collection of objects
+        :return: A single weight or an array with a weight for each object
+        """
+        if self.source == "PROPERTY":
+            return property_weights(objects, self.property_name)
+        if self.source == "FALLOFF":
+            return falloff_weights(world_matrices(objects)[:, :3, 3], self.center, self.radius)
+        if self.source == "NOISE":
+            return noise_weights(world_matrices(objects)[:, :3, 3], self.noise_scale, self.seed)
+        return 1.0
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "mode")
+        layout.prop(self, "axis")
+        if self.mode == "TRANSLATE":
+            layout.prop(self, "amount")
+        elif self.mode == "ROTATE":
+            layout.prop(self, "angle")
+        else:
+            layout.prop(self, "factor")
+        layout.prop_search(self, "collection", bpy.data, "collections")
+        layout.prop(self, "source")
+        if self.source == "PROPERTY":
+            layout.prop(self, "property_name")
+        elif self.source == "FALLOFF":
+            layout.prop(self, "center")
+            layout.prop(self, "radius")
+        elif self.source == "NOISE":
+            layout.prop(self, "noise_scale")
+            layout.prop(self, "seed")
+        layout.prop(self, "bake")
+        if self.bake:
+            row = layout.row(align=True)
+            row.prop(self, "frame_start")
+            row.prop(self, "frame_end")
+
+    def invoke(self, context, event):
+        """Default to the frame range of the scene"""
+        if not self.properties.is_property_set("frame_start"):
+            self.frame_start = context.scene.frame_start
+        if not self.properties.is_property_set("frame_end"):
+            self.frame_end = context.scene.frame_end
+        return self.execute(context)
+
+    def execute(self, context):
+        """Transform all selected objects (or all objects in a collection) along an axis"""
+        if self.collection and self.collection not in bpy.data.collections:
+            self.report({"ERROR"}, f"No collection named {self.collection}")
+            return {"CANCELLED"}
+        if sum(a * a for a in self.axis) == 0:
+            self.report({"ERROR"}, "The axis cannot be zero")
+            return {"CANCELLED"}
+        if self.bake and self.frame_end < self.frame_start:
+            self.report({"ERROR"}, "The end frame cannot be before the start frame")
+            return {"CANCELLED"}
+
+        objects = object_collection(context, self.collection)
+        weights = self.weights(objects)
+        # a weight of 0 should leave an object alone, which for scaling means a factor of 1
+        if self.mode == "TRANSLATE":
+            amounts = self.amount * weights
+        elif self.mode == "ROTATE":
+            amounts = self.angle * weights
+        else:
+            amounts = 1 + (self.factor - 1) * weights
+        if self.bake:
+            frames = np.arange(self.frame_start, self.frame_end + 1)
+            skipped = bake_objects(objects, self.mode, self.axis, amounts, frames)
+            if skipped:
+                self.report({"WARNING"}, f"{skipped} objects not animated, their rotation mode is not XYZ Euler")
+        else:
+            transform_objects(objects, self.mode, self.axis, amounts)
+        return {"FINISHED"}
+
+    @classmethod
+    def poll(cls, context):
+        """Ensure we are in object mode"""
+        return context.mode == "OBJECT"
+
+
+from bpy.utils import register_class, unregister_class
+from bpy.types import VIEW3D_MT_object
+
+
+def menu_func(self, context):
+    self.layout.operator(OBJECT_OT_move_x.bl_idname)
+
+
+def register():
+    register_class(OBJECT_OT_move_x)
+    VIEW3D_MT_object.append(menu_func)
+
+
+def unregister():
+    VIEW3D_MT_object.remove(menu_func)
+    unregister_class(OBJECT_OT_move_x)
+
+
+if __name__ == "__main__":
+    register()
@@ -0,0 +1,344 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+bl_info = {
+    "name": "Operator profiler",
+    "author": "Michel Anders (varkenvarken)",
+    "version": (0, 0, 1),
+    "blender": (5, 0, 0),
+    "location": "View3D > Sidebar > Profiler",
+    "description": "Measure where the time goes in operators that opt in to profiling",
+    "category": "Development",
+    "doc_url": "https://github.com/varkenvarken/Blender-add-on-development",
+}
+
+# Other add-ons opt in by decorating their operator classes. Add-ons are
+# installed as single files, so they should not depend on this one being
+# installed, which is why they import it like this:
+#
+#   try:
+#       from operator_profiler import profiled
+#   except ImportError:  # profiler not installed, profiling is a no-op
+#       def profiled(cls):
+#           return cls
+#
+#   @profiled
+#   class OBJECT_OT_something(Operator):
+#       ...
+#
+# Decorating an operator costs almost nothing while profiling is off.
+
+import cProfile
+import os
+import pstats
+import sys
+from functools import wraps
+from time import perf_counter
+
+import bpy
+from bpy.types import Operator, Panel, AddonPreferences
+from bpy.props import EnumProperty, StringProperty
+from bpy.utils import register_class, unregister_class
+
+# OFF, TIMER or CPROFILE, kept in sync with the add-on preferences (see register() and update_mode()).
+# Other add-ons decorate their operators as soon as this module can be imported, even when
+# the profiler is not enabled, so nothing is measured until register() reads the preferences.
+mode = "OFF"
+
+
+class Timing:
+    """Number of calls, total time and longest time of one method of one operator."""
+
+    __slots__ = ("calls", "total", "longest")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.longest = 0.0
+
+    def add(self, seconds):
+        self.calls += 1
+        self.total += seconds
+        if seconds > self.longest:
+            self.longest = seconds
+
+    @property
+    def mean(self):
+        return self.total / self.calls if self.calls else 0.0
+
+
+# (operator bl_idname, method name) -> Timing
+timings = {}
+# operator bl_idname -> cProfile.Profile, accumulated over all profiled calls
+profiles = {}
+# (operator bl_idname, bpy.ops operator it called) -> Timing
+ops_timings = {}
+# operator bl_idname -> the file the operator is defined in
+sources = {}
+# operator bl_idname -> (number of calls, breakdown()), so the panel does not analyze the same profile every redraw
+breakdowns = {}
+# the operator being profiled with cProfile, if any. cProfile cannot be nested,
+# so operators called by a profiled operator are only timed.
+profiling = None
+
+
+def timing(table, key):
+    """Return the Timing for a key, adding it to the table if needed."""
+    t = table.get(key)
+    if t is None:
+        t = table[key] = Timing()
+    return t
+
+
+def traced_ops_call(call):
+    """
+    Wrap bpy.ops calls so that we know how much time each called operator takes.
+
+    cProfile cannot tell calls to different operators apart: they all go
+    through the same __call__ method. So while an operator is profiled,
+    that method is replaced by this wrapper (see profile_call()).
+    """
+
+    @wraps(call)
+    def wrapper(self, *args, **kwargs):
+        start = perf_counter()
+        try:
+            return call(self, *args, **kwargs)
+        finally:
+            timing(ops_timings, (profiling, self.idname_py())).add(perf_counter() - start)
+
+    wrapper.wrapped = call
+    return wrapper
+
+
+def ops_class():
+    """The class of the objects in bpy.ops submodules, or None if this Blender version has another implementation."""
+    cls = getattr(bpy.ops, "_BPyOpsSubModOp", None)
+    return cls if cls is not None and hasattr(cls, "idname_py") else None
+
+
+def profile_call(idname, function, args, kwargs):
+    """Call a function with cProfile enabled and bpy.ops calls traced."""
+    global profiling
+    profile = profiles.get(idname)
+    if profile is None:
+        profile = profiles[idname] = cProfile.Profile()
+    cls = ops_class()
+    if cls is not None:
+        cls.__call__ = traced_ops_call(cls.__call__)
+    profiling = idname
+    profile.enable()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        profile.disable()
+        profiling = None
+        if cls is not None:
+            cls.__call__ = cls.__call__.wrapped
+
+
+def timed_call(function, idname, method, use_cprofile, args):
+    """Call function with args and record how long that took, see wrap()."""
+    if mode == "OFF":
+        return function(*args)
+    start = perf_counter()
+    try:
+        if mode == "CPROFILE" and use_cprofile and profiling is None:
+            return profile_call(idname, function, args, {})
+        return function(*args)
+    finally:
+        timing(timings, (idname, method)).add(perf_counter() - start)
+
+
+def wrap(function, idname, method, use_cprofile=True):
+    """
+    Return a function that calls function and records how long that took.
+
+    register_class() checks the number of arguments of operator methods, so the
+    wrapper has exactly the arguments Blender passes, not *args and **kwargs.
+    """
+    if method in ("invoke", "modal"):
+
+        @wraps(function)
+        def wrapper(self, context, event):
+            return timed_call(function, idname, method, use_cprofile, (self, context, event))
+
+    else:  # execute, and the function of the poll() classmethod, which gets cls instead of self
+
+        @wraps(function)
+        def wrapper(self, context):
+            return timed_call(function, idname, method, use_cprofile, (self, context))
+
+    return wrapper
+
+
+def profiled(cls):
+    """
+    Class decorator that adds profiling to an operator.
+
+    :param cls: An Operator subclass
+    :return: The same class, with its poll(), invoke(), execute() and modal() methods wrapped
+
+    poll() is called very often by menus and panels, so it is only timed,
+    never profiled with cProfile.
+    """
+    idname = cls.bl_idname
+    sources[idname] = getattr(sys.modules.get(cls.__module__), "__file__", None)
+    for method in ("execute", "invoke", "modal"):
+        if method in cls.__dict__:
+            setattr(cls, method, wrap(cls.__dict__[method], idname, method))
+    if "poll" in cls.__dict__:
+        poll = cls.__dict__["poll"].__func__
+        setattr(cls, "poll", classmethod(wrap(poll, idname, "poll", use_cprofile=False)))
+    return cls
+
+
+def breakdown(idname):
+    """
+    Split the time of the cProfile'd calls of an operator in broad categories.
+
+    :param idname: The bl_idname of an operator
+    :return: A list of (description, seconds) tuples, largest first
+
+    The categories are the time spent in each operator called through bpy.ops,
+    the time spent in Python functions of the add-on itself (its loops, mostly),
+    and everything else (other Python code and Blender's data API).
+    """
+    profile = profiles.get(idname)
+    if profile is None:
+        return []
+    calls = sum(t.calls for (name, method), t in timings.items() if name == idname and method != "poll")
+    if idname in breakdowns and breakdowns[idname][0] == calls:
+        return breakdowns[idname][1]
+
+    stats = pstats.Stats(profile)
+    rows = [(f"bpy.ops.{called}", t.total) for (caller, called), t in ops_timings.items() if caller == idname]
+    own = sum(tt for (filename, _, _), (_, _, tt, _, _) in stats.stats.items() if filename == sources.get(idname))
+    rows.append(("add-on Python code", own))
+    rows.append(("other", max(0.0, stats.total_tt - sum(seconds for _, seconds in rows))))
+    rows.sort(key=lambda row: -row[1])
+    breakdowns[idname] = (calls, rows)
+    return rows
+
+
+def reset():
+    """Forget all measurements."""
+    timings.clear()
+    profiles.clear()
+    ops_timings.clear()
+    breakdowns.clear()
+
+
+class PROFILER_OT_reset(Operator):
+    bl_idname = "profiler.reset"
+    bl_label = "Reset"
+    bl_description = "Forget all measurements"
+
+    def execute(self, context):
+        reset()
+        return {"FINISHED"}
+
+
+class PROFILER_OT_dump(Operator):
+    bl_idname = "profiler.dump"
+    bl_label = "Save .prof files"
+    bl_description = "Save the cProfile statistics of each operator as a .prof file, for use with pstats or snakeviz"
+
+    directory: StringProperty(name="Directory", subtype="DIR_PATH")  # type: ignore
+
+    @classmethod
+    def poll(cls, context):
+        return len(profiles) > 0
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        directory = bpy.path.abspath(self.directory) if self.directory else bpy.app.tempdir
+        for idname, profile in profiles.items():
+            profile.dump_stats(os.path.join(directory, f"{idname}.prof"))
+        self.report({"INFO"}, f"Saved {len(profiles)} .prof files in {directory}")
+        return {"FINISHED"}
+
+
+class VIEW3D_PT_operator_profiler(Panel):
+    bl_label = "Operator profiler"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "Profiler"
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(context.preferences.addons[__name__].preferences, "mode", expand=True)
+        row = layout.row()
+        row.operator(PROFILER_OT_reset.bl_idname)
+        row.operator(PROFILER_OT_dump.bl_idname)
+
+        idnames = sorted({idname for idname, _ in timings})
+        if not idnames:
+            layout.label(text="No profiled operators called yet")
+        for idname in idnames:
+            box = layout.box()
+            box.label(text=idname)
+            grid = box.grid_flow(columns=5, even_columns=True)
+            for text in ("", "calls", "total ms", "mean ms", "max ms"):
+                grid.label(text=text)
+            for method in ("poll", "invoke", "execute", "modal"):
+                t = timings.get((idname, method))
+                if t is not None:
+                    grid.label(text=method)
+                    grid.label(text=str(t.calls))
+                    grid.label(text=f"{t.total * 1000:.2f}")
+                    grid.label(text=f"{t.mean * 1000:.3f}")
+                    grid.label(text=f"{t.longest * 1000:.2f}")
+            rows = breakdown(idname)
+            total = sum(seconds for _, seconds in rows)
+            for description, seconds in rows[:8]:
+                box.label(text=f"{seconds * 1000:10.2f} ms {100 * seconds / total if total else 0:5.1f}%  {description}")
+
+
+def update_mode(self, context):
+    global mode
+    mode = self.mode
+
+
+class OperatorProfilerPreferences(AddonPreferences):
+    bl_idname = __name__
+
+    mode: EnumProperty(
+        name="Profiling",
+        items=[
+            ("OFF", "Off", "Do not measure anything"),
+            ("TIMER", "Timer", "Only time each call (low overhead)"),
+            ("CPROFILE", "cProfile", "Time each call and profile execute, invoke and modal with cProfile (high overhead)"),
+        ],
+        default="TIMER",
+        update=update_mode,
+    )  # type: ignore
+
+    def draw(self, context):
+        self.layout.prop(self, "mode", expand=True)
+
+
+classes = [PROFILER_OT_reset, PROFILER_OT_dump, VIEW3D_PT_operator_profiler, OperatorProfilerPreferences]
+
+
+def register():
+    global mode
+    for cls in classes:
+        register_class(cls)
+    mode = bpy.context.preferences.addons[__name__].preferences.mode
+
+
+def unregister():
+    global mode
+    mode = "OFF"  # decorated operators of other add-ons keep working, they just stop measuring
+    reset()
+    for cls in reversed(classes):
+        unregister_class(cls)
+
+
+if __name__ == "__main__":
+    register()
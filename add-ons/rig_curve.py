@@ -2,14 +2,24 @@
 #
 # SPDX-License-Identifier: GPL-2.0-or-later 
 
+import os
+import zlib
 from typing import Any
 import typing
 import bpy
-from bpy_extras.object_utils import object_data_add
+from bpy.app.handlers import persistent
 from bpy.types import Operator
-from bpy.props import FloatProperty, BoolProperty
+from bpy.props import FloatProperty, BoolProperty, IntProperty, StringProperty
 from bpy.utils import register_class, unregister_class
 from bpy.types import VIEW3D_MT_object
+from mathutils import Matrix, Vector
+
+try:
+    # profile the operator if the operator_profiler add-on is installed
+    from operator_profiler import profiled
+except ImportError:
+    def profiled(cls):
+        return cls
 
 
 bl_info = {
@@ -55,6 +65,8 @@ def create_armature(
 
     The list of points should contain at least 2 items.
     """
+    from bpy_extras.object_utils import object_data_add
+
     armature = bpy.data.armatures.new(name="Curve Rig")
     armature_object = object_data_add(bpy.context, armature, operator=None, name=None)
 
@@ -136,18 +148,660 @@ def create_hooks(
         empty.empty_display_size = size
 
         # then we constrain the location of the empty to the corresponding bone in the armature
-        constraint = empty.constraints.new(type="COPY_LOCATION")
-        constraint.target = armature
-        # the first empty is contrained to the head of the first bone
-        if j == 0:
-            constraint.subtarget = armature.data.bones[j].name
-            constraint.head_tail = 0.0
-        # all other empties are constrained to the tail ends
+        constrain_to_bone(empty, armature, j)
+
+
+def constrain_to_bone(empty: bpy.types.Object, armature: bpy.types.Object, j: int) -> None:
+    """
+    Constrain the location of the empty that hooks control point j to the armature.
+
+    :param empty: The empty object of the hook
+    :param armature: The armature object created by create_armature
+    :param j: The index of the control point
+    """
+    constraint = empty.constraints.new(type="COPY_LOCATION")
+    constraint.target = armature
+    # the first empty is contrained to the head of the first bone
+    if j == 0:
+        constraint.subtarget = armature.data.bones[j].name
+        constraint.head_tail = 0.0
+    # all other empties are constrained to the tail ends
+    else:
+        constraint.subtarget = armature.data.bones[j - 1].name
+        constraint.head_tail = 1.0
+
+
+# The functions below rig a curve just like the operator does, but they do not
+# depend on the context (the active object, the selection or the mode) and call
+# no operators, except for the one mode switch that adding bones needs. That
+# makes them safe and quick to use in scripts that run in background mode,
+# for example to rig thousands of curves on a render farm:
+#
+#   import rig_curve
+#   armature = rig_curve.rig_curve(bpy.data.objects["Curve"], bpy.data.collections["Collection"])
+
+
+def is_riggable(ob: bpy.types.Object) -> bool:
+    """
+    Check if an object is a Curve object with a single Bezier spline with at least 2 control points.
+
+    :param ob: Any object, or None
+    :return: True if requirements are met
+    :rtype: bool
+    """
+    return (
+        ob is not None
+        and ob.type == "CURVE"
+        and len(ob.data.splines) == 1  # type: ignore
+        and ob.data.splines[0].type == "BEZIER"  # type: ignore
+        and len(ob.data.splines[0].bezier_points) >= 2  # type: ignore
+    )
+
+
+def add_bones(armature: bpy.types.Object, points: list[tuple[Any, ...]], ik: bool) -> None:
+    """
+    Add a chain of bones through the points to an armature object, like create_armature() does.
+
+    :param armature: An armature object without bones, linked to a collection in a scene
+    :param points: A list of tuples with the coordinates of each control point
+    :param ik: Whether to add an inverse kinematic constraint to the last bone
+
+    Bones can only be added in edit mode, and only an operator can switch modes.
+    The context override makes that operator work on our armature, whatever
+    the active object or the selection happens to be.
+    """
+    with bpy.context.temp_override(active_object=armature, object=armature):
+        bpy.ops.object.mode_set(mode="EDIT")
+        parent = None
+        for index, (a, b) in enumerate(zip(points, points[1:])):
+            bone = armature.data.edit_bones.new(name=f"Bone.{index:03d}")
+            bone.head = a
+            bone.tail = b
+            if parent:
+                bone.parent = parent
+            parent = bone
+        bpy.ops.object.mode_set(mode="OBJECT")
+
+    # the pose bones are also available in object mode, no need to switch to pose mode
+    if ik:
+        armature.pose.bones[-1].constraints.new(type="IK")
+
+
+def add_hooks(
+    curve: bpy.types.Object, armature: bpy.types.Object, collection: bpy.types.Collection, size: float
+) -> None:
+    """
+    Hook each control point of the curve to an empty that follows the armature, like create_hooks() does.
+
+    :param curve: The curve object to rig
+    :param armature: The armature object with its bones
+    :param collection: The collection to add the empties to
+    :param size: The display size of the empty hook objects
+
+    Instead of selecting each control point and calling hook_add_newob(),
+    the empties and hook modifiers are added directly, set up the same way
+    the operator does it.
+    """
+    for j, bp in enumerate(curve.data.splines[0].bezier_points):  # type: ignore
+        add_hook(curve, armature, collection, size, j, bp.co)
+
+
+def add_hook(
+    curve: bpy.types.Object,
+    armature: bpy.types.Object,
+    collection: bpy.types.Collection,
+    size: float,
+    j: int,
+    co: Any,
+) -> bpy.types.HookModifier:
+    """
+    Hook control point j of the curve to a new empty that follows the armature.
+
+    :param co: The coordinates of the control point, in the object space of the curve
+    :return: The new hook modifier
+    """
+    empty = bpy.data.objects.new("Empty", None)
+    collection.objects.link(empty)
+    empty.empty_display_type = "SPHERE"
+    empty.empty_display_size = size
+
+    hook = curve.modifiers.new(name=f"Hook-{empty.name}", type="HOOK")
+    hook.object = empty
+    # a Bezier point counts as three vertices: left handle, control point and right handle
+    hook.vertex_indices_set([3 * j + 1])
+    place_hook(curve, hook, co)
+
+    constrain_to_bone(empty, armature, j)
+    return hook
+
+
+def place_hook(curve: bpy.types.Object, hook: bpy.types.HookModifier, co: Any) -> None:
+    """
+    Put the empty of a hook at a control point, so that the hook does not move it.
+
+    :param co: The coordinates of the control point, in the object space of the curve
+    """
+    empty = hook.object
+    empty.location = curve.matrix_world @ Vector(co)
+    hook.center = co
+    # this cancels the transform the empty has now, so the curve stays where it is.
+    # empty.matrix_world is not updated until the depsgraph is evaluated, but the empty has only a location
+    hook.matrix_inverse = Matrix.Translation(empty.location).inverted() @ curve.matrix_world
+
+
+def rig_curve(
+    curve: bpy.types.Object, collection: bpy.types.Collection, size: float = 0.1, ik: bool = True
+) -> bpy.types.Object:
+    """
+    Rig a curve with an armature, without relying on the context.
+
+    :param curve: A curve object that passes is_riggable(), in object mode
+    :param collection: The collection to add the armature and empties to; it must be part of the view layer
+    :param size: The display size of the empty hook objects
+    :param ik: Whether to add an inverse kinematic constraint to the last bone
+    :return: The created armature object
+    :rtype: bpy.types.Object
+    :raises ValueError: If the curve cannot be rigged
+
+    The result is the same as that of the operator, but the active object,
+    the selection and the mode of other objects are left alone.
+    """
+    if not is_riggable(curve):
+        raise ValueError(f"{curve.name} is not a curve with a single Bezier spline with at least 2 control points")
+
+    armature = bpy.data.objects.new("Curve Rig", bpy.data.armatures.new(name="Curve Rig"))
+    collection.objects.link(armature)
+    # make sure the armature is at the location of the curve
+    armature.matrix_world = curve.matrix_world.copy()  # copy is needed, objects shouldn´t share!
+    armature.show_in_front = True
+
+    points = control_points(curve.data.splines[0])  # type: ignore
+    add_bones(armature, points, ik)
+    add_hooks(curve, armature, collection, size)
+    store_rig(armature, points, size, ik)
+    return armature
+
+
+# A rig remembers what it was made for in a custom property of the armature object,
+# so it can be brought up to date after the curve was edited, without starting over.
+
+RIG_PROPERTY = "rig_curve"
+
+
+def store_rig(armature: bpy.types.Object, points: list[tuple[Any, ...]], size: float, ik: bool) -> None:
+    """
+    Remember the control points and options a rig was made for.
+
+    :param armature: The armature object of the rig
+    :param points: A list of tuples with the coordinates of each control point
+    :param size: The display size of the empty hook objects
+    :param ik: Whether the last bone has an inverse kinematic constraint
+    """
+    armature[RIG_PROPERTY] = {"points": [c for co in points for c in co], "size": size, "ik": ik}
+
+
+def stored_points(armature: bpy.types.Object) -> list[tuple[Any, ...]]:
+    """Return the control points the rig was last made or updated for, see store_rig()."""
+    flat = list(armature[RIG_PROPERTY]["points"])
+    return [tuple(flat[i : i + 3]) for i in range(0, len(flat), 3)]
+
+
+def find_rig(curve: bpy.types.Object) -> bpy.types.Object | None:
+    """
+    Return the armature object that rigs a curve, or None.
+
+    The hooks of the curve lead to empties that are constrained to the armature.
+    Only armatures made by this version of the add-on (with stored points) are found.
+    """
+    for modifier in curve.modifiers:
+        if modifier.type == "HOOK" and modifier.object is not None:
+            for constraint in modifier.object.constraints:
+                target = constraint.target
+                if constraint.type == "COPY_LOCATION" and target is not None and RIG_PROPERTY in target:
+                    return target
+    return None
+
+
+def rig_hooks(
+    curve: bpy.types.Object, armature: bpy.types.Object
+) -> tuple[dict[int, bpy.types.HookModifier], list[bpy.types.HookModifier]]:
+    """
+    Find the hooks of a rig.
+
+    :return: A dict with the hook for each control point index, and a list of
+        hooks that no longer belong to a single control point
+
+    When control points are added or deleted in edit mode, Blender updates the
+    vertex indices of the hooks, so a hook stays with its control point. The hook
+    of a deleted point is left without vertices.
+
+    A hook whose empty lost its location constraint (removed by hand) is only
+    counted if no other hook of the rig controls its point; it is never an orphan,
+    because it might be a hook the user added.
+    """
+    hooks = {}
+    orphans = []
+    unconstrained = []
+    for modifier in curve.modifiers:
+        if modifier.type != "HOOK" or modifier.object is None:
+            continue
+        indices = modifier.vertex_indices
+        j = indices[0] // 3 if len(indices) == 1 and indices[0] % 3 == 1 else None
+        if not any(constraint.target == armature for constraint in modifier.object.constraints):
+            if j is not None and not any(c.type == "COPY_LOCATION" for c in modifier.object.constraints):
+                unconstrained.append((j, modifier))
+            continue
+        if j is None or j in hooks:
+            orphans.append(modifier)
         else:
-            constraint.subtarget = armature.data.bones[j - 1].name
-            constraint.head_tail = 1.0
+            hooks[j] = modifier
+    for j, modifier in unconstrained:
+        hooks.setdefault(j, modifier)
+    return hooks, orphans
+
+
+def update_rig(
+    curve: bpy.types.Object, armature: bpy.types.Object, collection: bpy.types.Collection | None = None
+) -> tuple[int, int, int]:
+    """
+    Bring the rig of a curve up to date after control points were moved, added or deleted.
+
+    :param curve: A curve object that passes is_riggable(), in object mode
+    :param armature: Its rig, see find_rig()
+    :param collection: The collection to add new empties to, by default that of the armature
+    :return: The number of hooks added, removed and moved
+    :rtype: tuple[int, int, int]
+    :raises ValueError: If the curve cannot be rigged
+
+    Bone k always runs from control point k to k + 1. Only the bones whose ends
+    differ from the stored points are changed, bones are added or removed at the
+    end of the chain, and edit mode is not entered at all if no bone changed.
+    Likewise only the hooks of points that moved are placed again, and hooks
+    are only added for new points and removed for deleted ones. So the time it
+    takes depends on the number of changes, not on the length of the curve.
+    The armature is assumed to be in its rest pose.
+    """
+    if not is_riggable(curve):
+        raise ValueError(f"{curve.name} is not a curve with a single Bezier spline with at least 2 control points")
+    if BAKE_PROPERTY in curve:
+        raise ValueError(f"{curve.name} is baked, free the bake first")
+    settings = armature[RIG_PROPERTY]
+    size, ik = settings["size"], bool(settings["ik"])
+    if collection is None:
+        collection = armature.users_collection[0]
+    old = stored_points(armature)
+    new = control_points(curve.data.splines[0])  # type: ignore
+    to_armature = armature.matrix_world.inverted() @ curve.matrix_world
+
+    bones = len(new) - 1
+    changed = [k for k in range(bones) if k + 1 >= len(old) or old[k] != new[k] or old[k + 1] != new[k + 1]]
+    if changed or len(old) != len(new):
+        with bpy.context.temp_override(active_object=armature, object=armature):
+            bpy.ops.object.mode_set(mode="EDIT")
+            edit_bones = armature.data.edit_bones
+            for k in reversed(range(bones, len(old) - 1)):
+                edit_bones.remove(edit_bones[f"Bone.{k:03d}"])
+            for k in changed:
+                bone = edit_bones.get(f"Bone.{k:03d}")
+                if bone is None:
+                    bone = edit_bones.new(name=f"Bone.{k:03d}")
+                    bone.parent = edit_bones.get(f"Bone.{k - 1:03d}")
+                bone.head = to_armature @ Vector(new[k])
+                bone.tail = to_armature @ Vector(new[k + 1])
+            bpy.ops.object.mode_set(mode="OBJECT")
+        if ik and len(old) != len(new):
+            # the inverse kinematic constraint belongs on the last bone
+            for pose_bone in armature.pose.bones:
+                for constraint in [c for c in pose_bone.constraints if c.type == "IK"]:
+                    pose_bone.constraints.remove(constraint)
+            armature.pose.bones[f"Bone.{bones - 1:03d}"].constraints.new(type="IK")
+
+    hooks, orphans = rig_hooks(curve, armature)
+    orphans.extend(hook for j, hook in hooks.items() if j >= len(new))
+    for hook in orphans:
+        empty = hook.object
+        curve.modifiers.remove(hook)
+        bpy.data.objects.remove(empty)
+    added = moved = 0
+    for j, co in enumerate(new):
+        hook = hooks.get(j)
+        if hook is None:
+            add_hook(curve, armature, collection, size, j, co)
+            added += 1
+            continue
+        if tuple(hook.center) != co:
+            place_hook(curve, hook, co)
+            moved += 1
+        # a point may have a new index because points were added or deleted before it,
+        # and the constraint may have been removed by hand
+        constraint = next((c for c in hook.object.constraints if c.type == "COPY_LOCATION"), None)
+        if constraint is None:
+            constrain_to_bone(hook.object, armature, j)
+        elif constraint.subtarget != armature.data.bones[max(j - 1, 0)].name or constraint.head_tail != (1.0 if j else 0.0):
+            hook.object.constraints.remove(constraint)
+            constrain_to_bone(hook.object, armature, j)
+
+    store_rig(armature, new, size, ik)
+    return added, len(orphans), moved
+
+
+# A rig is evaluated on every frame: the armature, the constraints of the empties and then the hooks.
+# Baking evaluates all that once for a range of frames and stores where the control points (and their
+# handles) end up. During playback a frame_change_pre handler copies the positions for the current frame
+# into the curve with foreach_set, while the hooks and constraints are muted.
+#
+# A bake is a float32 NumPy array of shape (frames + 1, points, 3, 3): the first entry holds the rest
+# positions, then one entry per frame, each with the left handle, control point and right handle of
+# every point. It is either kept in memory or saved as a .npy file and memory-mapped, so only the
+# frames that are actually played are read from disk. What is needed to find the bake again and to
+# undo it (the frame range, the file and the rest positions) is stored in a custom property of the curve.
+
+BAKE_PROPERTY = "rig_curve_bake"
+BEZIER_ATTRIBUTES = ("handle_left", "co", "handle_right")
+
+# session_uid of the curve object -> (curve object, first frame, bake array), for all baked curves in the current file.
+# The session_uid survives undo, the Python object for the curve does not, see sync_bakes()
+baked_curves = {}
+
+
+def bezier_coordinates(curve: bpy.types.Curve) -> Any:
+    """
+    Return the positions of all control points and handles of the first spline.
+
+    :param curve: Curve data
+    :return: A float32 array of shape (points, 3, 3), see BEZIER_ATTRIBUTES
+    """
+    import numpy as np
+
+    points = curve.splines[0].bezier_points
+    coordinates = np.empty((3, len(points) * 3), dtype=np.float32)
+    for attribute, values in zip(BEZIER_ATTRIBUTES, coordinates):
+        points.foreach_get(attribute, values)
+    return coordinates.reshape(3, -1, 3).transpose(1, 0, 2)
+
+
+def set_bezier_coordinates(curve: bpy.types.Curve, coordinates: Any) -> None:
+    """Set the positions of all control points and handles of the first spline, see bezier_coordinates()."""
+    import numpy as np
+
+    points = curve.splines[0].bezier_points
+    for i, attribute in enumerate(BEZIER_ATTRIBUTES):
+        points.foreach_set(attribute, np.ascontiguousarray(coordinates[:, i]).ravel())
+    curve.update_tag()
+
+
+def mute_rig(curve: bpy.types.Object, armature: bpy.types.Object, mute: bool) -> None:
+    """Switch the hooks of a rigged curve and the constraints of their empties off (or on again)."""
+    hooks, orphans = rig_hooks(curve, armature)
+    for hook in list(hooks.values()) + orphans:
+        hook.show_viewport = hook.show_render = not mute
+        for constraint in hook.object.constraints:
+            if constraint.target == armature:
+                constraint.mute = mute
+
+
+def bake_rigs(
+    curves: list[bpy.types.Object], frames: range, scene: bpy.types.Scene, depsgraph: bpy.types.Depsgraph
+) -> dict[bpy.types.Object, Any]:
+    """
+    Evaluate rigged curves for a range of frames.
+
+    :param curves: Curve objects that pass is_riggable()
+    :param frames: The frames to evaluate
+    :param scene: The scene the curves are in
+    :param depsgraph: Its evaluated depsgraph
+    :return: A dict with a bake array for each curve, see the comment above
+
+    Every frame is set only once, however many curves there are. The current frame is restored afterwards.
+    """
+    import numpy as np
+
+    bakes = {}
+    for curve in curves:
+        bakes[curve] = np.empty((len(frames) + 1, len(curve.data.splines[0].bezier_points), 3, 3), dtype=np.float32)
+        bakes[curve][0] = bezier_coordinates(curve.data)
+    current = scene.frame_current
+    try:
+        for i, frame in enumerate(frames, start=1):
+            scene.frame_set(frame)
+            for curve in curves:
+                curve_eval = curve.evaluated_get(depsgraph)
+                # unlike the evaluated curve data, this includes what the hooks did to the control points
+                bakes[curve][i] = bezier_coordinates(curve_eval.to_curve(depsgraph, apply_modifiers=True))
+                curve_eval.to_curve_clear()
+    finally:
+        scene.frame_set(current)
+    return bakes
+
+
+def bake_file_name(name: str) -> str:
+    """
+    Return the name of the .npy file for the bake of the curve with this name.
+
+    clean_name() makes the name safe for any file system, but maps different names
+    like "a.b" and "a_b" to the same one, so a checksum of the original name is added.
+    The same curve always gets the same file, so baking it again replaces its bake.
+    """
+    return f"{bpy.path.clean_name(name)}-{zlib.crc32(name.encode()):08x}.npy"
 
 
+def bake_rig(
+    curves: list[bpy.types.Object],
+    frames: range,
+    scene: bpy.types.Scene,
+    depsgraph: bpy.types.Depsgraph,
+    directory: str | None = None,
+) -> None:
+    """
+    Bake rigged curves and drive them from the bake from now on, see the comment above.
+
+    :param curves: Rigged curve objects, see find_rig(); curves that were baked already are baked again
+    :param frames: The frames to bake, a range with step 1
+    :param scene: The scene the curves are in
+    :param depsgraph: Its evaluated depsgraph
+    :param directory: Where to save the bakes as .npy files (may start with // for a path relative to the
+        .blend file), or None to keep them in memory, in which case they are lost when the file is closed
+    :raises ValueError: If directory is relative while the .blend file was never saved: the files would
+        end up wherever Blender was started, and could not be found again
+    """
+    import numpy as np
+
+    if directory is not None and not os.path.isabs(bpy.path.abspath(directory)):
+        raise ValueError(f"Save the .blend file before baking to the relative directory {directory}, or bake to memory")
+    for curve in curves:
+        if BAKE_PROPERTY in curve:
+            free_bake(curve)
+    for curve, bake in bake_rigs(curves, frames, scene, depsgraph).items():
+        path = ""
+        if directory is not None:
+            path = os.path.join(directory, bake_file_name(curve.name))
+            os.makedirs(os.path.dirname(bpy.path.abspath(path)), exist_ok=True)
+            np.save(bpy.path.abspath(path), bake)
+            bake = np.load(bpy.path.abspath(path), mmap_mode="r")
+        curve[BAKE_PROPERTY] = {"frame_start": frames[0], "path": path, "rest": bake[0].ravel().tolist()}
+        baked_curves[curve.session_uid] = (curve, frames[0], bake)
+        mute_rig(curve, find_rig(curve), True)
+    play_bakes(scene)
+    update_playback_handler()
+
+
+def free_bake(curve: bpy.types.Object) -> None:
+    """
+    Put the control points of a baked curve back where they were and switch its rig on again.
+
+    A .npy file of the bake is left alone.
+    """
+    import numpy as np
+
+    rest = np.array(curve[BAKE_PROPERTY]["rest"], dtype=np.float32).reshape(-1, 3, 3)
+    set_bezier_coordinates(curve.data, rest)
+    armature = find_rig(curve)
+    if armature is not None:
+        mute_rig(curve, armature, False)
+    del curve[BAKE_PROPERTY]
+    baked_curves.pop(curve.session_uid, None)
+    update_playback_handler()
+
+
+@persistent
+def play_bakes(scene: bpy.types.Scene, *args) -> None:
+    """Handler for frame_change_pre: move the control points of all baked curves to their positions in the bake."""
+    for uid, (curve, frame_start, bake) in list(baked_curves.items()):
+        try:
+            # before and after the baked frames the curve keeps the first and last baked positions
+            i = min(max(scene.frame_current - frame_start + 1, 1), len(bake) - 1)
+            set_bezier_coordinates(curve.data, bake[i])
+        except ReferenceError:
+            del baked_curves[uid]  # the curve was removed
+
+
+@persistent
+def sync_bakes(*args) -> None:
+    """
+    Handler for load_post, undo_post and redo_post: find the baked curves and their bakes.
+
+    Bakes that are still in memory are kept, bakes saved to disk are memory-mapped
+    again if needed. A bake that was only kept in memory cannot be restored after
+    loading a file, such a curve stays where it is until its bake is freed.
+    """
+    import numpy as np
+
+    known = dict(baked_curves)
+    baked_curves.clear()
+    for ob in bpy.data.objects:
+        if BAKE_PROPERTY not in ob:
+            continue
+        settings = ob[BAKE_PROPERTY]
+        if ob.session_uid in known:
+            baked_curves[ob.session_uid] = (ob,) + known[ob.session_uid][1:]
+        elif settings["path"]:
+            path = bpy.path.abspath(settings["path"])
+            if os.path.exists(path):
+                baked_curves[ob.session_uid] = (ob, settings["frame_start"], np.load(path, mmap_mode="r"))
+            else:
+                print(f"rig_curve: bake {path} of {ob.name} not found")
+    update_playback_handler()
+
+
+@persistent
+def forget_bakes(*args) -> None:
+    """Handler for load_pre: the curves of the previous file are gone."""
+    baked_curves.clear()
+
+
+BAKE_HANDLERS = ("load_post", "undo_post", "redo_post")
+
+
+def update_playback_handler() -> None:
+    """Only keep the playback handler while there are baked curves, it runs on every frame change."""
+    handlers = bpy.app.handlers.frame_change_pre
+    if baked_curves and play_bakes not in handlers:
+        handlers.append(play_bakes)
+    elif not baked_curves and play_bakes in handlers:
+        handlers.remove(play_bakes)
+
+
+# the poll cache below is identical in distance_overlay.py and rig_curve.py
+# add-ons are installed as single files, so they cannot share it
+
+
+class PollCache:
+    """
+    Remember which operators can run, so poll() does not have to check again on every redraw.
+
+    Menus and panels call poll() many times per second. Only positive results are
+    remembered, for the view layer, active object and mode they were checked in,
+    and all of them are forgotten as soon as Blender reports a change: a depsgraph
+    update (which includes selection changes), a new active object or mode
+    (via the message bus), undo, redo or loading a file.
+
+    A negative result is never remembered: checking again is cheap when the answer
+    is no (no active object, or one of the wrong type), and a stale no would make
+    scripts that call the operator right after setting up a scene fail. A stale yes
+    is possible in such scripts, so execute() should not rely on poll() alone.
+    """
+
+    def __init__(self):
+        self.passed = set()
+        self.owner = object()  # identifies our message bus subscriptions
+
+    def poll(self, cls, context, check):
+        """
+        Return the cached result for this operator, or call check(context) if there is none.
+
+        :param cls: The operator class
+        :param context: The Blender context
+        :param check: A function that does the actual (uncached) check
+        """
+        active = context.active_object
+        key = (cls, context.view_layer.as_pointer(), active.as_pointer() if active else 0, context.mode)
+        if key in self.passed:
+            return True
+        if check(context):
+            self.passed.add(key)
+            return True
+        return False
+
+    def clear(self, *args):
+        """Forget all results (any arguments are ignored so this can be used as a callback)."""
+        self.passed.clear()
+
+    def subscribe(self):
+        """Clear the cache when the active object or its mode changes."""
+        for key in ((bpy.types.LayerObjects, "active"), (bpy.types.Object, "mode")):
+            bpy.msgbus.subscribe_rna(key=key, owner=self.owner, args=(), notify=self.clear)
+
+    def unsubscribe(self):
+        bpy.msgbus.clear_by_owner(self.owner)
+
+
+poll_cache = PollCache()
+
+
+@persistent
+def clear_poll_cache(*args):
+    """Handler for anything that might change the outcome of a poll()."""
+    poll_cache.clear()
+
+
+@persistent
+def subscribe_poll_cache(*args):
+    """Handler for load_post: loading a file removes all message bus subscriptions."""
+    poll_cache.clear()
+    poll_cache.subscribe()
+
+
+POLL_CACHE_HANDLERS = ("depsgraph_update_post", "undo_post", "redo_post")
+
+
+def register_poll_cache():
+    poll_cache.subscribe()
+    for name in POLL_CACHE_HANDLERS:
+        getattr(bpy.app.handlers, name).append(clear_poll_cache)
+    bpy.app.handlers.load_post.append(subscribe_poll_cache)
+
+
+def unregister_poll_cache():
+    bpy.app.handlers.load_post.remove(subscribe_poll_cache)
+    for name in POLL_CACHE_HANDLERS:
+        getattr(bpy.app.handlers, name).remove(clear_poll_cache)
+    poll_cache.unsubscribe()
+    poll_cache.clear()
+
+
+def curve_can_be_rigged(context) -> bool:
+    """
+    Check if we are in object mode and that the active object is a
+    Curve object with a single Bezier spline with at least 2 control points.
+
+    :param context: The Blender context
+    :return: True if requirements are met
+    :rtype: bool
+    """
+    return context.mode == "OBJECT" and is_riggable(context.active_object)
+
+
+@profiled
 class OBJECT_OT_rig_curve(Operator):
     bl_idname = "object.rig_curve"
     bl_label = "Rig a curve"
@@ -188,22 +842,16 @@ class OBJECT_OT_rig_curve(Operator):
     @classmethod
     def poll(cls, context) -> bool:
         """
-        Check if we are in object mode and that the active object is a
-        Curve object with a single Bezier spline with at least 2 control points.
+        Check if the active object is a curve we can rig, see curve_can_be_rigged().
+
+        The result is cached, because menus call poll() all the time.
 
         :param cls: Our operator class
         :param context: The Blender context
         :return: True if requirements are met
         :rtype: bool
         """
-        return (
-            context.mode == "OBJECT"
-            and context.active_object
-            and context.active_object.type == "CURVE"
-            and len(context.active_object.data.splines) == 1  # type: ignore
-            and context.active_object.data.splines[0].type == "BEZIER"  # type: ignore
-            and len(context.active_object.data.splines[0].bezier_points) >= 2  # type: ignore
-        )
+        return poll_cache.poll(cls, context, curve_can_be_rigged)
 
     def execute(
         self, context: Any
@@ -227,7 +875,12 @@ class OBJECT_OT_rig_curve(Operator):
         :return: A dictionary with operation status
         :rtype: set[str]
         """
-        # note that the poll() method will guarantee the active object is a curve
+        # poll() might be based on a cached result, see PollCache
+        if not curve_can_be_rigged(context):
+            self.report({"ERROR"}, "The active object must be a curve with a single Bezier spline with at least 2 control points")
+            return {"CANCELLED"}
+
+        # so now we are sure the active object is a curve
         curve = context.active_object
         # likewise, it will have 1 spline (of type Bezier with at least 2 control points)
         spline = curve.data.splines[0]
@@ -239,6 +892,7 @@ class OBJECT_OT_rig_curve(Operator):
         armature.show_in_front = True
 
         create_hooks(context, curve, armature, self.size)
+        store_rig(armature, points, self.size, self.ik)
 
         # for some reason, if we make the armature the active object again
         # then the properties will not be shown. Is this a bug? 
@@ -247,21 +901,183 @@ class OBJECT_OT_rig_curve(Operator):
         return {"FINISHED"}
 
 
+def curve_rig_can_be_updated(context) -> bool:
+    """
+    Check if the active object is a curve that can be rigged and already has a rig.
+
+    :param context: The Blender context
+    :return: True if requirements are met
+    :rtype: bool
+    """
+    return (
+        curve_can_be_rigged(context)
+        and BAKE_PROPERTY not in context.active_object
+        and find_rig(context.active_object) is not None
+    )
+
+
+def rigged_curves(context) -> list[bpy.types.Object]:
+    """Return the selected curves that have a rig, see find_rig()."""
+    return [ob for ob in context.selected_objects if is_riggable(ob) and find_rig(ob) is not None]
+
+
+def rigged_curves_selected(context) -> bool:
+    """Check if we are in object mode and at least one rigged curve is selected."""
+    return context.mode == "OBJECT" and len(rigged_curves(context)) > 0
+
+
+def baked_curves_selected(context) -> bool:
+    """Check if we are in object mode and at least one baked curve is selected."""
+    return context.mode == "OBJECT" and any(BAKE_PROPERTY in ob for ob in context.selected_objects)
+
+
+@profiled
+class OBJECT_OT_rig_curve_update(Operator):
+    bl_idname = "object.rig_curve_update"
+    bl_label = "Update curve rig"
+    bl_description = "Update the rig of a curve after control points were moved, added or deleted"
+    bl_options = {"REGISTER", "UNDO"}
+
+    @classmethod
+    def poll(cls, context) -> bool:
+        """
+        Check if the active object is a rigged curve, see curve_rig_can_be_updated().
+
+        The result is cached, because menus call poll() all the time.
+        """
+        return poll_cache.poll(cls, context, curve_rig_can_be_updated)
+
+    def execute(self, context):
+        """
+        Execute the operator to update the rig of the active curve.
+
+        :param self: Our operator
+        :param context: The Blender context
+        :return: A dictionary with operation status
+        :rtype: set[str]
+        """
+        # poll() might be based on a cached result, see PollCache
+        if not curve_rig_can_be_updated(context):
+            self.report({"ERROR"}, "The active object must be a curve rigged with Rig a curve")
+            return {"CANCELLED"}
+
+        curve = context.active_object
+        added, removed, moved = update_rig(curve, find_rig(curve))
+        self.report({"INFO"}, f"Hooks added: {added}, removed: {removed}, moved: {moved}")
+        return {"FINISHED"}
+
+
+@profiled
+class OBJECT_OT_rig_curve_bake(Operator):
+    bl_idname = "object.rig_curve_bake"
+    bl_label = "Bake curve rig"
+    bl_description = "Bake the deformation of the selected rigged curves and play it back with the rigs muted"
+    bl_options = {"REGISTER", "UNDO"}
+
+    frame_start: IntProperty(name="Start", description="First frame to bake", default=1)  # type: ignore
+    frame_end: IntProperty(name="End", description="Last frame to bake", default=250)  # type: ignore
+    use_disk: BoolProperty(
+        name="Save to disk", description="Save the bakes as .npy files instead of keeping them in memory", default=True
+    )  # type: ignore
+    directory: StringProperty(
+        name="Directory", description="Directory for the .npy files", default="//rig_curve_bake", subtype="DIR_PATH"
+    )  # type: ignore
+
+    @classmethod
+    def poll(cls, context) -> bool:
+        """Check if a rigged curve is selected, see rigged_curves_selected(). The result is cached."""
+        return poll_cache.poll(cls, context, rigged_curves_selected)
+
+    def invoke(self, context, event):
+        self.frame_start = context.scene.frame_start
+        self.frame_end = context.scene.frame_end
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        """
+        Execute the operator to bake the selected rigged curves.
+
+        :param self: Our operator
+        :param context: The Blender context
+        :return: A dictionary with operation status
+        :rtype: set[str]
+        """
+        # poll() might be based on a cached result, see PollCache
+        curves = rigged_curves(context) if context.mode == "OBJECT" else []
+        if not curves:
+            self.report({"ERROR"}, "Select at least one curve rigged with Rig a curve")
+            return {"CANCELLED"}
+        if self.frame_end < self.frame_start:
+            self.report({"ERROR"}, "The last frame comes before the first one")
+            return {"CANCELLED"}
+
+        frames = range(self.frame_start, self.frame_end + 1)
+        try:
+            bake_rig(curves, frames, context.scene, context.evaluated_depsgraph_get(), self.directory if self.use_disk else None)
+        except (OSError, ValueError) as e:
+            self.report({"ERROR"}, str(e))
+            return {"CANCELLED"}
+        self.report({"INFO"}, f"Baked {len(curves)} curves, {len(frames)} frames")
+        return {"FINISHED"}
+
+
+@profiled
+class OBJECT_OT_rig_curve_free_bake(Operator):
+    bl_idname = "object.rig_curve_free_bake"
+    bl_label = "Free curve rig bake"
+    bl_description = "Drive the selected baked curves with their rigs again"
+    bl_options = {"REGISTER", "UNDO"}
+
+    @classmethod
+    def poll(cls, context) -> bool:
+        """Check if a baked curve is selected, see baked_curves_selected(). The result is cached."""
+        return poll_cache.poll(cls, context, baked_curves_selected)
+
+    def execute(self, context):
+        # poll() might be based on a cached result, see PollCache
+        if not baked_curves_selected(context):
+            self.report({"ERROR"}, "Select at least one baked curve")
+            return {"CANCELLED"}
+        for ob in context.selected_objects:
+            if BAKE_PROPERTY in ob:
+                free_bake(ob)
+        return {"FINISHED"}
+
+
 def menu_func(self, context):
-    """Add the operator to the  menu."""
+    """Add the operators to the  menu."""
     self.layout.separator()
     self.layout.operator(OBJECT_OT_rig_curve.bl_idname)
+    self.layout.operator(OBJECT_OT_rig_curve_update.bl_idname)
+    self.layout.operator(OBJECT_OT_rig_curve_bake.bl_idname)
+    self.layout.operator(OBJECT_OT_rig_curve_free_bake.bl_idname)
 
 
 def register():
     """Register the add-on classes and menu."""
     register_class(OBJECT_OT_rig_curve)
+    register_class(OBJECT_OT_rig_curve_update)
+    register_class(OBJECT_OT_rig_curve_bake)
+    register_class(OBJECT_OT_rig_curve_free_bake)
     VIEW3D_MT_object.append(menu_func)
+    register_poll_cache()
+    bpy.app.handlers.load_pre.append(forget_bakes)
+    for name in BAKE_HANDLERS:
+        getattr(bpy.app.handlers, name).append(sync_bakes)
 
 
 def unregister():
     """Unregister the add-on classes and menu."""
+    for name in BAKE_HANDLERS:
+        getattr(bpy.app.handlers, name).remove(sync_bakes)
+    bpy.app.handlers.load_pre.remove(forget_bakes)
+    baked_curves.clear()
+    update_playback_handler()
+    unregister_poll_cache()
     VIEW3D_MT_object.remove(menu_func)
+    unregister_class(OBJECT_OT_rig_curve_free_bake)
+    unregister_class(OBJECT_OT_rig_curve_bake)
+    unregister_class(OBJECT_OT_rig_curve_update)
     unregister_class(OBJECT_OT_rig_curve)
 
 
@@ -7,15 +7,29 @@ bl_info = {
     "author": "Your Name",
     "version": (0, 0, 1),
     "blender": (5, 0, 0),
-    "location": "Object > Object",
+    "location": "Object > Object, File > Import",
     "description": "Add a fitting skinned mesh to an armature",
     "category": "Object",
 }
 
-from pprint import pp as pprint
+import json
+import re
+from pathlib import Path
+
 import bpy
+from bpy.app.handlers import persistent
+
+try:
+    # profile the operator if the operator_profiler add-on is installed
+    from operator_profiler import profiled
+except ImportError:
+    def profiled(cls):
+        return cls
+
 
 def stick_figure(armature):
+    from pprint import pp as pprint  # only needed for the debug output below, so not imported at the top
+
     verts = {}
     edges = []
     heads = set()
@@ -52,9 +66,709 @@ def stick_figure(armature):
     pprint(edges)
     return verts, edges, heads
 
-from bpy_extras.object_utils import object_data_add
+
+# The functions below build the same skinned stick figure as the operator, but
+# they do not depend on the context (the active object, the selection or the mode)
+# and call no operators. That makes them safe and quick to use in scripts that
+# run in background mode, for example to skin thousands of armatures on a farm:
+#
+#   import skin_armature
+#   figure = skin_armature.skin_armature(bpy.data.objects["Armature"], bpy.data.collections["Collection"])
+
+
+def bone_graph(armature):
+    """
+    Return the vertices, edges and unconnected heads of the stick figure, just like stick_figure().
+
+    :param armature: An armature object
+    :return: A dict mapping coordinates to vertex indices, a list of edges, a set of unconnected heads,
+        and a dict mapping each vertex index to the name of the bone that should move it
+
+    Bone.head_local and Bone.tail_local are the same as the head and tail of
+    the edit bones, so there is no need to switch to edit mode. A vertex is moved
+    by the bone that ends in it, or that starts in it if it is an unconnected head.
+    """
+    verts = {}
+    edges = []
+    heads = set()
+    owners = {}
+
+    for bone in armature.data.bones:
+        head = tuple(bone.head_local)
+        tail = tuple(bone.tail_local)
+
+        if head not in verts:
+            vi = len(verts)
+            verts[head] = vi
+            heads.add(vi)
+            owners[vi] = bone.name
+        if tail not in verts:
+            verts[tail] = len(verts)
+        heads.discard(verts[tail])
+        owners[verts[tail]] = bone.name
+
+        edges.append((verts[head], verts[tail]))
+
+    return verts, edges, heads, owners
+
+
+def skin_roots(count, edges, heads, keep=()):
+    """
+    Return a list with for each vertex whether it is a skin root.
+
+    This gives the same result as selecting all heads and calling skin_root_mark():
+    that marks the first selected vertex of every connected part of the mesh
+    as its root and clears the root flag of all other vertices in that part.
+    A vertex in keep (for example a root picked by the user) is preferred over the heads.
+    """
+    part = list(range(count))  # a union-find forest: every vertex points towards the representative of its part
+
+    def find(i):
+        while part[i] != i:
+            part[i] = part[part[i]]
+            i = part[i]
+        return i
+
+    for a, b in edges:
+        part[find(a)] = find(b)
+
+    roots = [False] * count
+    rooted = set()
+    for vi in sorted(keep) + sorted(heads):
+        if find(vi) not in rooted:
+            rooted.add(find(vi))
+            roots[vi] = True
+    return roots
+
+
+def add_skin_mesh(verts, edges, heads, collection, name="Stick figure"):
+    """
+    Add a mesh object with a skin and a subdivision modifier, like the operator does.
+
+    :param verts: A dict mapping vertex coordinates to vertex indices
+    :param edges: A list of (index, index) tuples
+    :param heads: A set with the indices of unconnected heads, see stick_figure()
+    :param collection: The collection to add the object to
+    :param name: The name of the mesh and the object
+    :return: The new object
+    :rtype: bpy.types.Object
+    """
+    mesh = bpy.data.meshes.new(name=name)
+    mesh.from_pydata(list(verts), edges, [])
+    object = bpy.data.objects.new(mesh.name, mesh)
+    collection.objects.link(object)
+
+    skin_modifier = object.modifiers.new(name="Skin", type="SKIN")
+    skin_modifier.use_x_symmetry = False
+    skin_modifier.branch_smoothing = 1.0
+    skin_modifier.use_smooth_shade = True
+    # adding the skin modifier added the skin layer, so we can mark the roots directly
+    mesh.skin_vertices[0].data.foreach_set("use_root", skin_roots(len(verts), edges, heads))
+
+    subdivision_modifier = object.modifiers.new(name="Subdivision", type="SUBSURF")
+    subdivision_modifier.levels = 2  # viewport
+    subdivision_modifier.render_levels = 2  # render
+    return object
+
+
+def skin_armature(armature, collection):
+    """
+    Add a skinned stick figure to an armature, without relying on the context.
+
+    :param armature: An armature object, in object mode
+    :param collection: The collection to add the stick figure to
+    :return: The stick figure object
+    :rtype: bpy.types.Object
+
+    The mesh and its modifiers are the same as the ones the operator adds.
+    The one difference is the weights: the operator uses automatic weights, which
+    is an operator, while here every vertex is assigned fully to the bone that
+    moves it (see bone_graph()), which for a stick figure is exactly right.
+    """
+    verts, edges, heads, owners = bone_graph(armature)
+    object = add_skin_mesh(verts, edges, heads, collection)
+    object.matrix_world = armature.matrix_world.copy()
+
+    # what parent_set(type="ARMATURE_AUTO") does, apart from the weights:
+    # a vertex group for each deforming bone, an armature modifier and the parent
+    groups = {}
+    for vi, name in owners.items():
+        if armature.data.bones[name].use_deform:
+            if name not in groups:
+                groups[name] = object.vertex_groups.new(name=name)
+            groups[name].add([vi], 1.0, "REPLACE")
+    armature_modifier = object.modifiers.new(name="Armature", type="ARMATURE")
+    armature_modifier.object = armature
+    object.parent = armature
+    object.matrix_parent_inverse = armature.matrix_world.inverted()
+
+    armature.show_in_front = True
+    store_skin(object.data, [bone.name for bone in armature.data.bones], edges)
+    return object
+
+
+# A stick figure remembers which of its vertices belong to the head and tail of each bone
+# in a custom property of the mesh. That makes it possible to update it after bones were
+# moved, added or deleted, without starting over and without losing the skin radii and
+# weights of the parts that did not change:
+#
+#   skin_armature.update_skin(bpy.data.objects["Stick figure"], bpy.data.objects["Armature"])
+
+SKIN_PROPERTY = "skin_armature"
+
+
+def store_skin(mesh, names, edges):
+    """
+    Remember the vertices of each bone.
+
+    :param mesh: The mesh of the stick figure
+    :param names: The names of the bones
+    :param edges: For each bone a (head, tail) tuple of vertex indices
+    """
+    mesh[SKIN_PROPERTY] = {"bones": list(names), "ends": [vi for edge in edges for vi in edge]}
+
+
+def stored_bones(mesh):
+    """Return a dict with the (head, tail) vertex indices of every bone, see store_skin()."""
+    settings = mesh[SKIN_PROPERTY]
+    ends = list(settings["ends"])
+    return {name: (ends[2 * i], ends[2 * i + 1]) for i, name in enumerate(settings["bones"])}
+
+
+def find_skin_armature(figure):
+    """Return the armature a stick figure was made for, or None if it was not made by this version of the add-on."""
+    if figure.type != "MESH" or SKIN_PROPERTY not in figure.data:
+        return None
+    for modifier in figure.modifiers:
+        if modifier.type == "ARMATURE" and modifier.object is not None:
+            return modifier.object
+    return figure.parent if figure.parent is not None and figure.parent.type == "ARMATURE" else None
+
+
+def update_skin(figure, armature):
+    """
+    Bring a stick figure up to date after bones of its armature were moved, added or deleted.
+
+    :param figure: A stick figure made by skin_armature() or the operator
+    :param armature: Its armature, in object mode
+    :return: The number of vertices added, removed and moved
+    :rtype: tuple[int, int, int]
+
+    Every vertex of the new stick figure is matched with the vertex that belonged to
+    the same end of the same bone before. If all vertices and edges are still there,
+    only the vertices that moved are changed; otherwise vertices and edges are added
+    and removed with bmesh, which keeps the data of all other vertices. Either way
+    the skin radii and roots of existing vertices are left alone (a new vertex gets
+    the radius of its neighbor), and only the vertex groups of the bones that
+    changed get new weights: every vertex fully assigned to the bone that moves it,
+    like skin_armature() does. The weights of all other bones are kept.
+    """
+    mesh = figure.data
+    old = stored_bones(mesh)
+    verts, edges, heads, owners = bone_graph(armature)
+    names = [bone.name for bone in armature.data.bones]
+    coords = list(verts)
+
+    flat = [0.0] * (3 * len(mesh.vertices))
+    mesh.vertices.foreach_get("co", flat)
+    old_coords = [tuple(flat[i : i + 3]) for i in range(0, len(flat), 3)]
+
+    # for each new vertex the old vertex at the same end of the same bone, if any
+    mapping = [None] * len(coords)
+    kept = set()
+    for name, (head, tail) in zip(names, edges):
+        for vi, old_vi in zip((head, tail), old.get(name, ())):
+            if mapping[vi] is None and old_vi not in kept:
+                mapping[vi] = old_vi
+                kept.add(old_vi)
+    added = [vi for vi, old_vi in enumerate(mapping) if old_vi is None]
+    moved = [vi for vi, old_vi in enumerate(mapping) if old_vi is not None and old_coords[old_vi] != coords[vi]]
+    removed = len(old_coords) - len(kept)
+
+    old_edges = {frozenset(edge.vertices) for edge in mesh.edges}
+    if not added and not removed and {frozenset((mapping[a], mapping[b])) for a, b in edges} == old_edges:
+        for vi in moved:
+            mesh.vertices[mapping[vi]].co = coords[vi]
+        final = mapping
+    else:
+        final = rebuild_skin(mesh, coords, edges, heads, mapping)
+
+    # the bones whose weights need an update: new, deleted and moved ones, and ones that now own other vertices
+    touched = set(added) | set(moved)
+    changed = {
+        name
+        for name, (head, tail) in zip(names, edges)
+        if head in touched or tail in touched or old.get(name) != (mapping[head], mapping[tail])
+    }
+    changed.update(set(old) - set(names))
+    all_vertices = list(range(len(mesh.vertices)))
+    for name in changed:
+        group = figure.vertex_groups.get(name)
+        bone = armature.data.bones.get(name)
+        if bone is None or not bone.use_deform:
+            if group is not None:
+                figure.vertex_groups.remove(group)
+            continue
+        if group is None:
+            group = figure.vertex_groups.new(name=name)
+        else:
+            group.remove(all_vertices)
+        group.add([final[vi] for vi, owner in owners.items() if owner == name], 1.0, "REPLACE")
+
+    store_skin(mesh, names, [(final[a], final[b]) for a, b in edges])
+    mesh.update()
+    return len(added), removed, len(moved)
+
+
+def rebuild_skin(mesh, coords, edges, heads, mapping):
+    """
+    Add and remove vertices and edges of a stick figure with bmesh, for update_skin().
+
+    :param mesh: The mesh of the stick figure
+    :param coords: The coordinates of the new vertices
+    :param edges: The new edges, as (index, index) tuples into coords
+    :param heads: The new unconnected heads, indices into coords
+    :param mapping: For each new vertex the index of the old vertex it replaces, or None
+    :return: For each new vertex its index in the updated mesh
+    """
+    import bmesh  # only needed when the topology changes
+
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bm.verts.ensure_lookup_table()
+    skin = bm.verts.layers.skin.verify()
+    old_verts = list(bm.verts)
+
+    verts = []
+    for co, old_vi in zip(coords, mapping):
+        if old_vi is None:
+            verts.append(bm.verts.new(co))
+        else:
+            verts.append(old_verts[old_vi])
+            verts[-1].co = co
+
+    wanted = {frozenset((verts[a], verts[b])) for a, b in edges}
+    for edge in [edge for edge in bm.edges if frozenset(edge.verts) not in wanted]:
+        bm.edges.remove(edge)
+    existing = {frozenset(edge.verts) for edge in bm.edges}
+    for a, b in edges:
+        key = frozenset((verts[a], verts[b]))
+        if key not in existing:
+            bm.edges.new((verts[a], verts[b]))
+            existing.add(key)
+    kept = set(mapping)
+    for old_vi, vert in enumerate(old_verts):
+        if old_vi not in kept:
+            bm.verts.remove(vert)
+
+    # a new vertex gets the radius of an existing neighbor
+    for a, b in edges + [(b, a) for a, b in edges]:
+        if mapping[a] is None and mapping[b] is not None:
+            verts[a][skin].radius = verts[b][skin].radius[:]
+
+    bm.verts.index_update()
+    final = [vert.index for vert in verts]
+    # keep the roots the existing vertices have, and give new parts one as well
+    keep = [final[vi] for vi, old_vi in enumerate(mapping) if old_vi is not None and verts[vi][skin].use_root]
+    roots = skin_roots(len(verts), [(final[a], final[b]) for a, b in edges], {final[vi] for vi in heads}, keep)
+    for vert in verts:
+        vert[skin].use_root = roots[vert.index]
+
+    bm.to_mesh(mesh)
+    bm.free()
+    return final
+
+
+# Skeletons can also be read straight from a file, without creating an armature
+# first. The readers below are generators that read a file piece by piece and
+# yield one joint at a time, so the file is never held in memory as a whole and
+# the work per joint does not depend on the size of the skeleton. Memory still
+# grows with the number of joints: joint_segments() remembers the position of
+# every joint because a child may come long after its parent, and the mesh data
+# has to be built anyway:
+#
+#   figure = skin_armature.skin_skeleton("walk.bvh", bpy.context.scene.collection, scale=0.01)
+
+
+def bvh_joints(lines):
+    """
+    Yield (name, parent name, position) for every joint in the HIERARCHY section of a BVH file.
+
+    :param lines: The lines of the file, for example an open file object
+    :return: A generator; parents come before their children and the parent of the root is None
+
+    Positions are the rest positions, i.e. the sums of the offsets from the root,
+    in the coordinates of the file (y up). The end of a chain (End Site) is
+    yielded as a joint named after its parent with _end appended.
+    Reading stops at the MOTION section, the animation is not needed.
+    """
+    tokens = (token for line in lines for token in line.split())
+    stack = []  # [name, position] of the joint we are in and all its ancestors
+    name = None
+    for token in tokens:
+        if token in ("ROOT", "JOINT"):
+            name = next(tokens)
+        elif token == "End":  # End Site
+            next(tokens)
+            name = f"{stack[-1][0]}_end"
+        elif token == "{":
+            stack.append([name, None])
+        elif token == "}":
+            stack.pop()
+        elif token == "OFFSET":
+            offset = (float(next(tokens)), float(next(tokens)), float(next(tokens)))
+            parent = stack[-2] if len(stack) > 1 else None
+            origin = parent[1] if parent else (0.0, 0.0, 0.0)
+            stack[-1][1] = tuple(o + d for o, d in zip(origin, offset))
+            yield stack[-1][0], parent[0] if parent else None, stack[-1][1]
+        elif token == "MOTION":
+            return
+
+
+WHITESPACE = re.compile(r"\s*")
+
+
+def json_array_items(f, chunk_size=65536):
+    """
+    Yield the items of the JSON array in a file one by one, without reading the whole file.
+
+    :param f: A file object opened in text mode
+    :param chunk_size: The number of characters to read at a time
+    :return: A generator
+    :raises ValueError: If the file does not contain a valid JSON array
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    expect = "["  # what may come next: "[", "item", "item or ]" or ", or ]"
+    while True:
+        pos = WHITESPACE.match(buffer, pos).end()
+        if pos < len(buffer):
+            char = buffer[pos]
+            if expect == "[":
+                if char != "[":
+                    raise ValueError("the file does not contain a JSON array")
+                pos, expect = pos + 1, "item or ]"
+                continue
+            if char == "]" and expect in ("item or ]", ", or ]"):
+                return
+            if expect == ", or ]":
+                if char != ",":
+                    raise ValueError(f"expected , or ] in the JSON array but found {char!r}")
+                pos, expect = pos + 1, "item"
+                continue
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError("the JSON array contains an invalid item") from None
+            else:
+                # a number at the very end of the buffer might continue in the next chunk
+                if end < len(buffer) or eof:
+                    yield item
+                    pos, expect = end, ", or ]"
+                    continue
+        if eof:
+            raise ValueError("the JSON array is not complete")
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer, pos = buffer[pos:] + chunk, 0
+
+
+def json_joints(f, lines=False):
+    """
+    Yield (name, parent name, position) for every joint in a JSON file.
+
+    :param f: A file object opened in text mode
+    :param lines: True if the file has one JSON object per line (JSON Lines) instead of a single array
+    :return: A generator
+
+    Every joint is an object like {"name": "hand.L", "parent": "forearm.L", "position": [x, y, z]}
+    with a null parent for a root. Parents should come before their children.
+    Positions are in Blender coordinates (z up).
+    """
+    items = (json.loads(line) for line in f if line.strip()) if lines else json_array_items(f)
+    for joint in items:
+        yield joint["name"], joint.get("parent"), tuple(joint["position"])
+
+
+def read_joints(path):
+    """
+    Yield (name, parent name, position) for every joint in a .bvh, .json or .jsonl file.
+
+    Positions in a BVH file are converted from y up to Blender's z up.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in (".bvh", ".json", ".jsonl", ".ndjson"):
+        raise ValueError(f"cannot read skeletons from {suffix} files")
+    with open(path) as f:
+        if suffix == ".bvh":
+            for name, parent, (x, y, z) in bvh_joints(f):
+                yield name, parent, (x, -z, y)
+        else:
+            yield from json_joints(f, lines=suffix != ".json")
+
+
+def joint_segments(joints, scale=1.0):
+    """
+    Turn joints into (head, tail) segments, one from every joint to each of its children.
+
+    :param joints: (name, parent name, position) tuples, parents first
+    :param scale: Multiply all positions by this (BVH files are often in centimeters)
+    :return: A generator
+    :raises ValueError: If a joint comes before its parent
+
+    A joint at the same position as its parent does not add a segment.
+    The position of every joint is kept until the end, because nothing tells us
+    when a joint has had its last child, so memory grows with the number of joints.
+    """
+    positions = {}
+    for name, parent, position in joints:
+        position = positions[name] = tuple(scale * c for c in position)
+        if parent is None:
+            continue
+        try:
+            head = positions[parent]
+        except KeyError:
+            raise ValueError(f"joint {name} comes before its parent {parent}") from None
+        if head != position:
+            yield head, position
+
+
+def segment_graph(segments):
+    """
+    Return the vertices, edges and unconnected heads for (head, tail) segments, just like stick_figure().
+
+    :param segments: An iterable of (head, tail) tuples, each a tuple of coordinates
+    """
+    verts = {}
+    edges = []
+    heads = set()
+    for head, tail in segments:
+        if head not in verts:
+            vi = len(verts)
+            verts[head] = vi
+            heads.add(vi)
+        if tail not in verts:
+            verts[tail] = len(verts)
+        heads.discard(verts[tail])
+        edges.append((verts[head], verts[tail]))
+    return verts, edges, heads
+
+
+def skin_skeleton(path, collection, scale=1.0):
+    """
+    Add a skinned stick figure for the skeleton in a .bvh, .json or .jsonl file.
+
+    :param path: The file to read
+    :param collection: The collection to add the stick figure to
+    :param scale: Multiply all positions by this
+    :return: The stick figure object, with the same modifiers the operator adds
+    :rtype: bpy.types.Object
+    :raises ValueError: If the file cannot be read or contains no bones
+
+    The file is read one joint at a time, but the memory used still grows
+    with the number of joints, see joint_segments().
+    """
+    verts, edges, heads = segment_graph(joint_segments(read_joints(path), scale))
+    if not edges:
+        raise ValueError(f"{path} does not contain any bones")
+    return add_skin_mesh(verts, edges, heads, collection, name=Path(path).stem)
+
+# Level of detail
+#
+# In a crowd scene every stick figure runs a skin and a subdivision modifier, and
+# with hundreds of figures that makes playback in the viewport slow. A figure with
+# level of detail loses a viewport subdivision level at each distance from the scene
+# camera, and beyond the last distance a Decimate modifier that is only enabled in
+# the viewport thins it out further. The levels are settings of the modifiers of the
+# one stick figure, so they all share its mesh, radii and weights, and a render
+# always uses the full render levels:
+#
+#   skin_armature.add_lod(bpy.data.objects["Stick figure"], distances=(10, 25, 50))
+
+LOD_PROPERTY = "skin_armature_lod"
+LOD_DECIMATE = "LOD Decimate"
+LOD_HYSTERESIS = 0.05  # switch 5% past a distance, so a figure right at the distance does not flicker
+
+# the stick figures with level of detail, so the handlers do not have to look for them
+lod_figures = []
+
+
+def is_stick_figure(ob):
+    """Return True if the object is a mesh with a skin and a subdivision modifier, like the ones this add-on makes."""
+    types = {modifier.type for modifier in ob.modifiers} if ob.type == "MESH" else set()
+    return {"SKIN", "SUBSURF"} <= types
+
+
+def lod_modifiers(figure):
+    """Return the Subdivision modifier and the LOD Decimate modifier of a stick figure, either can be None."""
+    subdivision = next((modifier for modifier in figure.modifiers if modifier.type == "SUBSURF"), None)
+    return subdivision, figure.modifiers.get(LOD_DECIMATE)
+
+
+def add_decimate(figure, ratio):
+    """Add the LOD Decimate modifier, only shown in the viewport and only when set_lod() says so."""
+    decimate = figure.modifiers.new(name=LOD_DECIMATE, type="DECIMATE")
+    decimate.show_render = False
+    decimate.show_viewport = False
+    decimate.ratio = ratio
+    return decimate
+
+
+def add_lod(figure, distances=(10.0, 25.0, 50.0), ratio=0.25):
+    """
+    Switch on level of detail for a stick figure, or change its settings.
+
+    :param figure: A stick figure, see is_stick_figure()
+    :param distances: The distances from the camera at which the next level starts
+    :param ratio: The ratio of the Decimate modifier beyond the last distance
+    """
+    subdivision, decimate = lod_modifiers(figure)
+    if decimate is None:
+        decimate = add_decimate(figure, ratio)
+    decimate.ratio = ratio
+    # the viewport levels without level of detail, which set_lod() changes
+    levels = figure[LOD_PROPERTY]["levels"] if LOD_PROPERTY in figure else subdivision.levels
+    figure[LOD_PROPERTY] = {"levels": levels, "distances": sorted(distances), "ratio": ratio, "level": 0}
+    set_lod(figure, 0)
+    if figure not in lod_figures:
+        lod_figures.append(figure)
+    update_lod_handlers()
+
+
+def remove_lod(figure):
+    """Switch off level of detail for a stick figure: full detail in the viewport again and no Decimate modifier."""
+    set_lod(figure, 0)
+    subdivision, decimate = lod_modifiers(figure)
+    if decimate is not None:
+        figure.modifiers.remove(decimate)
+    del figure[LOD_PROPERTY]
+    lod_figures[:] = [ob for ob in lod_figures if ob != figure]
+    update_lod_handlers()
+
+
+def set_lod(figure, level):
+    """
+    Show a stick figure with a level of detail in the viewport.
+
+    :param figure: A stick figure with level of detail, see add_lod()
+    :param level: 0 is full detail, every level has one viewport subdivision level less
+        and the last level, one more than there are distances, is decimated as well
+
+    A Subdivision modifier that was deleted is left alone, a LOD Decimate modifier
+    that was deleted is added again when it is needed.
+    """
+    settings = figure[LOD_PROPERTY]
+    subdivision, decimate = lod_modifiers(figure)
+    if subdivision is not None:
+        subdivision.levels = max(settings["levels"] - level, 0)
+    decimated = level > 0 and level == len(settings["distances"])
+    if decimate is None and decimated:
+        decimate = add_decimate(figure, settings.get("ratio", 0.25))
+    if decimate is not None:
+        decimate.show_viewport = decimated
+    settings["level"] = level
+
+
+def lod_levels(distances, thresholds, current, hysteresis=LOD_HYSTERESIS):
+    """
+    Return the level of detail of each figure for its distance to the camera.
+
+    :param distances: A numpy array with the distance of each figure
+    :param thresholds: A numpy array with a row of increasing distances for each figure
+    :param current: A numpy array with the current level of each figure
+    :param hysteresis: The fraction of a distance a figure has to be past it before its level changes
+    :return: A numpy array with the new levels
+    """
+    import numpy as np
+
+    distances = distances[:, np.newaxis]
+    # the levels the figures would have if all thresholds were a little further and a little closer
+    lowest = np.count_nonzero(distances > thresholds * (1 + hysteresis), axis=1)
+    highest = np.count_nonzero(distances > thresholds * (1 - hysteresis), axis=1)
+    return np.clip(current, lowest, highest)
+
+
+def switch_lod(scene):
+    """
+    Give every stick figure with level of detail the level for its distance to the scene camera.
+
+    The distance is measured to the origin of the figure. Only figures whose level
+    changes get new modifier settings, because that makes Blender evaluate them again.
+
+    :param scene: The scene with the camera
+    :return: The number of figures that switched
+    """
+    import numpy as np
+
+    figures = [ob for ob in lod_figures if is_alive(ob) and LOD_PROPERTY in ob]
+    if len(figures) != len(lod_figures):  # forget figures that were removed
+        lod_figures[:] = figures
+        update_lod_handlers()
+    if scene.camera is None or not figures:
+        return 0
+    eye = np.array(scene.camera.matrix_world.translation)
+    positions = np.array([ob.matrix_world.translation for ob in figures])
+    distances = np.linalg.norm(positions - eye, axis=1)
+    settings = [ob[LOD_PROPERTY] for ob in figures]
+    # figures can have different numbers of distances, the missing ones are never reached
+    thresholds = np.full((len(figures), max(len(s["distances"]) for s in settings)), np.inf)
+    for row, s in zip(thresholds, settings):
+        row[: len(s["distances"])] = s["distances"]
+    current = np.array([s["level"] for s in settings])
+    levels = lod_levels(distances, thresholds, current)
+    for i in np.flatnonzero(levels != current):
+        set_lod(figures[i], int(levels[i]))
+    return int(np.count_nonzero(levels != current))
+
+
+def is_alive(ob):
+    """Return False if the object was removed."""
+    try:
+        ob.name
+    except ReferenceError:
+        return False
+    return True
+
+
+@persistent
+def play_lod(scene, depsgraph=None):
+    """Handler for frame_change_post: the figures or the camera may have moved."""
+    switch_lod(scene)
+
+
+@persistent
+def track_lod(scene, depsgraph):
+    """Handler for depsgraph_update_post: switch levels when objects were moved, for example the camera."""
+    if depsgraph.id_type_updated("OBJECT"):
+        switch_lod(scene)
+
+
+@persistent
+def sync_lod(*args):
+    """Handler for load_post, undo_post and redo_post: find the stick figures with level of detail again."""
+    lod_figures[:] = [ob for ob in bpy.data.objects if LOD_PROPERTY in ob]
+    update_lod_handlers()
+
+
+LOD_HANDLERS = ("load_post", "undo_post", "redo_post")
+
+
+def update_lod_handlers():
+    """Only keep the switching handlers while there are figures with level of detail, they run very often."""
+    for name, handler in (("frame_change_post", play_lod), ("depsgraph_update_post", track_lod)):
+        handlers = getattr(bpy.app.handlers, name)
+        if lod_figures and handler not in handlers:
+            handlers.append(handler)
+        elif not lod_figures and handler in handlers:
+            handlers.remove(handler)
+
+
 from bpy.types import Operator
+from bpy.props import BoolProperty, FloatProperty, FloatVectorProperty, StringProperty
+
 
+@profiled
 class OBJECT_OT_skin_armature(Operator):
     bl_idname = "object.skin_armature"
     bl_label = "Skin an armature"
@@ -70,8 +784,13 @@ class OBJECT_OT_skin_armature(Operator):
         )
     
     def execute(self, context):
+        # imported here instead of at the top, so enabling the add-on stays quick
+        from pprint import pp as pprint
+        from bpy_extras.object_utils import object_data_add
+
         armature = bpy.context.active_object
         verts, edges, heads = stick_figure(armature)
+        names = [bone.name for bone in armature.data.bones]  # in the same order as the edit bones
         mesh = bpy.data.meshes.new(name="Stick figure")
         mesh.from_pydata(verts, edges, [])
         object = object_data_add(bpy.context, mesh, operator=None, name=None)
@@ -124,29 +843,170 @@ class OBJECT_OT_skin_armature(Operator):
 
         armature.show_in_front = True
         object.select_set(False)
+        store_skin(mesh, names, edges)
+
+        return {"FINISHED"}
+
+
+def skinned_figures(context):
+    """
+    Return the stick figures to update: the active one, or those of the active armature.
+
+    :param context: The Blender context
+    :return: A list of (stick figure, armature) tuples
+    """
+    active = context.active_object
+    if active is None:
+        return []
+    if active.type == "ARMATURE":
+        return [(child, active) for child in active.children if find_skin_armature(child) == active]
+    armature = find_skin_armature(active)
+    return [] if armature is None else [(active, armature)]
+
+
+@profiled
+class OBJECT_OT_skin_armature_update(Operator):
+    bl_idname = "object.skin_armature_update"
+    bl_label = "Update armature skin"
+    bl_description = "Update the skinned mesh of an armature after bones were moved, added or deleted"
+    bl_options = {"REGISTER", "UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == "OBJECT" and len(skinned_figures(context)) > 0
+
+    def execute(self, context):
+        added = removed = moved = 0
+        for figure, armature in skinned_figures(context):
+            a, r, m = update_skin(figure, armature)
+            added, removed, moved = added + a, removed + r, moved + m
+        self.report({"INFO"}, f"Vertices added: {added}, removed: {removed}, moved: {moved}")
+        return {"FINISHED"}
 
+
+def selected_figures(context):
+    """Return the selected stick figures, and those of the selected armatures, including any with level of detail."""
+    figures = []
+    for ob in context.selected_objects:
+        for figure in ob.children if ob.type == "ARMATURE" else [ob]:
+            # a figure with level of detail may have lost its Subdivision modifier, it can still be switched off
+            if (is_stick_figure(figure) or LOD_PROPERTY in figure) and figure not in figures:
+                figures.append(figure)
+    return figures
+
+
+@profiled
+class OBJECT_OT_skin_armature_lod(Operator):
+    bl_idname = "object.skin_armature_lod"
+    bl_label = "Armature skin level of detail"
+    bl_description = "Show stick figures with less detail in the viewport the further they are from the camera"
+    bl_options = {"REGISTER", "UNDO"}
+
+    use_lod: BoolProperty(name="Level of detail", description="Switch level of detail on, or off again", default=True)  # type: ignore
+    distances: FloatVectorProperty(
+        name="Distances",
+        description="The distances from the camera at which the next, lower level of detail starts",
+        size=3,
+        default=(10.0, 25.0, 50.0),
+        min=0.0,
+        unit="LENGTH",
+    )  # type: ignore
+    ratio: FloatProperty(
+        name="Decimate ratio",
+        description="How much of the mesh is kept beyond the last distance",
+        default=0.25,
+        min=0.01,
+        max=1.0,
+        subtype="FACTOR",
+    )  # type: ignore
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == "OBJECT" and len(selected_figures(context)) > 0
+
+    def execute(self, context):
+        figures = selected_figures(context)
+        for figure in figures:
+            if self.use_lod:
+                add_lod(figure, self.distances, self.ratio)
+            elif LOD_PROPERTY in figure:
+                remove_lod(figure)
+        switch_lod(context.scene)
+        if self.use_lod and context.scene.camera is None:
+            self.report({"WARNING"}, "The scene has no camera, all figures keep full detail")
+        return {"FINISHED"}
+
+
+@profiled
+class IMPORT_SCENE_OT_skin_skeleton(Operator):
+    bl_idname = "import_scene.skin_skeleton"
+    bl_label = "Import skeleton as skin"
+    bl_description = "Add a skinned stick figure for a skeleton in a BVH or JSON file, without creating an armature"
+    bl_options = {"REGISTER", "UNDO"}
+
+    filepath: StringProperty(name="File Path", subtype="FILE_PATH")  # type: ignore
+    filter_glob: StringProperty(default="*.bvh;*.json;*.jsonl;*.ndjson", options={"HIDDEN"})  # type: ignore
+    scale: FloatProperty(name="Scale", description="Scale all positions (BVH files are often in centimeters)", default=1.0, min=1e-6)  # type: ignore
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        try:
+            object = skin_skeleton(self.filepath, context.collection, self.scale)
+        except (OSError, ValueError) as e:
+            self.report({"ERROR"}, str(e))
+            return {"CANCELLED"}
+        object.location = context.scene.cursor.location
+        for other in context.selected_objects:
+            other.select_set(False)
+        object.select_set(True)
+        context.view_layer.objects.active = object
         return {"FINISHED"}
 
 
 from bpy.utils import register_class, unregister_class
-from bpy.types import VIEW3D_MT_object
+from bpy.types import VIEW3D_MT_object, TOPBAR_MT_file_import
 
 
 def menu_func(self, context):
     """Add the operator to the  menu."""
     self.layout.separator()
     self.layout.operator(OBJECT_OT_skin_armature.bl_idname)
+    self.layout.operator(OBJECT_OT_skin_armature_update.bl_idname)
+    self.layout.operator(OBJECT_OT_skin_armature_lod.bl_idname)
+
+
+def import_menu_func(self, context):
+    """Add the import operator to the File > Import menu."""
+    self.layout.operator(IMPORT_SCENE_OT_skin_skeleton.bl_idname, text="Skeleton as skin (.bvh, .json)")
 
 
 def register():
-    """Register the add-on classes and menu."""
+    """Register the add-on classes and menus."""
     register_class(OBJECT_OT_skin_armature)
+    register_class(OBJECT_OT_skin_armature_update)
+    register_class(OBJECT_OT_skin_armature_lod)
+    register_class(IMPORT_SCENE_OT_skin_skeleton)
     VIEW3D_MT_object.append(menu_func)
+    TOPBAR_MT_file_import.append(import_menu_func)
+    # the switching handlers are only added while there are figures with level of detail, see update_lod_handlers()
+    for name in LOD_HANDLERS:
+        getattr(bpy.app.handlers, name).append(sync_lod)
 
 
 def unregister():
-    """Unregister the add-on classes and menu."""
+    """Unregister the add-on classes and menus."""
+    for name in LOD_HANDLERS:
+        getattr(bpy.app.handlers, name).remove(sync_lod)
+    lod_figures.clear()
+    update_lod_handlers()
+    TOPBAR_MT_file_import.remove(import_menu_func)
     VIEW3D_MT_object.remove(menu_func)
+    unregister_class(IMPORT_SCENE_OT_skin_skeleton)
+    unregister_class(OBJECT_OT_skin_armature_lod)
+    unregister_class(OBJECT_OT_skin_armature_update)
     unregister_class(OBJECT_OT_skin_armature)
 
 
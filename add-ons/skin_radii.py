@@ -0,0 +1,222 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+bl_info = {
+    "name": "Skin radii",
+    "author": "Michel Anders (varkenvarken)",
+    "version": (0, 0, 1),
+    "blender": (5, 0, 0),
+    "location": "Object > Object",
+    "description": "Set the skin radii of all or selected vertices in one go",
+    "category": "Object",
+    "doc_url": "https://github.com/varkenvarken/Blender-add-on-development",
+}
+
+import bpy
+from bpy.types import Operator
+from bpy.props import FloatProperty, EnumProperty, BoolProperty
+from bpy.utils import register_class, unregister_class
+from bpy.types import VIEW3D_MT_object
+
+try:
+    # profile the operator if the operator_profiler add-on is installed
+    from operator_profiler import profiled
+except ImportError:
+    def profiled(cls):
+        return cls
+
+
+def distance_from_roots(coords, edges, roots):
+    """
+    Calculate for each vertex the distance along the edges to the nearest root.
+
+    :param coords: An array of shape (n, 3) with vertex coordinates
+    :param edges: An array of shape (m, 2) with vertex indices
+    :param roots: A boolean array of length n, True for root vertices
+    :return: An array with a distance for each vertex, 0 for vertices that cannot be reached from any root
+    :rtype: np.ndarray
+
+    This is a breadth first search that processes a complete ring of
+    neighbors with a few NumPy operations, so the number of Python
+    iterations is the number of edges between a root and the farthest vertex,
+    not the number of vertices. Distances are exact for tree shaped edge
+    networks, which is what a skinned stick figure usually is.
+    """
+    import numpy as np  # not at the top: importing NumPy takes longer than loading the add-on
+
+    n = len(coords)
+    # adjacency in compressed sparse row form, every edge in both directions
+    src = np.concatenate((edges[:, 0], edges[:, 1]))
+    dst = np.concatenate((edges[:, 1], edges[:, 0]))
+    order = np.argsort(src, kind="stable")
+    dst = dst[order]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+
+    distance = np.zeros(n)
+    visited = roots.copy()
+    frontier = np.flatnonzero(roots)
+    while len(frontier):
+        counts = indptr[frontier + 1] - indptr[frontier]
+        # the positions in dst of all neighbors of all frontier vertices
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        neighbors = dst[np.repeat(indptr[frontier], counts) + offsets]
+        parents = np.repeat(frontier, counts)
+        new = ~visited[neighbors]
+        neighbors, first = np.unique(neighbors[new], return_index=True)
+        parents = parents[new][first]
+        distance[neighbors] = distance[parents] + np.linalg.norm(
+            coords[neighbors] - coords[parents], axis=1
+        )
+        visited[neighbors] = True
+        frontier = neighbors
+    return distance
+
+
+@profiled
+class OBJECT_OT_skin_radii(Operator):
+    bl_idname = "object.skin_radii"
+    bl_label = "Set skin radii"
+    bl_description = "Set the skin radii of all or selected vertices"
+    bl_options = {"REGISTER", "UNDO"}
+
+    mode: EnumProperty(
+        name="Mode",
+        items=[
+            ("CONSTANT", "Constant", "Give all vertices the same radius"),
+            ("SCALE", "Scale", "Multiply the current radii by a factor"),
+            ("GRADIENT", "Gradient", "Change the radius linearly along an axis"),
+            ("TAPER", "Taper", "Change the radius with the distance from the root vertices"),
+        ],
+        default="CONSTANT",
+    )  # type: ignore
+
+    radius: FloatProperty(
+        name="Radius", description="Radius for all vertices", default=0.1, min=0.0
+    )  # type: ignore
+
+    factor: FloatProperty(
+        name="Factor", description="Factor to multiply the radii with", default=1.0, min=0.0
+    )  # type: ignore
+
+    start_radius: FloatProperty(
+        name="Start radius", description="Radius at the start of the gradient or at the roots", default=0.1, min=0.0
+    )  # type: ignore
+
+    end_radius: FloatProperty(
+        name="End radius", description="Radius at the end of the gradient or farthest from the roots", default=0.02, min=0.0
+    )  # type: ignore
+
+    axis: EnumProperty(
+        name="Axis",
+        description="Local axis of the gradient",
+        items=[("0", "X", ""), ("1", "Y", ""), ("2", "Z", "")],
+        default="2",
+    )  # type: ignore
+
+    only_selected: BoolProperty(
+        name="Only selected", description="Only change the radii of selected vertices", default=False
+    )  # type: ignore
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "mode")
+        if self.mode == "CONSTANT":
+            layout.prop(self, "radius")
+        elif self.mode == "SCALE":
+            layout.prop(self, "factor")
+        else:
+            if self.mode == "GRADIENT":
+                layout.row().prop(self, "axis", expand=True)
+            layout.prop(self, "start_radius")
+            layout.prop(self, "end_radius")
+        layout.prop(self, "only_selected")
+
+    @classmethod
+    def poll(cls, context):
+        """
+        Check if we are in object mode and the active object is a mesh with skin data.
+
+        In edit mode the skin data lives in a bmesh, so changing the mesh
+        data directly would have no effect.
+        """
+        return (
+            context.mode == "OBJECT"
+            and context.active_object
+            and context.active_object.type == "MESH"
+            and len(context.active_object.data.skin_vertices) > 0
+        )
+
+    def execute(self, context):
+        """
+        Set the radii with a single foreach_get() and foreach_set() on the skin layer.
+        """
+        import numpy as np
+
+        mesh = context.active_object.data
+        skin = mesh.skin_vertices[0].data
+        n = len(skin)
+
+        # each skin vertex has two radii (x and y), we always set both
+        radii = np.empty(n * 2, dtype=np.float32)
+        skin.foreach_get("radius", radii)
+        radii = radii.reshape(n, 2)
+
+        if self.only_selected:
+            selected = np.empty(n, dtype=bool)
+            mesh.vertices.foreach_get("select", selected)
+        else:
+            selected = np.ones(n, dtype=bool)
+
+        if self.mode == "CONSTANT":
+            radii[selected] = self.radius
+        elif self.mode == "SCALE":
+            radii[selected] *= self.factor
+        else:
+            coords = np.empty(n * 3, dtype=np.float32)
+            mesh.vertices.foreach_get("co", coords)
+            coords = coords.reshape(n, 3)
+            if self.mode == "GRADIENT":
+                t = coords[:, int(self.axis)]
+            else:
+                roots = np.empty(n, dtype=bool)
+                skin.foreach_get("use_root", roots)
+                if not roots.any():
+                    self.report({"ERROR"}, "Mesh has no root vertices")
+                    return {"CANCELLED"}
+                edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+                mesh.edges.foreach_get("vertices", edges)
+                t = distance_from_roots(coords, edges.reshape(-1, 2), roots)
+            # map the affected vertices onto the range [0, 1]
+            t = t[selected]
+            if len(t):
+                span = t.max() - t.min()
+                t = (t - t.min()) / span if span > 0 else np.zeros_like(t)
+                radii[selected] = (self.start_radius + (self.end_radius - self.start_radius) * t)[:, None]
+
+        skin.foreach_set("radius", radii.ravel())
+        mesh.update()
+        return {"FINISHED"}
+
+
+def menu_func(self, context):
+    """Add the operator to the  menu."""
+    self.layout.separator()
+    self.layout.operator(OBJECT_OT_skin_radii.bl_idname)
+
+
+def register():
+    """Register the add-on classes and menu."""
+    register_class(OBJECT_OT_skin_radii)
+    VIEW3D_MT_object.append(menu_func)
+
+
+def unregister():
+    """Unregister the add-on classes and menu."""
+    VIEW3D_MT_object.remove(menu_func)
+    unregister_class(OBJECT_OT_skin_radii)
+
+
+if __name__ == "__main__":
+    register()
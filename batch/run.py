@@ -0,0 +1,197 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Apply rig_curve or skin_armature to many .blend files with a pool of Blender processes.
+
+This is a plain Python script, it starts Blender itself:
+
+    python batch/run.py --task skin_armature --save-to skinned/ characters/
+    python batch/run.py --task rig_curve --workers 8 --timeout 120 --summary rig.json a.blend b.blend
+
+Every worker is a blender --background process running worker.py that takes
+jobs, one .blend file each, from a single queue until the queue is empty, so
+the time Blender needs to start is paid once per worker, not once per file.
+The workers share nothing, so with one worker per core (the default) the
+throughput grows with the number of cores, as long as there is enough memory
+for that many Blender sessions.
+
+A job that takes longer than --timeout seconds is considered hung: its worker
+is killed and replaced by a new one and the job is tried again, up to --retries
+times. The same happens when a worker crashes. A job that fails with a Python
+error is not tried again, because it would fail the same way.
+
+When everything is done, a JSON summary with the outcome and timings of every
+job is written, and the script exits with status 1 if any job did not succeed.
+Without --save-to the results are not saved, which is useful to time a run.
+"""
+
+import argparse
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+
+WORKER = Path(__file__).resolve().parent / "worker.py"
+MARKER = "batch: "  # the same as in worker.py
+TASKS = ("rig_curve", "skin_armature")  # see TASKS in worker.py
+
+
+class Worker:
+    """A Blender process running worker.py, with a thread that collects its results."""
+
+    def __init__(self, blender):
+        self.process = subprocess.Popen(
+            [blender, "--background", "--factory-startup", "--python", str(WORKER)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        self.results = queue.Queue()
+        threading.Thread(target=self.read, daemon=True).start()
+
+    def read(self):
+        for line in self.process.stdout:
+            if line.startswith(MARKER):
+                self.results.put(json.loads(line[len(MARKER) :]))
+        self.results.put(None)  # the process ended
+
+    def run(self, job, timeout):
+        """
+        Send a job to the worker and wait for the result.
+
+        :param job: A dict, see worker.py
+        :param timeout: The number of seconds to wait
+        :return: The result dict from worker.py, or one with the status "timeout" or "crashed",
+            in which case the worker is killed and cannot be used any more
+        """
+        try:
+            self.process.stdin.write(json.dumps(job) + "\n")
+            self.process.stdin.flush()
+            result = self.results.get(timeout=timeout)
+        except queue.Empty:
+            result = {"status": "timeout", "error": f"no result after {timeout} seconds"}
+        except BrokenPipeError:
+            result = None
+        if result is None:
+            result = {"status": "crashed", "error": f"Blender exited with status {self.process.poll()}"}
+        if result["status"] in ("timeout", "crashed"):
+            self.stop(kill=True)
+        return result
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            self.process.stdin.close()  # the worker stops at the end of its input
+        self.process.wait()
+
+
+def work(jobs, done, blender, timeout, retries):
+    """
+    Do jobs from the queue until it is empty, starting a new worker whenever one was killed.
+
+    :param jobs: A queue.Queue with job dicts
+    :param done: A list to append a summary of every finished job to
+    """
+    worker = None
+    while True:
+        try:
+            job = jobs.get_nowait()
+        except queue.Empty:
+            break
+        if worker is None:
+            worker = Worker(blender)
+        start = perf_counter()
+        result = worker.run(job, timeout)
+        attempts = job["attempts"] + 1
+        if result["status"] in ("timeout", "crashed"):
+            worker = None
+            if attempts <= retries:
+                jobs.put({**job, "attempts": attempts})
+                continue
+        done.append({"path": job["path"], **result, "attempts": attempts, "seconds": perf_counter() - start})
+    if worker is not None:
+        worker.stop()
+
+
+def blend_files(paths):
+    """Return all .blend files, looking inside directories (and their subdirectories)."""
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.rglob("*.blend")) if path.is_dir() else [path])
+    return files
+
+
+def save_paths(files, save_to):
+    """Map every file to a path in save_to, keeping their relative locations so that files with the same name do not clash."""
+    if save_to is None:
+        return {file: None for file in files}
+    common = Path(os.path.commonpath([file.resolve().parent for file in files]))
+    return {file: Path(save_to).resolve() / file.resolve().relative_to(common) for file in files}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply an add-on to many .blend files with a pool of Blender processes")
+    parser.add_argument("paths", nargs="+", help=".blend files or directories with .blend files")
+    parser.add_argument("--task", choices=TASKS, required=True)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of Blender processes (default: one per core)")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds before a job is considered hung (default: 600)")
+    parser.add_argument("--retries", type=int, default=1, help="how often a job that hung or crashed is tried again (default: 1)")
+    parser.add_argument("--save-to", help="directory to save the results in (default: do not save)")
+    parser.add_argument("--summary", default="batch-summary.json", help="the JSON file to write the summary to")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="the Blender executable (default: $BLENDER or blender)")
+    args = parser.parse_args()
+
+    files = blend_files(args.paths)
+    if not files:
+        parser.error("no .blend files found")
+    jobs = queue.Queue()
+    for file, save_as in save_paths(files, args.save_to).items():
+        if save_as is not None:
+            save_as.parent.mkdir(parents=True, exist_ok=True)
+        jobs.put({"path": str(file.resolve()), "task": args.task, "save_as": save_as and str(save_as), "attempts": 0})
+
+    done = []
+    workers = max(1, min(args.workers, len(files)))
+    start = perf_counter()
+    threads = [
+        threading.Thread(target=work, args=(jobs, done, args.blender, args.timeout, args.retries))
+        for _ in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = perf_counter() - start
+
+    failed = [job for job in done if job["status"] != "ok"]
+    summary = {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "task": args.task,
+        "workers": workers,
+        "files": len(files),
+        "failed": len(failed),
+        "seconds": seconds,
+        "files_per_second": len(files) / seconds,
+        "jobs": sorted(done, key=lambda job: job["path"]),
+    }
+    with open(args.summary, "w") as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"{len(files)} files in {seconds:.1f} s with {workers} workers ({len(files) / seconds:.2f} files/s)")
+    for job in failed:
+        print(f"{job['status']:>8} {job['path']}: {job['error']}")
+    print(f"summary written to {args.summary}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
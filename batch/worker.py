@@ -0,0 +1,99 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+The Blender side of run.py: process .blend files, one job per line on stdin.
+
+    blender --background --factory-startup --python batch/worker.py
+
+A job is a JSON object like {"path": "in/a.blend", "task": "rig_curve", "save_as": "out/a.blend"}.
+The worker opens the file, applies the task to every suitable object with the
+context-free functions of the add-on, saves the result if save_as is given and
+prints a single line with the outcome. That line starts with MARKER, so it can
+be told apart from everything Blender prints itself. The worker stops at the
+end of its input.
+"""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from time import perf_counter
+
+import bpy
+
+ADDONS = Path(__file__).resolve().parent.parent / "add-ons"
+MARKER = "batch: "
+
+
+def import_addon(name):
+    """Import an add-on from the add-ons directory. The functions we use do not need it to be registered."""
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, ADDONS / f"{name}.py")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def rig_curves():
+    """Rig every curve in the scene that can be rigged, return the number of curves."""
+    module = import_addon("rig_curve")
+    curves = [ob for ob in bpy.context.scene.objects if module.is_riggable(ob)]
+    for curve in curves:
+        module.rig_curve(curve, curve.users_collection[0])
+    return len(curves)
+
+
+def skin_armatures():
+    """Skin every armature in the scene, return the number of armatures."""
+    module = import_addon("skin_armature")
+    armatures = [ob for ob in bpy.context.scene.objects if ob.type == "ARMATURE"]
+    for armature in armatures:
+        module.skin_armature(armature, armature.users_collection[0])
+    return len(armatures)
+
+
+# the names should match TASKS in run.py
+TASKS = {
+    "rig_curve": rig_curves,
+    "skin_armature": skin_armatures,
+}
+
+
+def process(job):
+    """
+    Do a single job.
+
+    :param job: A dict with a path, a task and optionally save_as
+    :return: A dict with the number of objects processed and the time spent loading, working and saving
+    """
+    start = perf_counter()
+    bpy.ops.wm.open_mainfile(filepath=job["path"], load_ui=False)
+    loaded = perf_counter()
+    objects = TASKS[job["task"]]()
+    done = perf_counter()
+    if job.get("save_as"):
+        bpy.ops.wm.save_as_mainfile(filepath=job["save_as"], copy=True)
+    return {
+        "objects": objects,
+        "load": loaded - start,
+        "work": done - loaded,
+        "save": perf_counter() - done,
+    }
+
+
+def main():
+    for line in sys.stdin:
+        job = json.loads(line)
+        try:
+            result = {"status": "ok", **process(job)}
+        except Exception as e:
+            result = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+        print(MARKER + json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Compare the throughput of the rig curve and skin armature operators with
+that of the plain functions that do the same without the context.
+
+    blender --background --factory-startup --python benchmarks/bench_background.py
+
+A job is rigging one curve with 10 control points, or skinning one armature
+with 15 bones. A batch of jobs is processed the way a background script would:
+with the operator, every object has to be made the active (and only selected)
+object first; the functions are simply given the object and a collection.
+The results are the total time per batch, the report also shows jobs per second.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import bpy
+import scenes
+from common import load_addon, unload_addon, empty_scene, timed
+
+SIZES = (10, 100, 1_000)
+CURVE_POINTS = 10
+ARMATURE_BONES = 15
+
+
+def rig_with_operator(curves):
+    for curve in curves:
+        scenes.make_active(curve)
+        bpy.ops.object.rig_curve(size=0.1, ik=True)
+
+
+def rig_with_function(module, curves):
+    collection = bpy.context.scene.collection
+    for curve in curves:
+        module.rig_curve(curve, collection, size=0.1, ik=True)
+
+
+def skin_with_operator(armatures):
+    for armature in armatures:
+        scenes.make_active(armature)
+        bpy.ops.object.skin_armature()
+
+
+def skin_with_function(module, armatures):
+    collection = bpy.context.scene.collection
+    for armature in armatures:
+        module.skin_armature(armature, collection)
+
+
+def benchmark(sizes=SIZES):
+    """
+    Time batches of jobs with the operators and with the plain functions.
+
+    :return: A list of (label, size, seconds) tuples, the size is the number of jobs
+    """
+    rows = []
+    jobs = []
+
+    module = load_addon("rig_curve")
+    for count in sizes:
+
+        def setup():
+            jobs[:] = scenes.curves(count, CURVE_POINTS)
+
+        rows.append(("rig_curve operator", count, timed(lambda: rig_with_operator(jobs), repeat=1, setup=setup)))
+        rows.append(("rig_curve function", count, timed(rig_with_function, module, jobs, repeat=1, setup=setup)))
+    empty_scene()
+    unload_addon(module)
+
+    module = load_addon("skin_armature")
+    bones = scenes.tree_bones(ARMATURE_BONES)
+    for count in sizes:
+
+        def setup():
+            jobs[:] = scenes.armatures(count, bones)
+
+        rows.append(("skin_armature operator", count, timed(lambda: skin_with_operator(jobs), repeat=1, setup=setup)))
+        rows.append(("skin_armature function", count, timed(skin_with_function, module, jobs, repeat=1, setup=setup)))
+    empty_scene()
+    unload_addon(module)
+    return rows
+
+
+def main():
+    import io
+    from contextlib import redirect_stdout
+
+    with redirect_stdout(io.StringIO()):  # the skin armature operator prints a lot
+        rows = benchmark()
+    print("\nbackground jobs")
+    for label, count, seconds in rows:
+        print(f"{label:>24} {count:>10} {seconds * 1000:12.2f} ms {count / seconds:10.1f} jobs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Measure the throughput of exporting the distances of the distance overlay.
+
+    blender --background --factory-startup --python benchmarks/bench_distance_export.py
+
+The scenes have one active object and many selected mesh objects (see
+scenes.mesh_objects()). Every target is one row, and each size is exported
+to CSV and to .npy for the current frame and for a range of FRAMES frames.
+The results are the total time per export, the report also shows rows per second.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import bpy
+import scenes
+from common import load_addon, unload_addon, empty_scene, timed
+
+SIZES = (1_000, 10_000, 100_000)
+FRAMES = 10
+
+
+def benchmark(sizes=SIZES):
+    """
+    Time exporting the distances of all selected objects to the active one.
+
+    :return: A list of (label, size, seconds) tuples, the size is the number of rows
+    """
+    module = load_addon("distance_overlay")
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for count in sizes:
+            scenes.mesh_objects(count)
+            bpy.ops.object.distance_overlay()
+            scene = bpy.context.scene
+            for suffix in (".csv", ".npy"):
+                path = Path(directory) / f"distances{suffix}"
+                for frames in (None, range(1, FRAMES + 1)):
+                    label = f"{suffix[1:]} {'frame range' if frames else 'one frame'}"
+                    size = (count - 1) * (len(frames) if frames else 1)
+                    seconds = timed(
+                        module.export_distances, path, module.active, module.targets, scene, frames, setup=None
+                    )
+                    rows.append((label, size, seconds))
+            bpy.ops.object.distance_overlay_remove()
+    empty_scene()
+    unload_addon(module)
+    return rows
+
+
+def main():
+    rows = benchmark()
+    print("\ndistance export")
+    for label, count, seconds in rows:
+        print(f"{label:>24} {count:>10} {seconds * 1000:12.2f} ms {count / seconds:12.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Compare moving and animating objects one by one with the batch move_x operator.
+
+    blender --background --factory-startup --python benchmarks/bench_move_x.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import bpy
+from common import load_addon, unload_addon, empty_scene, timed, report
+from scenes import many_objects
+
+SIZES = (10_000, 100_000)
+ANIMATED = 1_000
+FRAMES = 250
+
+
+def move_one_by_one():
+    for ob in bpy.context.selected_objects:
+        ob.location.x += 1
+
+
+def keyframe_one_by_one():
+    for frame in range(1, FRAMES + 1):
+        for ob in bpy.context.selected_objects:
+            ob.location.x = frame / FRAMES
+            ob.keyframe_insert("location", frame=frame)
+
+
+def remove_animation():
+    for ob in bpy.data.objects:
+        ob.animation_data_clear()
+    for action in list(bpy.data.actions):
+        bpy.data.actions.remove(action)
+
+
+def benchmark(sizes=SIZES, animated=ANIMATED):
+    """
+    Time moving the selected objects one by one and with move_x, and keyframing them.
+
+    :return: A list of (label, size, seconds) tuples
+    """
+    module = load_addon("move_x_batch")
+    rows = []
+    for count in sizes:
+        many_objects(count)
+        rows.append(("one by one", count, timed(move_one_by_one, setup=None)))
+        for mode in ("TRANSLATE", "ROTATE", "SCALE"):
+            seconds = timed(
+                bpy.ops.object.move_x, mode=mode, axis=(1, 1, 0), angle=0.1, factor=1.1, setup=None
+            )
+            rows.append((f"move_x {mode.lower()}", count, seconds))
+
+    many_objects(animated)
+    rows.append(("keyframe_insert", animated, timed(keyframe_one_by_one, repeat=1, setup=remove_animation)))
+    seconds = timed(
+        bpy.ops.object.move_x, bake=True, frame_start=1, frame_end=FRAMES, repeat=1, setup=remove_animation
+    )
+    rows.append(("move_x bake", animated, seconds))
+    empty_scene()
+    unload_addon(module)
+    return rows
+
+
+def main():
+    report("transform selected objects", benchmark())
+
+if __name__ == "__main__":
+    main()
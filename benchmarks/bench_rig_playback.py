@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Compare playback of rigged curves with playback of the same curves baked.
+
+    blender --background --factory-startup --python benchmarks/bench_rig_playback.py
+
+Every scene has a number of cables: curves with CURVE_POINTS control points,
+rigged with rig_curve() and with the last bone of each armature animated, so
+that every frame the armatures, the constraints of the empties and the hooks
+have to be evaluated. Playback is timed by setting every frame of the range
+in turn, first with the rigs and then after baking them in memory and to
+.npy files. The report shows frames per second.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import bpy
+import scenes
+from common import load_addon, unload_addon, empty_scene, timed
+
+SIZES = (10, 100, 300)
+CURVE_POINTS = 10
+FRAMES = 50
+
+
+def rigged_cables(module, count):
+    """Add count rigged curves, the last bone of every rig moves up and down over FRAMES frames."""
+    curves = scenes.curves(count, CURVE_POINTS)
+    collection = bpy.context.scene.collection
+    for curve in curves:
+        armature = module.rig_curve(curve, collection, ik=False)
+        bone = armature.pose.bones[-1]
+        for frame, z in ((1, 0), (FRAMES // 2, 1), (FRAMES, 0)):
+            bone.location.z = z
+            bone.keyframe_insert("location", frame=frame)
+    return curves
+
+
+def play(scene):
+    for frame in range(1, FRAMES + 1):
+        scene.frame_set(frame)
+
+
+def benchmark(sizes=SIZES):
+    """
+    Time playing FRAMES frames with rigged and with baked curves.
+
+    :return: A list of (label, size, seconds) tuples, the size is the number of curves
+    """
+    module = load_addon("rig_curve")
+    scene = bpy.context.scene
+    frames = range(1, FRAMES + 1)
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for count in sizes:
+            curves = rigged_cables(module, count)
+            rows.append(("rigged", count, timed(play, scene, setup=None)))
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            for label, path in (("memory", None), ("disk", directory)):
+                bake = lambda: module.bake_rig(curves, frames, scene, depsgraph, path)
+                rows.append((f"bake to {label}", count, timed(bake, repeat=1, setup=None)))
+                rows.append((f"baked in {label}", count, timed(play, scene, setup=None)))
+                for curve in curves:
+                    module.free_bake(curve)
+    empty_scene()
+    unload_addon(module)
+    return rows
+
+
+def main():
+    rows = benchmark()
+    print(f"\nrig curve playback, {FRAMES} frames")
+    for label, count, seconds in rows:
+        fps = f"{FRAMES / seconds:10.1f} fps" if not label.startswith("bake to") else ""
+        print(f"{label:>24} {count:>10} {seconds * 1000:12.2f} ms {fps}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Compare playback of a crowd of stick figures with and without level of detail.
+
+    blender --background --factory-startup --python benchmarks/bench_skin_lod.py
+
+Every scene has a number of armatures with TREE_BONES bones, spread out over
+a row that starts at the camera and ends SPACING * count further. Each has a
+stick figure made with skin_armature() and walks sideways over FRAMES frames,
+so every frame all skin and subdivision modifiers have to be evaluated.
+Playback is timed by setting every frame in turn, first with full detail and
+then with level of detail at the default distances. The report shows frames
+per second. Background mode evaluates the viewport settings of the modifiers,
+so this is what level of detail changes, but drawing is not included.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import bpy
+import scenes
+from common import load_addon, unload_addon, empty_scene, timed
+
+SIZES = (10, 100, 300)
+TREE_BONES = 15
+SPACING = 0.5
+FRAMES = 50
+
+
+def crowd(module, count):
+    """Add count walking stick figures in a row in front of a camera, return the figures."""
+    armatures = scenes.armatures(count, scenes.tree_bones(TREE_BONES))
+    scene = bpy.context.scene
+    camera = bpy.data.objects.new("Camera", bpy.data.cameras.new("Camera"))
+    scene.collection.objects.link(camera)
+    scene.camera = camera
+    figures = []
+    for i, armature in enumerate(armatures):
+        for frame, x in ((1, 0), (FRAMES, 2)):
+            armature.location = (x, i * SPACING, 0)
+            armature.keyframe_insert("location", frame=frame)
+        figures.append(module.skin_armature(armature, scene.collection))
+    return figures
+
+
+def play(scene):
+    for frame in range(1, FRAMES + 1):
+        scene.frame_set(frame)
+
+
+def benchmark(sizes=SIZES):
+    """
+    Time playing FRAMES frames with full detail and with level of detail.
+
+    :return: A list of (label, size, seconds) tuples, the size is the number of stick figures
+    """
+    module = load_addon("skin_armature")
+    scene = bpy.context.scene
+    rows = []
+    for count in sizes:
+        figures = crowd(module, count)
+        rows.append(("full detail", count, timed(play, scene, setup=None)))
+        for figure in figures:
+            module.add_lod(figure)
+        rows.append(("level of detail", count, timed(play, scene, setup=None)))
+        for figure in figures:
+            module.remove_lod(figure)
+    empty_scene()
+    unload_addon(module)
+    return rows
+
+
+def main():
+    rows = benchmark()
+    print(f"\nstick figure crowd playback, {FRAMES} frames")
+    for label, count, seconds in rows:
+        print(f"{label:>24} {count:>10} {seconds * 1000:12.2f} ms {FRAMES / seconds:10.1f} fps")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Compare 1000 stars made with modifiers to 1000 stars made with geometry nodes.
+
+    blender --background --factory-startup --python benchmarks/bench_star_geometry_nodes.py
+
+For each variant we report how long it takes to add the stars, how long
+a full re-evaluation of all of them takes, and the size of the saved file.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import bpy
+from common import load_addon, unload_addon, empty_scene, timed, report
+
+STARS = 1_000
+
+
+def add_stars(count):
+    for _ in range(count):
+        bpy.ops.object.add_star()
+
+
+def evaluate_all():
+    for ob in bpy.data.objects:
+        ob.update_tag(refresh={"DATA"})
+    bpy.context.view_layer.update()
+
+
+def file_size():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "stars.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=path, copy=True, compress=False)
+        return os.path.getsize(path)
+
+
+def benchmark(stars=STARS):
+    """
+    Time adding and evaluating stars made with modifiers and with geometry nodes.
+
+    :return: A list of (label, size, seconds) tuples and a list of (add-on name, file size) tuples
+    """
+    rows = []
+    sizes = []
+    for name in ("add_star_with_modifier", "add_star_geometry_nodes"):
+        module = load_addon(name)
+        rows.append((f"{name[9:]} add", stars, timed(add_stars, stars, repeat=1)))
+        rows.append((f"{name[9:]} evaluate", stars, timed(evaluate_all, setup=None)))
+        sizes.append((name, file_size()))
+        empty_scene()
+        unload_addon(module)
+    return rows, sizes
+
+
+def main():
+    rows, sizes = benchmark()
+    report(f"{STARS} stars", rows)
+    for name, size in sizes:
+        print(f"{name:>32} {size / 1024:10.0f} KiB")
+
+if __name__ == "__main__":
+    main()
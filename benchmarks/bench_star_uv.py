@@ -0,0 +1,47 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Compare smart_project with the planar uv map of the add star operators.
+
+    blender --background --factory-startup --python benchmarks/bench_star_uv.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import bpy
+from common import load_addon, unload_addon, timed, report
+
+SIZES = (20, 1_000, 50_000)
+
+
+def add_star(points, uv_method):
+    bpy.ops.object.add_star(points=points, uv_method=uv_method)
+
+
+def benchmark(sizes=SIZES):
+    """
+    Time adding stars with both uv methods.
+
+    :return: A list of (label, size, seconds) tuples
+    """
+    rows = []
+    for name in ("add_star_with_operators", "add_star_with_modifier"):
+        module = load_addon(name)
+        for points in sizes:
+            for uv_method in ("SMART_PROJECT", "PLANAR"):
+                seconds = timed(add_star, points, uv_method)
+                rows.append((f"{name[9:]} {uv_method.lower()}", points, seconds))
+        unload_addon(module)
+    return rows
+
+
+def main():
+    report("add star, uv method", benchmark())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Measure how long it takes to import and to register each add-on.
+
+    blender --background --factory-startup --python benchmarks/bench_startup.py
+
+Once a module has been imported, importing it again costs nothing, and a module
+that one add-on imports (NumPy, for example) is already loaded for the next one.
+So every add-on is measured in a fresh Blender process that this script starts
+with the same Blender binary, the best of a few runs is reported, and the table
+also lists the slow to import modules that were loaded by the add-on itself.
+An add-on that cannot be imported or registered in background mode (for example
+because it needs a GPU at import time) is reported with its error.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import bpy
+from common import ADDONS, report, script_arguments
+
+# modules that take a noticeable time to import; only the ones an add-on loads itself are listed
+HEAVY_MODULES = ("numpy", "pprint", "bpy_extras.object_utils", "bpy_extras.anim_utils", "gpu_extras.batch")
+
+# the child process prints its measurement on a line that starts with this
+MARKER = "startup: "
+
+
+def measure(name):
+    """
+    Import and register an add-on in this process, then unregister it again.
+
+    :param name: The file name of the add-on without the .py extension
+    :return: A dict with the import and register times in seconds and the heavy modules it loaded
+    """
+    import importlib.util
+
+    before = set(sys.modules)
+    start = perf_counter()
+    spec = importlib.util.spec_from_file_location(name, ADDONS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    imported = perf_counter()
+    module.register()
+    registered = perf_counter()
+    module.unregister()
+    loaded = set(sys.modules) - before
+    return {
+        "import": imported - start,
+        "register": registered - imported,
+        "modules": [heavy for heavy in HEAVY_MODULES if heavy in loaded],
+    }
+
+
+def measure_in_new_process(name):
+    """Start a new Blender that runs measure(name) and return its result, or raise RuntimeError if it failed."""
+    command = [
+        bpy.app.binary_path,
+        "--background",
+        "--factory-startup",
+        "--python",
+        __file__,
+        "--",
+        "--child",
+        name,
+    ]
+    process = subprocess.run(command, capture_output=True, text=True)
+    for line in process.stdout.splitlines():
+        if line.startswith(MARKER):
+            result = json.loads(line[len(MARKER) :])
+            if "error" in result:
+                raise RuntimeError(result["error"])
+            return result
+    raise RuntimeError(f"no result from {name}, exit status {process.returncode}")
+
+
+def addon_names():
+    return sorted(path.stem for path in ADDONS.glob("*.py"))
+
+
+def benchmark(names=None, repeat=3):
+    """
+    Time importing and registering add-ons, each in a new Blender process.
+
+    :param names: The add-ons to measure, all of them by default
+    :param repeat: The number of processes per add-on, the shortest times are kept
+    :return: A list of (label, size, seconds) tuples and a dict that maps
+        each add-on to the heavy modules it loaded (or to its error)
+    """
+    rows = []
+    modules = {}
+    for name in names or addon_names():
+        try:
+            results = [measure_in_new_process(name) for _ in range(repeat)]
+        except RuntimeError as e:
+            modules[name] = f"failed: {e}"
+            continue
+        rows.append((f"import {name}", 1, min(result["import"] for result in results)))
+        rows.append((f"register {name}", 1, min(result["register"] for result in results)))
+        modules[name] = ", ".join(results[0]["modules"]) or "-"
+    return rows, modules
+
+
+def child(name):
+    try:
+        result = measure(name)
+    except Exception as e:
+        result = {"error": f"{type(e).__name__}: {e}"}
+    print(MARKER + json.dumps(result))
+
+
+def main():
+    arguments = script_arguments()
+    if arguments[:1] == ["--child"]:
+        child(arguments[1])
+        return
+    rows, modules = benchmark(arguments or None)
+    report("add-on import and register", rows)
+    print("\nheavy modules loaded by each add-on")
+    for name, loaded in modules.items():
+        print(f"{name:>24} {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Helpers shared by the benchmark scripts.
+
+The scripts are meant to be run by Blender itself, for example:
+
+    blender --background --factory-startup --python benchmarks/bench_star_uv.py
+
+They load the add-ons straight from the add-ons directory, so nothing
+needs to be installed first.
+"""
+
+import importlib.util
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+
+import bpy
+
+ROOT = Path(__file__).resolve().parent.parent
+ADDONS = ROOT / "add-ons"
+# add-ons can import from each other, just like when they are installed in Blender's add-ons directory
+if str(ADDONS) not in sys.path:
+    sys.path.append(str(ADDONS))
+
+
+def load_addon(name):
+    """
+    Import an add-on from the add-ons directory and register it.
+
+    :param name: The file name of the add-on without the .py extension
+    :return: The imported module
+
+    Several add-ons in this repository use the same bl_idname (they are
+    successive versions of the same add-on), so any module that was loaded
+    before under another name is not unregistered automatically; use
+    unload_addon() when you are done with it.
+    """
+    spec = importlib.util.spec_from_file_location(name, ADDONS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    module.register()
+    return module
+
+
+def unload_addon(module):
+    """Unregister an add-on loaded with load_addon()."""
+    module.unregister()
+    sys.modules.pop(module.__name__, None)
+
+
+def empty_scene():
+    """Remove all objects and orphaned data so every run starts from scratch."""
+    if bpy.context.mode != "OBJECT":
+        bpy.ops.object.mode_set(mode="OBJECT")
+    for ob in list(bpy.data.objects):
+        bpy.data.objects.remove(ob)
+    bpy.ops.outliner.orphans_purge(do_recursive=True)
+
+
+def timed(function, *args, repeat=3, setup=empty_scene, **kwargs):
+    """
+    Call a function a number of times and return the best wall clock time.
+
+    :param function: The function to time
+    :param repeat: How many times to call it
+    :param setup: Called (untimed) before every call, by default empty_scene()
+    :return: The shortest time in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = perf_counter()
+        function(*args, **kwargs)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def report(title, rows):
+    """
+    Print the results as a simple table.
+
+    :param title: A title for the table
+    :param rows: A list of (label, size, seconds) tuples
+    """
+    print(f"\n{title}")
+    for label, size, seconds in rows:
+        print(f"{label:>24} {size:>10} {seconds * 1000:12.2f} ms")
+
+
+def script_arguments():
+    """
+    Return the command line arguments meant for the script.
+
+    Blender passes everything after -- untouched, for example:
+
+        blender --background --python benchmarks/suite.py -- --quick
+    """
+    return sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+
+
+def revision():
+    """Return the git commit of the repository, with a + appended if there are uncommitted changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        changes = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("+" if changes else "")
+
+
+def write_results(path, results):
+    """
+    Save benchmark results as JSON together with what they were measured on.
+
+    :param path: The file to write
+    :param results: A list of dicts, see suite.py
+    """
+    document = {
+        "revision": revision(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "blender": bpy.app.version_string,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
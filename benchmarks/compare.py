@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Compare two result files written by suite.py.
+
+This is a plain Python script, it does not need Blender:
+
+    python benchmarks/compare.py before.json after.json
+
+Every measurement that is in both files is shown with the ratio after/before.
+Ratios above the threshold (1.25 by default) are marked as a regression and
+make the script exit with status 1, so it can be used in a script or CI job.
+Timings below a millisecond are too noisy to compare and are never marked.
+"""
+
+import argparse
+import json
+import sys
+
+NOISE = 0.001  # seconds
+
+
+def load(path):
+    """Return the document and a dict that maps (benchmark, label, size) to seconds."""
+    with open(path) as f:
+        document = json.load(f)
+    timings = {
+        (r["benchmark"], r["label"], r["size"]): r["seconds"] for r in document["results"] if "error" not in r
+    }
+    return document, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=1.25, help="ratio above which a result is a regression")
+    args = parser.parse_args()
+
+    before_document, before = load(args.before)
+    after_document, after = load(args.after)
+    print(f"before: {before_document['revision']} ({before_document['blender']}, {before_document['date']})")
+    print(f"after:  {after_document['revision']} ({after_document['blender']}, {after_document['date']})\n")
+
+    regressions = 0
+    for key in sorted(before.keys() & after.keys(), key=str):
+        old, new = before[key], after[key]
+        ratio = new / old if old > 0 else float("inf")
+        regression = ratio > args.threshold and max(old, new) > NOISE
+        regressions += regression
+        benchmark, label, size = key
+        print(
+            f"{benchmark:>20} {label:>28} {size:>10} {old * 1000:12.2f} ms {new * 1000:12.2f} ms {ratio:8.2f}x"
+            + ("  REGRESSION" if regression else "")
+        )
+    for key in sorted(before.keys() ^ after.keys(), key=str):
+        print(f"{' '.join(map(str, key))} only in {'before' if key in before else 'after'}")
+    for document, name in ((before_document, "before"), (after_document, "after")):
+        for result in document["results"]:
+            if "error" in result:
+                print(f"{result['benchmark']} failed {name}: {result['error']}")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Synthetic scenes for the benchmarks.
+
+Every function starts from an empty scene (see common.empty_scene()),
+builds something of the requested size and leaves it selected and active,
+ready for the operator that is benchmarked next. The scenes only depend
+on their size, so the same size always gives the same scene.
+"""
+
+from math import sin, cos, pi
+
+import bpy
+from bpy_extras.object_utils import object_data_add
+
+from common import empty_scene
+
+
+def make_active(ob):
+    """Make ob the only selected object and the active one."""
+    for other in bpy.context.view_layer.objects.selected:
+        other.select_set(False)
+    ob.select_set(True)
+    bpy.context.view_layer.objects.active = ob
+    return ob
+
+
+def many_objects(count):
+    """Add count empties, all selected, with every tenth one parented to the previous one."""
+    empty_scene()
+    collection = bpy.context.scene.collection
+    parent = None
+    for i in range(count):
+        ob = bpy.data.objects.new(f"Empty.{i:06d}", None)
+        ob.location = (i % 100, i // 100, 0)
+        collection.objects.link(ob)
+        if i % 10 and parent is not None:
+            ob.parent = parent
+        else:
+            parent = ob
+    bpy.ops.object.select_all(action="SELECT")
+
+
+def long_curve(points):
+    """Add a curve with a single Bezier spline of points control points along a sine wave."""
+    empty_scene()
+    return add_long_curve(points)
+
+
+def add_long_curve(points, name="Long curve"):
+    """Like long_curve(), but keep whatever is in the scene already."""
+    curve = bpy.data.curves.new(name, type="CURVE")
+    curve.dimensions = "3D"
+    spline = curve.splines.new("BEZIER")
+    spline.bezier_points.add(points - 1)  # a new spline already has one point
+    for i, bp in enumerate(spline.bezier_points):
+        bp.co = (i * 0.5, sin(i * 0.5), 0)
+        bp.handle_left_type = bp.handle_right_type = "AUTO"
+    return make_active(object_data_add(bpy.context, curve, operator=None, name=name))
+
+
+def curves(count, points):
+    """Add count curves with points control points each, see long_curve(). The last one is active."""
+    empty_scene()
+    return [add_long_curve(points, f"Curve.{i:05d}") for i in range(count)]
+
+
+def armature(bones, name="Armature"):
+    """
+    Add an armature and make it active.
+
+    :param bones: A list of (head, tail, parent index or None) tuples
+    :return: The armature object
+    """
+    empty_scene()
+    return add_armature(bones, name)
+
+
+def add_armature(bones, name="Armature"):
+    """Like armature(), but keep whatever is in the scene already."""
+    data = bpy.data.armatures.new(name)
+    ob = make_active(object_data_add(bpy.context, data, operator=None, name=name))
+    bpy.ops.object.mode_set(mode="EDIT")
+    edit_bones = []
+    for i, (head, tail, parent) in enumerate(bones):
+        bone = data.edit_bones.new(f"Bone.{i:05d}")
+        bone.head = head
+        bone.tail = tail
+        if parent is not None:
+            bone.parent = edit_bones[parent]
+            bone.use_connect = tuple(edit_bones[parent].tail) == tuple(head)
+        edit_bones.append(bone)
+    bpy.ops.object.mode_set(mode="OBJECT")
+    return ob
+
+
+def armatures(count, bones):
+    """Add count armatures with the same bones, see armature(). The last one is active."""
+    empty_scene()
+    return [add_armature(bones, f"Armature.{i:05d}") for i in range(count)]
+
+
+def chain_bones(depth):
+    """A single chain of depth bones spiralling upwards."""
+    bones = []
+    for i in range(depth):
+        head = (cos(i * 0.3), sin(i * 0.3), i * 0.1)
+        tail = (cos((i + 1) * 0.3), sin((i + 1) * 0.3), (i + 1) * 0.1)
+        bones.append((head, tail, i - 1 if i else None))
+    return bones
+
+
+def tree_bones(count):
+    """A binary tree of count bones, every bone branches into two shorter ones."""
+    bones = [((0, 0, 0), (0, 0, 1), None)]
+    for i in range(1, count):
+        parent = (i - 1) // 2
+        head = bones[parent][1]
+        level = (i + 1).bit_length()
+        side = 1 if i % 2 else -1
+        angle = side * pi / 6 + level
+        length = 0.8**level
+        tail = (head[0] + length * sin(angle), head[1] + length * cos(angle) * 0.5, head[2] + length)
+        bones.append((head, tail, parent))
+    return bones
+
+
+def skin_mesh(vertices):
+    """
+    Add a tree shaped edge network with a skin modifier and make it active.
+
+    Vertex i is connected to vertex (i - 1) // 2, so the mesh is a binary
+    tree with its root at vertex 0, which is marked as the skin root.
+    """
+    empty_scene()
+    coords = [(0.0, 0.0, 0.0)]
+    for i in range(1, vertices):
+        parent = coords[(i - 1) // 2]
+        side = 1 if i % 2 else -1
+        coords.append((parent[0] + side * 0.1, parent[1] + (i % 7) * 0.01, parent[2] + 0.1))
+    edges = [((i - 1) // 2, i) for i in range(1, vertices)]
+    mesh = bpy.data.meshes.new("Skin mesh")
+    mesh.from_pydata(coords, edges, [])
+    ob = make_active(object_data_add(bpy.context, mesh, operator=None, name="Skin mesh"))
+    ob.modifiers.new(name="Skin", type="SKIN")  # adds the skin layer and marks vertex 0 as root
+    return ob
+
+
+def mesh_objects(count):
+    """Add count small mesh objects on a grid that share one mesh, all selected, the first one active."""
+    empty_scene()
+    mesh = bpy.data.meshes.new("Cube")
+    mesh.from_pydata([(x, y, z) for x in (-0.2, 0.2) for y in (-0.2, 0.2) for z in (-0.2, 0.2)], [], [])
+    collection = bpy.context.scene.collection
+    first = None
+    for i in range(count):
+        ob = bpy.data.objects.new(f"Cube.{i:06d}", mesh)
+        ob.location = (i % 100, (i // 100) % 100, i // 10_000)
+        collection.objects.link(ob)
+        first = first or ob
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.context.view_layer.objects.active = first
+    return first
@@ -0,0 +1,289 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Run the benchmarks for all add-ons and save the results as JSON.
+
+    blender --background --factory-startup --python benchmarks/suite.py -- --output before.json
+    ... change something ...
+    blender --background --factory-startup --python benchmarks/suite.py -- --output after.json
+    python benchmarks/compare.py before.json after.json
+
+Options (after the --):
+
+    --only NAME ...   only run these benchmarks (see BENCHMARKS below)
+    --quick           only run the smallest size of each benchmark
+    --output PATH     where to write the results (default: results.json)
+
+Each benchmark builds a synthetic scene (see scenes.py) for a number of
+sizes and times one or more operators on it. The individual bench_*.py
+scripts can still be run on their own; the suite runs them as well.
+A benchmark that fails (for example because an add-on cannot be loaded
+in background mode) is recorded with its error instead of timings, and
+the other benchmarks still run.
+"""
+
+import io
+import sys
+import traceback
+from contextlib import redirect_stdout
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import bpy
+import numpy as np
+from mathutils import Matrix
+
+import bench_background as background_script
+import bench_distance_export as distance_export_script
+import bench_move_x as move_x_script
+import bench_rig_playback as rig_playback_script
+import bench_skin_lod as skin_lod_script
+import bench_star_geometry_nodes as star_geometry_nodes_script
+import bench_star_uv as star_uv_script
+import bench_startup as startup_script
+import scenes
+from common import load_addon, unload_addon, empty_scene, timed, report, script_arguments, write_results
+
+
+def bench_add_star(sizes):
+    rows = []
+    for name in ("add_star", "add_star_with_operators", "add_star_with_modifier", "add_star_geometry_nodes"):
+        module = load_addon(name)
+        for points in sizes:
+            rows.append((name, points, timed(bpy.ops.object.add_star, points=points)))
+            if name == "add_star":
+                # what a mouse move costs while placing a star interactively, drawing not included
+                outline = module.StarOutline()
+                outline.update(points, 1.0, 1.5, (0, 0, 0))
+                seconds = timed(outline.update, points, 1.1, 1.6, (0, 0, 0), setup=None)
+                rows.append(("add_star_interactive outline", points, seconds))
+        unload_addon(module)
+    return rows
+
+
+def bench_star_uv(sizes):
+    return star_uv_script.benchmark(sizes)
+
+
+def bench_star_geometry_nodes(sizes):
+    rows, _ = star_geometry_nodes_script.benchmark(stars=sizes[-1])
+    return rows
+
+
+def bench_rig_curve(sizes):
+    module = load_addon("rig_curve")
+    rows = []
+    for points in sizes:
+        for ik in (False, True):
+            seconds = timed(bpy.ops.object.rig_curve, ik=ik, repeat=1, setup=lambda: scenes.long_curve(points))
+            rows.append((f"rig_curve{' ik' if ik else ''}", points, seconds))
+
+        # after rigging, move one control point and add one, then update the rig instead of rigging again
+        def edit():
+            curve = scenes.long_curve(points)
+            bpy.ops.object.rig_curve(ik=True)
+            spline = curve.data.splines[0]
+            spline.bezier_points[points // 2].co = (points // 2 * 0.5, 0, 1)
+            spline.bezier_points.add(1)
+            spline.bezier_points[-1].co = (points * 0.5, 0, 0)
+
+        rows.append(("rig_curve_update", points, timed(bpy.ops.object.rig_curve_update, repeat=1, setup=edit)))
+    empty_scene()
+    unload_addon(module)
+    return rows
+
+
+def bench_rig_playback(sizes):
+    return rig_playback_script.benchmark(sizes)
+
+
+def bench_skin_armature(sizes):
+    module = load_addon("skin_armature")
+    rows = []
+    for bones in sizes:
+        for shape, generate in (("chain", scenes.chain_bones), ("tree", scenes.tree_bones)):
+            seconds = timed(
+                bpy.ops.object.skin_armature, repeat=1, setup=lambda: scenes.armature(generate(bones))
+            )
+            rows.append((f"skin_armature {shape}", bones, seconds))
+
+        # after skinning, move the tail of one bone, then update the skin instead of skinning again
+        def edit():
+            armature = scenes.armature(scenes.tree_bones(bones))
+            bpy.ops.object.skin_armature()
+            bpy.context.view_layer.objects.active = armature
+            bpy.ops.object.mode_set(mode="EDIT")
+            armature.data.edit_bones[-1].tail = (0, 0, -1)
+            bpy.ops.object.mode_set(mode="OBJECT")
+
+        rows.append(("skin_armature_update tree", bones, timed(bpy.ops.object.skin_armature_update, repeat=1, setup=edit)))
+    empty_scene()
+    unload_addon(module)
+    return rows
+
+
+def bench_skin_lod(sizes):
+    return skin_lod_script.benchmark(sizes)
+
+
+def bench_skin_radii(sizes):
+    module = load_addon("skin_radii")
+    rows = []
+    for vertices in sizes:
+        scenes.skin_mesh(vertices)
+        for mode in ("CONSTANT", "GRADIENT", "TAPER"):
+            seconds = timed(bpy.ops.object.skin_radii, mode=mode, setup=None)
+            rows.append((f"skin_radii {mode.lower()}", vertices, seconds))
+    empty_scene()
+    unload_addon(module)
+    return rows
+
+
+def bench_move_x(sizes):
+    return move_x_script.benchmark(sizes, animated=sizes[0] // 10)
+
+
+def bench_background(sizes):
+    return background_script.benchmark(sizes)
+
+
+def view():
+    """A region and 3d region data like the ones a draw handler gets, looking down at the scenes from above."""
+    region = SimpleNamespace(width=1920, height=1080)
+    rv3d = SimpleNamespace(
+        perspective_matrix=Matrix(
+            ((0.02, 0, 0, -1), (0, 0.035, 0, -1), (0, 0, -0.001, 0), (0, 0, -0.01, 1))
+        )
+    )
+    return region, rv3d
+
+
+def bench_distance_overlay(sizes):
+    """
+    Time setting the objects and the label layout of the distance overlay.
+
+    There is no GPU in background mode, so the draw handlers themselves cannot run.
+    Instead we time what the pixel handler does before it draws anything, both
+    the first time (cold) and when nothing changed since the previous redraw.
+    """
+    module = load_addon("distance_overlay")
+    region, rv3d = view()
+    rows = []
+    for count in sizes:
+        scenes.mesh_objects(count)
+        rows.append(("distance_overlay operator", count, timed(bpy.ops.object.distance_overlay, setup=None)))
+
+        origin = np.array(module.active.location)
+        locations = np.array([ob.location[:] for ob in module.targets]).reshape(-1, 3)
+        midpoints = (origin + locations) / 2
+        distances = np.linalg.norm(locations - origin, axis=1)
+
+        def cold():
+            module.distance_labels.key = None
+
+        layout = module.distance_labels.layout
+        rows.append(("labels cold", count, timed(layout, midpoints, distances, region, rv3d, setup=cold)))
+        rows.append(("labels cached", count, timed(layout, midpoints, distances, region, rv3d, setup=None)))
+    bpy.ops.object.distance_overlay_remove()
+    empty_scene()
+    unload_addon(module)
+    return rows
+
+
+def bench_distance_export(sizes):
+    return distance_export_script.benchmark(sizes)
+
+
+def bench_bounding_box_overlay(sizes):
+    """Time collecting the bounding boxes of all selected objects and updating one percent of them."""
+    module = load_addon("bounding_box_overlay")
+    rows = []
+    for count in sizes:
+        scenes.mesh_objects(count)
+        selected = bpy.context.view_layer.objects.selected
+        rows.append(("collect", count, timed(module.BoundingBoxes, selected, setup=None)))
+
+        boxes = module.BoundingBoxes(selected)
+        changed = list(selected)[:: 100]
+
+        def move():
+            for ob in changed:
+                ob.location.z += 1
+                boxes.tag(ob)
+
+        rows.append(("update 1%", count, timed(boxes.update, setup=move)))
+    empty_scene()
+    unload_addon(module)
+    return rows
+
+
+def bench_startup(sizes):
+    """Time importing and registering every add-on, each in a new Blender process (see bench_startup.py)."""
+    rows, _ = startup_script.benchmark(repeat=sizes[-1])
+    return rows
+
+
+# name: (function, sizes)
+BENCHMARKS = {
+    "add_star": (bench_add_star, (20, 1_000, 50_000)),
+    "star_uv": (bench_star_uv, star_uv_script.SIZES),
+    "star_geometry_nodes": (bench_star_geometry_nodes, (100, star_geometry_nodes_script.STARS)),
+    "rig_curve": (bench_rig_curve, (10, 100, 500)),
+    "rig_playback": (bench_rig_playback, rig_playback_script.SIZES),  # the number of rigged curves, played before and after baking
+    "skin_armature": (bench_skin_armature, (15, 127, 1_023)),
+    "skin_lod": (bench_skin_lod, skin_lod_script.SIZES),  # the number of stick figures, played with and without level of detail
+    "skin_radii": (bench_skin_radii, (1_000, 100_000, 1_000_000)),
+    "move_x": (bench_move_x, (1_000,) + move_x_script.SIZES),
+    "distance_overlay": (bench_distance_overlay, (10, 1_000, 50_000)),
+    "distance_export": (bench_distance_export, distance_export_script.SIZES),  # the sizes are numbers of objects, the results are per number of rows
+    "bounding_box_overlay": (bench_bounding_box_overlay, (1_000, 50_000)),
+    "background": (bench_background, background_script.SIZES),  # rig_curve and skin_armature operators versus functions
+    "startup": (bench_startup, (1, 3)),  # the number of processes per add-on
+}
+
+
+def run(name, quick=False):
+    """
+    Run a single benchmark.
+
+    :param name: A key in BENCHMARKS
+    :param quick: Only run the smallest size
+    :return: A list of result dicts
+    """
+    function, sizes = BENCHMARKS[name]
+    if quick:
+        sizes = sizes[:1]
+    output = io.StringIO()  # some add-ons print a lot, which is not what we want to measure or see
+    try:
+        with redirect_stdout(output):
+            rows = function(sizes)
+    except Exception as e:
+        traceback.print_exc()
+        return [{"benchmark": name, "error": f"{type(e).__name__}: {e}"}]
+    report(name, rows)
+    return [{"benchmark": name, "label": label, "size": size, "seconds": seconds} for label, size, seconds in rows]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="suite.py", description="Benchmark all add-ons")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--quick", action="store_true", help="only run the smallest size of each benchmark")
+    parser.add_argument("--output", default="results.json", help="the JSON file to write")
+    args = parser.parse_args(script_arguments())
+
+    results = []
+    for name in args.only:
+        results.extend(run(name, args.quick))
+    write_results(args.output, results)
+    failed = [result["benchmark"] for result in results if "error" in result]
+    print(f"\nresults written to {args.output}" + (f", failed: {', '.join(failed)}" if failed else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+A headless stand-in for blf.
+
+Every call is recorded as ("blf", function name, ...); drawn text as
+("blf", "draw", text).
+"""
+
+import headless_recorder
+
+SHADOW = 1 << 2
+ROTATION = 1 << 0
+CLIPPING = 1 << 1
+WORD_WRAP = 1 << 7
+
+
+def _function(name):
+    def function(font_id, *args):
+        headless_recorder.record("blf", name, *args)
+
+    function.__name__ = name
+    return function
+
+
+position = _function("position")
+size = _function("size")
+color = _function("color")
+enable = _function("enable")
+disable = _function("disable")
+shadow = _function("shadow")
+shadow_offset = _function("shadow_offset")
+rotation = _function("rotation")
+clipping = _function("clipping")
+draw = _function("draw")
+
+
+def dimensions(font_id, text):
+    return (len(text) * 7.0, 12.0)
+
+
+def load(filepath):
+    return 1
@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+A headless stand-in for bmesh.
+
+Only vertices and edges, with the skin and deform layers, are supported.
+from_mesh() and to_mesh() are recorded as ("bmesh", function name, number of vertices).
+"""
+
+import headless_recorder
+from mathutils import Vector
+
+
+class BMVertSkin:
+    def __init__(self, radius=(0.25, 0.25), use_root=False, use_loose=False):
+        self.radius = Vector(radius)
+        self.use_root = use_root
+        self.use_loose = use_loose
+
+
+class BMVert:
+    def __init__(self, co):
+        self.co = Vector(co)
+        self.index = -1
+        self.link_edges = []
+        self.is_valid = True
+        self._layers = {}
+
+    def __getitem__(self, layer):
+        return self._layers.setdefault(layer, BMVertSkin() if layer == "skin" else {})
+
+    def __setitem__(self, layer, value):
+        self._layers[layer] = value
+
+
+class BMEdge:
+    def __init__(self, verts):
+        self.verts = tuple(verts)
+        self.index = -1
+        self.is_valid = True
+
+    def other_vert(self, vert):
+        a, b = self.verts
+        return b if vert is a else a if vert is b else None
+
+
+class _LayerCollection:
+    def __init__(self, name):
+        self._name = name
+        self.active = None
+
+    def verify(self):
+        self.active = self._name
+        return self._name
+
+
+class _VertLayers:
+    def __init__(self):
+        self.skin = _LayerCollection("skin")
+        self.deform = _LayerCollection("deform")
+
+
+class BMVertSeq(list):
+    def __init__(self):
+        super().__init__()
+        self.layers = _VertLayers()
+
+    def new(self, co=(0.0, 0.0, 0.0), example=None):
+        vert = BMVert(co)
+        self.append(vert)
+        return vert
+
+    def remove(self, vert):
+        for edge in list(vert.link_edges):
+            self._bm.edges.remove(edge)
+        vert.is_valid = False
+        super().remove(vert)
+
+    def ensure_lookup_table(self):
+        pass
+
+    def index_update(self):
+        for i, vert in enumerate(self):
+            vert.index = i
+
+
+class BMEdgeSeq(list):
+    def new(self, verts, example=None):
+        a, b = verts
+        if a is b or any(edge.other_vert(a) is b for edge in a.link_edges):
+            raise ValueError("edges.new(): edge exists or has duplicate vertices")
+        edge = BMEdge(verts)
+        a.link_edges.append(edge)
+        b.link_edges.append(edge)
+        self.append(edge)
+        return edge
+
+    def remove(self, edge):
+        for vert in edge.verts:
+            vert.link_edges.remove(edge)
+        edge.is_valid = False
+        super().remove(edge)
+
+    def ensure_lookup_table(self):
+        pass
+
+    def index_update(self):
+        for i, edge in enumerate(self):
+            edge.index = i
+
+
+class BMesh:
+    def __init__(self):
+        self.verts = BMVertSeq()
+        self.verts._bm = self
+        self.edges = BMEdgeSeq()
+
+    def from_mesh(self, mesh):
+        skin = mesh.skin_vertices[0].data if len(mesh.skin_vertices) else None
+        for i, v in enumerate(mesh.vertices):
+            vert = self.verts.new(v.co)
+            vert["deform"] = {element.group: element.weight for element in v.groups}
+            if skin is not None:
+                vert["skin"] = BMVertSkin(skin[i].radius, skin[i].use_root, skin[i].use_loose)
+        if skin is not None:
+            self.verts.layers.skin.verify()
+        for e in mesh.edges:
+            self.edges.new([self.verts[i] for i in e.vertices])
+        self.verts.index_update()
+        self.edges.index_update()
+        headless_recorder.record("bmesh", "from_mesh", len(self.verts))
+
+    def to_mesh(self, mesh):
+        import bpy
+
+        self.verts.index_update()
+        mesh.clear_geometry()
+        mesh.from_pydata([v.co for v in self.verts], [[v.index for v in e.verts] for e in self.edges], [])
+        for vert, v in zip(self.verts, mesh.vertices):
+            for group, weight in vert["deform"].items():
+                element = bpy.types.VertexGroupElement()
+                element._init(group=group, weight=weight)
+                v.groups.append(element)
+        mesh.skin_vertices.clear()
+        if self.verts.layers.skin.active:
+            layer = mesh.skin_vertices.new()
+            for vert, skin in zip(self.verts, layer.data):
+                skin._init(radius=Vector(vert["skin"].radius), use_root=vert["skin"].use_root, use_loose=vert["skin"].use_loose)
+        headless_recorder.record("bmesh", "to_mesh", len(self.verts))
+
+    def free(self):
+        pass
+
+
+def new(use_operators=True):
+    return BMesh()
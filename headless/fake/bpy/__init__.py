@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+A headless stand-in for bpy.
+
+This is not Blender: it implements just enough of the Python API to import
+the add-ons in this repository, register them and run their operators and
+draw handlers without a Blender binary or a GPU. Everything an add-on does
+through the API is recorded in headless_recorder.events.
+
+Call reset() to start with a fresh file that contains a single empty scene.
+"""
+
+from contextlib import contextmanager
+
+from . import types, props, utils, ops, app, msgbus, path
+
+
+class BlendData:
+    """bpy.data"""
+
+    def __init__(self):
+        self.objects = types.IDCollection(types.Object)
+        self.meshes = types.IDCollection(types.Mesh)
+        self.armatures = types.IDCollection(types.Armature)
+        self.curves = types.IDCollection(types.Curve)
+        self.actions = types.IDCollection(types.Action)
+        self.node_groups = types.IDCollection(types.NodeTree)
+        self.collections = types.IDCollection(types.Collection)
+        self.scenes = types.IDCollection(types.Scene)
+        self.screens = types.IDCollection(types.Screen)
+        self.materials = types.IDCollection(types.ID)
+        self.filepath = ""
+        self.is_dirty = False
+
+
+class Context:
+    """bpy.context"""
+
+    def __init__(self, data):
+        self._overrides = [{}]
+        self.scene = data.scenes.new("Scene")
+        self.screen = data.screens.new("Layout")
+        self.area = self.screen.areas[0]
+        self.region = self.area.regions[0]
+        self.space_data = self.area.spaces[0]
+        self.preferences = _preferences  # add-on preferences survive a reset, just like in Blender
+        self.window_manager = types.WindowManager()
+        self.window = None
+
+    def __getattribute__(self, name):
+        if not name.startswith("_"):
+            overrides = object.__getattribute__(self, "_overrides")[-1]
+            if name in overrides:
+                return overrides[name]
+        return object.__getattribute__(self, name)
+
+    @property
+    def view_layer(self):
+        return self.scene.view_layers[0]
+
+    @property
+    def region_data(self):
+        return self.space_data.region_3d
+
+    @property
+    def collection(self):
+        return self.scene.collection
+
+    @property
+    def active_object(self):
+        return self.view_layer.objects.active
+
+    @property
+    def object(self):
+        return self.active_object
+
+    @property
+    def selected_objects(self):
+        return list(self.view_layer.objects.selected)
+
+    @property
+    def visible_objects(self):
+        return [ob for ob in self.view_layer.objects if ob.visible_get()]
+
+    @property
+    def mode(self):
+        ob = self.active_object
+        if ob is None or ob.mode == "OBJECT":
+            return "OBJECT"
+        if ob.mode == "EDIT":
+            return f"EDIT_{ob.type}"
+        return ob.mode
+
+    def evaluated_depsgraph_get(self):
+        return types.Depsgraph(self.scene, self.view_layer)
+
+    @contextmanager
+    def temp_override(self, **keywords):
+        self._overrides.append({**self._overrides[-1], **keywords})
+        try:
+            yield self
+        finally:
+            self._overrides.pop()
+
+    def copy(self):
+        return {name: getattr(self, name) for name in ("scene", "view_layer", "active_object", "area", "region")}
+
+
+_preferences = types.Preferences()
+data = None
+context = None
+
+
+def reset():
+    """Replace bpy.data and bpy.context by a new file with a single empty scene."""
+    global data, context
+    data = BlendData()
+    context = Context(data)
+    msgbus._subscriptions.clear()
+    return data, context
+
+
+reset()
@@ -0,0 +1,15 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""bpy.app: version information, handlers and timers."""
+
+import tempfile
+
+from . import handlers, timers
+
+version = (5, 0, 0)
+version_string = "5.0.0 (headless)"
+background = True
+binary_path = ""
+tempdir = tempfile.gettempdir()
@@ -0,0 +1,26 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+bpy.app.handlers
+
+Handlers are only called when the harness (or Scene.frame_set()) calls them.
+"""
+
+depsgraph_update_pre = []
+depsgraph_update_post = []
+frame_change_pre = []
+frame_change_post = []
+load_pre = []
+load_post = []
+save_pre = []
+save_post = []
+undo_post = []
+redo_post = []
+
+
+def persistent(function):
+    """Mark a handler to be kept when a new file is loaded."""
+    function._bpy_persistent = True
+    return function
@@ -0,0 +1,30 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+bpy.app.timers
+
+Timers are never called by themselves, call run() to call each of them once.
+"""
+
+registered = []
+
+
+def register(function, first_interval=0, persistent=False):
+    registered.append(function)
+
+
+def unregister(function):
+    registered.remove(function)
+
+
+def is_registered(function):
+    return function in registered
+
+
+def run():
+    """Call every timer once and drop the ones that return None."""
+    for function in list(registered):
+        if function() is None and function in registered:
+            registered.remove(function)
@@ -0,0 +1,31 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+bpy.msgbus
+
+Nothing publishes automatically: call publish_rna() with the same key an
+add-on subscribed to, to simulate a change made in the user interface.
+"""
+
+import headless_recorder
+
+_subscriptions = []
+
+
+def subscribe_rna(key, owner, args, notify, options=set()):
+    _subscriptions.append((key, owner, tuple(args), notify))
+    headless_recorder.record("msgbus", "subscribe", repr(key))
+
+
+def clear_by_owner(owner):
+    _subscriptions[:] = [s for s in _subscriptions if s[1] is not owner]
+    headless_recorder.record("msgbus", "clear_by_owner")
+
+
+def publish_rna(key):
+    headless_recorder.record("msgbus", "publish", repr(key))
+    for subscribed, owner, args, notify in list(_subscriptions):
+        if subscribed == key:
+            notify(*args)
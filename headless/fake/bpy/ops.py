@@ -0,0 +1,330 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+bpy.ops
+
+Registered operators are called just like Blender does: poll() first
+(a RuntimeError if it fails), then invoke() or execute(). A handful of
+built-in operators the add-ons rely on are simulated below; any other
+built-in operator is only recorded and returns {'FINISHED'}.
+
+Every call is recorded as ("op", "category.name", keyword arguments).
+"""
+
+from math import sin, cos, pi
+
+import headless_recorder
+from mathutils import Vector
+
+from . import types, utils
+
+_EXECUTION_CONTEXTS = {"INVOKE_DEFAULT", "EXEC_DEFAULT", "INVOKE_REGION_WIN", "EXEC_REGION_WIN"}
+
+
+class Event:
+    """The event passed to invoke() and modal()."""
+
+    def __init__(self, type="NONE", value="NOTHING", mouse_region_x=0, mouse_region_y=0, shift=False, ctrl=False, alt=False):
+        self.type = type
+        self.value = value
+        self.mouse_region_x = mouse_region_x
+        self.mouse_region_y = mouse_region_y
+        self.mouse_x = mouse_region_x
+        self.mouse_y = mouse_region_y
+        self.shift = shift
+        self.ctrl = ctrl
+        self.alt = alt
+
+
+class _BPyOpsSubModOp:
+    """A callable operator, named like the class in Blender's own bpy/ops.py."""
+
+    def __init__(self, category, name):
+        self.idname = f"{category}.{name}"
+
+    def idname_py(self):
+        return self.idname
+
+    def __repr__(self):
+        return f"bpy.ops.{self.idname}()"
+
+    def _registered(self):
+        return utils.registered.get(self.idname)
+
+    def poll(self, execution_context="EXEC_DEFAULT"):
+        import bpy
+
+        cls = self._registered()
+        if cls is None:
+            return True
+        return bool(cls.poll(bpy.context)) if hasattr(cls, "poll") else True
+
+    def __call__(self, *args, **keywords):
+        import bpy
+
+        execution_context = args[0] if args and args[0] in _EXECUTION_CONTEXTS else "EXEC_DEFAULT"
+        headless_recorder.record("op", self.idname, keywords)
+        cls = self._registered()
+        if cls is not None:
+            return self._run(cls, bpy.context, execution_context, keywords)
+        builtin = _BUILTIN.get(self.idname)
+        if builtin is None:
+            return {"FINISHED"}
+        return builtin(bpy.context, **keywords)
+
+    def _run(self, cls, context, execution_context, keywords):
+        if hasattr(cls, "poll") and not cls.poll(context):
+            raise RuntimeError(f"Operator bpy.ops.{self.idname}.poll() failed, context is incorrect")
+        operator = cls()
+        for name, value in keywords.items():
+            setattr(operator, name, value)
+        operator._set_by_caller = set(keywords)
+        if execution_context.startswith("INVOKE") and hasattr(cls, "invoke"):
+            result = operator.invoke(context, Event())
+        else:
+            result = operator.execute(context)
+        for flag, message in operator.__dict__.get("_reports", ()):
+            if "ERROR" in flag:
+                raise RuntimeError(f"Error: {message}")
+        return result
+
+
+class _Category:
+    def __init__(self, name):
+        self.name = name
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _BPyOpsSubModOp(self.name, name)
+
+
+def __getattr__(name):
+    if name.startswith("_"):
+        raise AttributeError(name)
+    return _Category(name)
+
+
+# simulated built-in operators
+
+
+def _active(context, type=None):
+    ob = context.active_object
+    if ob is None or (type is not None and ob.type != type):
+        raise RuntimeError("Operator poll() failed, context is incorrect")
+    return ob
+
+
+def object_mode_set(context, mode="OBJECT", toggle=False):
+    ob = _active(context)
+    if ob.mode == mode:
+        return {"FINISHED"}
+    if ob.type == "ARMATURE":
+        if ob.mode == "EDIT":
+            ob.data._exit_edit_mode()
+            ob._sync_pose()
+        if mode == "EDIT":
+            ob.data._enter_edit_mode()
+    elif mode == "POSE":
+        raise TypeError("bpy_struct: item.attr = val: enum \"POSE\" not found in this context")
+    ob._init(mode=mode)
+    return {"FINISHED"}
+
+
+def object_select_all(context, action="TOGGLE"):
+    objects = list(context.view_layer.objects)
+    if action == "TOGGLE":
+        action = "DESELECT" if any(ob.select_get() for ob in objects) else "SELECT"
+    for ob in objects:
+        ob._select = action == "SELECT" if action != "INVERT" else not ob._select
+    return {"FINISHED"}
+
+
+def object_delete(context, use_global=False, confirm=True):
+    import bpy
+
+    for ob in context.selected_objects:
+        bpy.data.objects.remove(ob)
+    return {"FINISHED"}
+
+
+def object_parent_set(context, type="OBJECT", keep_transform=False):
+    parent = _active(context)
+    for child in context.selected_objects:
+        if child is parent:
+            continue
+        child._init(parent=parent, matrix_parent_inverse=parent.matrix_world.inverted())
+        if type == "ARMATURE_AUTO" and child.type == "MESH":
+            _automatic_weights(child, parent)
+    return {"FINISHED"}
+
+
+def _automatic_weights(ob, armature):
+    """A crude stand-in for automatic weights: every vertex belongs to the nearest deforming bone."""
+    modifier = ob.modifiers.new(name="Armature", type="ARMATURE")
+    modifier.object = armature
+    bones = [bone for bone in armature.data.bones if bone.use_deform]
+    groups = [ob.vertex_groups.new(name=bone.name) for bone in bones]
+    if not bones:
+        return
+    to_armature = armature.matrix_world.inverted() @ ob.matrix_world
+    for v in ob.data.vertices:
+        co = to_armature @ v.co
+        nearest = min(range(len(bones)), key=lambda i: _segment_distance(co, bones[i].head_local, bones[i].tail_local))
+        groups[nearest].add([v.index], 1.0, "REPLACE")
+
+
+def _segment_distance(p, a, b):
+    ab = b - a
+    t = 0.0 if ab.length_squared == 0 else max(0.0, min(1.0, (p - a).dot(ab) / ab.length_squared))
+    return (p - (a + ab * t)).length
+
+
+def object_hook_add_newob(context, center=False, bone=""):
+    """Hook the selected control points of the curve in edit mode to a new empty."""
+    import bpy
+
+    curve = _active(context, "CURVE")
+    if curve.mode != "EDIT":
+        raise RuntimeError("Operator bpy.ops.object.hook_add_newob.poll() failed, context is incorrect")
+    indices, coords = [], []
+    offset = 0
+    for spline in curve.data.splines:
+        # a Bezier point counts as three vertices: left handle, control point, right handle
+        for j, bp in enumerate(spline.bezier_points):
+            for k, (selected, co) in enumerate(
+                ((bp.select_left_handle, bp.handle_left), (bp.select_control_point, bp.co), (bp.select_right_handle, bp.handle_right))
+            ):
+                if selected:
+                    indices.append(offset + 3 * j + k)
+                    coords.append(co)
+        offset += 3 * len(spline.bezier_points)
+    if not indices:
+        raise RuntimeError("Error: Requires selected vertices or active vertex group")
+    local = sum(coords, Vector()) / len(coords)
+    empty = bpy.data.objects.new("Empty", None)
+    context.collection.objects.link(empty)
+    empty.location = curve.matrix_world @ local
+    modifier = curve.modifiers.new(name=f"Hook-{empty.name}", type="HOOK")
+    modifier._init(object=empty, center=local, _indices=indices)
+    modifier._init(matrix_inverse=empty.matrix_world.inverted() @ curve.matrix_world)
+    return {"FINISHED"}
+
+
+def object_skin_root_mark(context):
+    ob = _active(context, "MESH")
+    mesh = ob.data
+    if not len(mesh.skin_vertices):
+        raise RuntimeError("Error: Mesh has no skin vertex data")
+    for v, skin in zip(mesh.vertices, mesh.skin_vertices[0].data):
+        if v.select:
+            skin.use_root = True
+    return {"FINISHED"}
+
+
+def mesh_primitive_circle_add(
+    context, vertices=32, radius=1.0, fill_type="NOTHING", calc_uvs=True, enter_editmode=False, location=(0, 0, 0), **keywords
+):
+    import bpy
+
+    mesh = bpy.data.meshes.new("Circle")
+    coords = [(-radius * sin(2 * pi * i / vertices), radius * cos(2 * pi * i / vertices), 0.0) for i in range(vertices)]
+    edges = [(i, (i + 1) % vertices) for i in range(vertices)]
+    faces = []
+    if fill_type == "NGON":
+        faces = [list(range(vertices))]
+    elif fill_type == "TRIFAN":
+        coords.append((0.0, 0.0, 0.0))
+        faces = [(vertices, i, (i + 1) % vertices) for i in range(vertices)]
+    mesh.from_pydata(coords, edges, faces)
+    if calc_uvs and len(mesh.polygons):
+        _planar_uvs(mesh)
+    ob = bpy.data.objects.new("Circle", mesh)
+    context.collection.objects.link(ob)
+    ob.location = location
+    for other in context.view_layer.objects:
+        other._select = False
+    ob._select = True
+    context.view_layer.objects.active = ob
+    for v in mesh.vertices:
+        v.select = True
+    if enter_editmode:
+        ob._init(mode="EDIT")
+    return {"FINISHED"}
+
+
+def _planar_uvs(mesh):
+    if not len(mesh.uv_layers):
+        mesh.uv_layers.new(name="UVMap")
+    xs = [v.co.x for v in mesh.vertices]
+    ys = [v.co.y for v in mesh.vertices]
+    size = max(max(xs) - min(xs), max(ys) - min(ys)) or 1.0
+    for loop, uv in zip(mesh.loops, mesh.uv_layers.active.data):
+        co = mesh.vertices[loop.vertex_index].co
+        uv.uv[:] = ((co.x - min(xs)) / size, (co.y - min(ys)) / size)
+
+
+def _edit_mesh(context):
+    ob = _active(context, "MESH")
+    if ob.mode != "EDIT":
+        raise RuntimeError("Operator poll() failed, context is incorrect")
+    return ob.data
+
+
+def mesh_select_all(context, action="TOGGLE"):
+    mesh = _edit_mesh(context)
+    if action == "TOGGLE":
+        action = "DESELECT" if any(v.select for v in mesh.vertices) else "SELECT"
+    for v in mesh.vertices:
+        v.select = action == "SELECT" if action != "INVERT" else not v.select
+    return {"FINISHED"}
+
+
+def mesh_select_nth(context, skip=1, nth=1, offset=0):
+    mesh = _edit_mesh(context)
+    selected = [v for v in mesh.vertices if v.select]
+    for i, v in enumerate(selected):
+        v.select = (i + offset) % (skip + nth) >= nth
+    return {"FINISHED"}
+
+
+def mesh_select_mode(context, type="VERT", use_extend=False, use_expand=False, action="TOGGLE"):
+    _edit_mesh(context)
+    mode = context.scene.tool_settings.mesh_select_mode
+    mode[:] = [type == "VERT", type == "EDGE", type == "FACE"]
+    return {"FINISHED"}
+
+
+def transform_resize(context, value=(1, 1, 1), **keywords):
+    """Scale the selected vertices around their median point."""
+    mesh = _edit_mesh(context)
+    selected = [v for v in mesh.vertices if v.select]
+    if not selected:
+        return {"CANCELLED"}
+    median = sum((v.co for v in selected), Vector()) / len(selected)
+    for v in selected:
+        v.co[:] = median + (v.co - median) * Vector(value)
+    return {"FINISHED"}
+
+
+def uv_smart_project(context, **keywords):
+    _planar_uvs(_edit_mesh(context))
+    return {"FINISHED"}
+
+
+_BUILTIN = {
+    "object.mode_set": object_mode_set,
+    "object.select_all": object_select_all,
+    "object.delete": object_delete,
+    "object.parent_set": object_parent_set,
+    "object.hook_add_newob": object_hook_add_newob,
+    "object.skin_root_mark": object_skin_root_mark,
+    "mesh.primitive_circle_add": mesh_primitive_circle_add,
+    "mesh.select_all": mesh_select_all,
+    "mesh.select_nth": mesh_select_nth,
+    "mesh.select_mode": mesh_select_mode,
+    "transform.resize": transform_resize,
+    "uv.smart_project": uv_smart_project,
+}
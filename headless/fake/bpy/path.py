@@ -0,0 +1,30 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""bpy.path, only the functions that do not depend on a saved .blend file."""
+
+import os
+
+
+def abspath(path, start=None, library=None):
+    """Blender paths starting with // are relative to the .blend file; in an unsaved file they stay relative, like in Blender."""
+    if path.startswith("//"):
+        import bpy
+
+        return os.path.join(start or os.path.dirname(bpy.data.filepath), path[2:])
+    return path
+
+
+def basename(path):
+    return os.path.basename(path[2:] if path.startswith("//") else path)
+
+
+def ensure_ext(filepath, ext, case_sensitive=False):
+    if filepath.lower().endswith(ext.lower()):
+        return filepath
+    return filepath + ext
+
+
+def clean_name(name, replace="_"):
+    return "".join(c if c.isascii() and (c.isalnum() or c in "-.") else replace for c in name)
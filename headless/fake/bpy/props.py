@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Property definitions.
+
+Each function returns a descriptor. When a class is registered (or when a
+property is assigned to a class like bpy.types.Scene.show_distances = ...),
+the descriptor is bound to an attribute name and from then on behaves like
+a Blender property: it has a default, clamps to its hard limits and calls
+its update function when set.
+"""
+
+import headless_recorder
+
+
+class _PropertyDeferred:
+    def __init__(self, function, default, keywords):
+        self.function = function
+        self.keywords = keywords
+        self.default = keywords.get("default", default)
+        self.attr = None
+
+    def __repr__(self):
+        return f"<_PropertyDeferred, {self.function}, {self.keywords}>"
+
+    def __set_name__(self, owner, name):
+        self.attr = name
+
+    def _default(self):
+        default = self.default
+        if self.function == "EnumProperty" and "default" not in self.keywords:
+            items = self.keywords.get("items", ())
+            if callable(items):
+                return ""
+            default = items[0][0] if items else ""
+        if isinstance(default, list):
+            return list(default)
+        if self.function == "CollectionProperty":
+            return _Collection(self.keywords.get("type"))
+        return default
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        values = instance.__dict__.setdefault("_properties", {})
+        if self.attr not in values:
+            values[self.attr] = self._default()
+        return values[self.attr]
+
+    def __set__(self, instance, value):
+        if self.function in ("IntProperty", "FloatProperty"):
+            value = min(max(value, self.keywords.get("min", value)), self.keywords.get("max", value))
+        if self.function in ("FloatVectorProperty", "IntVectorProperty", "BoolVectorProperty"):
+            value = tuple(value)
+        instance.__dict__.setdefault("_properties", {})[self.attr] = value
+        headless_recorder.record("set", type(instance).__name__, self.attr)
+        update = self.keywords.get("update")
+        if update is not None:
+            import bpy
+
+            update(instance, bpy.context)
+
+
+class _Collection(list):
+    """The value of a CollectionProperty."""
+
+    def __init__(self, type):
+        super().__init__()
+        self.type = type
+
+    def add(self):
+        item = self.type()
+        self.append(item)
+        return item
+
+    def remove(self, index):
+        del self[index]
+
+
+def BoolProperty(**keywords):
+    return _PropertyDeferred("BoolProperty", False, keywords)
+
+
+def IntProperty(**keywords):
+    return _PropertyDeferred("IntProperty", 0, keywords)
+
+
+def FloatProperty(**keywords):
+    return _PropertyDeferred("FloatProperty", 0.0, keywords)
+
+
+def StringProperty(**keywords):
+    return _PropertyDeferred("StringProperty", "", keywords)
+
+
+def EnumProperty(**keywords):
+    return _PropertyDeferred("EnumProperty", "", keywords)
+
+
+def FloatVectorProperty(**keywords):
+    size = keywords.get("size", 3)
+    return _PropertyDeferred("FloatVectorProperty", (0.0,) * size, keywords)
+
+
+def IntVectorProperty(**keywords):
+    size = keywords.get("size", 3)
+    return _PropertyDeferred("IntVectorProperty", (0,) * size, keywords)
+
+
+def BoolVectorProperty(**keywords):
+    size = keywords.get("size", 3)
+    return _PropertyDeferred("BoolVectorProperty", (False,) * size, keywords)
+
+
+def PointerProperty(**keywords):
+    return _PropertyDeferred("PointerProperty", None, keywords)
+
+
+def CollectionProperty(**keywords):
+    return _PropertyDeferred("CollectionProperty", None, keywords)
@@ -0,0 +1,1368 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+The data model: objects, meshes, armatures, curves and everything around them.
+
+Each class only has the attributes and methods the add-ons in this repository
+use. Attribute writes on any struct after it is created are recorded as
+("set", class name, attribute) events, foreach_set() calls as
+("foreach_set", item class name, attribute, number of items).
+"""
+
+import headless_recorder
+from mathutils import Vector, Matrix
+
+from .props import _PropertyDeferred
+
+
+class _RNAMeta(type):
+    """Make properties assigned to a class after its creation work, e.g. Scene.show_distances = BoolProperty()"""
+
+    def __setattr__(cls, name, value):
+        if isinstance(value, _PropertyDeferred):
+            value.__set_name__(cls, name)
+        super().__setattr__(name, value)
+
+
+class bpy_struct(metaclass=_RNAMeta):
+    def __setattr__(self, name, value):
+        # properties record their own writes
+        if not name.startswith("_") and not isinstance(getattr(type(self), name, None), _PropertyDeferred):
+            headless_recorder.record("set", type(self).__name__, name)
+        object.__setattr__(self, name, value)
+
+    def _init(self, **attributes):
+        """Set attributes without recording them."""
+        self.__dict__.update(attributes)
+
+    # custom properties
+    def __getitem__(self, key):
+        return self.__dict__.setdefault("_id_properties", {})[key]
+
+    def __setitem__(self, key, value):
+        headless_recorder.record("set", type(self).__name__, f'["{key}"]')
+        self.__dict__.setdefault("_id_properties", {})[key] = value
+
+    def __delitem__(self, key):
+        del self.__dict__.setdefault("_id_properties", {})[key]
+
+    def __contains__(self, key):
+        return key in self.__dict__.get("_id_properties", {})
+
+    def get(self, key, default=None):
+        return self.__dict__.get("_id_properties", {}).get(key, default)
+
+    def keys(self):
+        return self.__dict__.get("_id_properties", {}).keys()
+
+    def path_resolve(self, path, coerce=True):
+        return getattr(self, path)
+
+    def as_pointer(self):
+        return id(self)
+
+
+def _flatten(value, out):
+    if isinstance(value, Matrix):
+        # Blender stores matrices column by column
+        for col in value.col:
+            out.extend(col)
+    elif isinstance(value, (str, bytes)):
+        raise TypeError("foreach_get/set does not support strings")
+    elif hasattr(value, "__len__"):
+        for v in value:
+            _flatten(v, out)
+    else:
+        out.append(value)
+
+
+def _unflatten(template, values):
+    if isinstance(template, Matrix):
+        n = len(template)
+        return Matrix([[values[j * n + i] for j in range(n)] for i in range(n)])
+    if isinstance(template, Vector):
+        return Vector(values)
+    if isinstance(template, (tuple, list)):
+        return type(template)(values)
+    if isinstance(template, bool):
+        return bool(values[0])
+    if isinstance(template, int):
+        return int(values[0])
+    return float(values[0])
+
+
+class bpy_prop_collection(list):
+    """A list with the extra methods of a Blender collection property."""
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for item in self:
+                if getattr(item, "name", None) == key:
+                    return item
+            raise KeyError(f'bpy_prop_collection[key]: key "{key}" not found')
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return any(getattr(item, "name", None) == key for item in self)
+        return any(item is key for item in self)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except (KeyError, IndexError):
+            return default
+
+    def find(self, key):
+        for i, item in enumerate(self):
+            if getattr(item, "name", None) == key:
+                return i
+        return -1
+
+    def keys(self):
+        return [item.name for item in self]
+
+    def values(self):
+        return list(self)
+
+    def items(self):
+        return [(item.name, item) for item in self]
+
+    def foreach_get(self, attr, seq):
+        flat = []
+        for item in self:
+            _flatten(getattr(item, attr), flat)
+        if len(flat) != len(seq):
+            raise RuntimeError(
+                f"internal error setting the array: expected {len(flat)} items, got {len(seq)}"
+            )
+        seq[:] = flat
+        headless_recorder.record("foreach_get", self._item_name(), attr, len(self))
+
+    def foreach_set(self, attr, seq):
+        if not len(self):
+            return
+        template = getattr(self[0], attr)
+        size = len(seq) // len(self)
+        if size * len(self) != len(seq):
+            raise RuntimeError("internal error setting the array: size mismatch")
+        values = [float(v) if not isinstance(v, bool) else v for v in seq]
+        for i, item in enumerate(self):
+            value = _unflatten(template, values[i * size : (i + 1) * size])
+            if isinstance(getattr(item, attr), Vector):
+                getattr(item, attr)[:] = value  # arrays are updated in place
+            else:
+                object.__setattr__(item, attr, value)
+        headless_recorder.record("foreach_set", self._item_name(), attr, len(self))
+
+    def _item_name(self):
+        return type(self[0]).__name__ if len(self) else "None"
+
+
+class bpy_prop_array(list):
+    pass
+
+
+# ID data
+
+
+class ID(bpy_struct):
+    def __init__(self, name=""):
+        self._init(name=name, users=0, use_fake_user=False, is_evaluated=False, library=None)
+
+    @property
+    def original(self):
+        return self
+
+    @property
+    def session_uid(self):
+        return id(self)
+
+    def evaluated_get(self, depsgraph):
+        return self
+
+    def copy(self):
+        clone = type(self).__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        return clone
+
+    def update_tag(self, refresh=set()):
+        headless_recorder.record("update_tag", type(self).__name__, self.name)
+
+    def __repr__(self):
+        return f"bpy.data.{type(self).__name__.lower()}s['{self.name}']"
+
+
+class IDCollection(bpy_prop_collection):
+    def __init__(self, factory):
+        super().__init__()
+        self._factory = factory
+
+    def _unique(self, name):
+        names = {item.name for item in self}
+        if name not in names:
+            return name
+        i = 1
+        while f"{name}.{i:03d}" in names:
+            i += 1
+        return f"{name}.{i:03d}"
+
+    def new(self, name, *args, **kwargs):
+        item = self._factory(self._unique(name), *args, **kwargs)
+        self.append(item)
+        headless_recorder.record("new", type(item).__name__, item.name)
+        return item
+
+    def remove(self, item, do_unlink=True):
+        for i, other in enumerate(self):
+            if other is item:
+                del self[i]
+                headless_recorder.record("remove", type(item).__name__, item.name)
+                if isinstance(item, Object):
+                    for collection in _all_collections():
+                        if item in collection.objects:
+                            collection.objects._unlink(item)
+                    item._init(_removed=True)
+                return
+        raise ReferenceError("item not in collection")
+
+
+def _all_collections():
+    import bpy
+
+    return [scene.collection for scene in bpy.data.scenes] + list(bpy.data.collections)
+
+
+class Mesh(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self._init(
+            vertices=MeshVertices(),
+            edges=MeshEdges(),
+            polygons=MeshPolygons(),
+            loops=bpy_prop_collection(),
+            uv_layers=UVLoopLayers(self),
+            skin_vertices=MeshSkinVertexLayers(self),
+            attributes=bpy_prop_collection(),
+            materials=bpy_prop_collection(),
+        )
+
+    def from_pydata(self, vertices, edges, faces, shade_flat=True):
+        self.vertices.add(len(vertices))
+        for v, co in zip(self.vertices, vertices):
+            v.co[:] = tuple(co)
+        for a, b in edges:
+            self.edges._new((a, b))
+        for face in faces:
+            self.polygons._new(self, list(face))
+        edge_keys = {tuple(sorted(e.vertices)) for e in self.edges}
+        for polygon in self.polygons:
+            for key in polygon.edge_keys:
+                if key not in edge_keys:
+                    edge_keys.add(key)
+                    self.edges._new(key)
+        headless_recorder.record("from_pydata", "Mesh", len(vertices), len(edges), len(faces))
+
+    def update(self, calc_edges=False):
+        headless_recorder.record("update", "Mesh", self.name)
+
+    def validate(self, verbose=False):
+        return False
+
+    def clear_geometry(self):
+        self._init(vertices=MeshVertices(), edges=MeshEdges(), polygons=MeshPolygons(), loops=bpy_prop_collection())
+
+    def transform(self, matrix):
+        for v in self.vertices:
+            v.co[:] = matrix @ v.co
+
+
+class MeshVertex(bpy_struct):
+    def __init__(self, index):
+        self._init(index=index, co=Vector(), select=False, hide=False, groups=bpy_prop_collection())
+
+
+class MeshVertices(bpy_prop_collection):
+    def add(self, count):
+        start = len(self)
+        self.extend(MeshVertex(start + i) for i in range(count))
+
+
+class MeshEdge(bpy_struct):
+    def __init__(self, index, vertices):
+        self._init(index=index, vertices=tuple(vertices), select=False, hide=False)
+
+    @property
+    def key(self):
+        return tuple(sorted(self.vertices))
+
+
+class MeshEdges(bpy_prop_collection):
+    def _new(self, vertices):
+        self.append(MeshEdge(len(self), vertices))
+
+    def add(self, count):
+        for _ in range(count):
+            self._new((0, 0))
+
+
+class MeshLoop(bpy_struct):
+    def __init__(self, index, vertex_index):
+        self._init(index=index, vertex_index=vertex_index)
+
+
+class MeshPolygon(bpy_struct):
+    def __init__(self, index, vertices, loop_start):
+        self._init(index=index, vertices=tuple(vertices), loop_start=loop_start, loop_total=len(vertices), select=False)
+
+    @property
+    def edge_keys(self):
+        v = self.vertices
+        return [tuple(sorted((v[i], v[(i + 1) % len(v)]))) for i in range(len(v))]
+
+
+class MeshPolygons(bpy_prop_collection):
+    def _new(self, mesh, vertices):
+        start = len(mesh.loops)
+        mesh.loops.extend(MeshLoop(start + i, v) for i, v in enumerate(vertices))
+        self.append(MeshPolygon(len(self), vertices, start))
+
+
+class MeshUVLoop(bpy_struct):
+    def __init__(self):
+        self._init(uv=Vector((0.0, 0.0)), select=False)
+
+
+class MeshUVLoopLayer(bpy_struct):
+    def __init__(self, name, mesh):
+        self._init(name=name, data=bpy_prop_collection(MeshUVLoop() for _ in mesh.loops), active=False)
+
+
+class UVLoopLayers(bpy_prop_collection):
+    def __init__(self, mesh):
+        super().__init__()
+        self._mesh = mesh
+        self.active = None
+
+    def new(self, name="UVMap", do_init=True):
+        layer = MeshUVLoopLayer(name, self._mesh)
+        self.append(layer)
+        if self.active is None:
+            self.active = layer
+        return layer
+
+
+class MeshSkinVertex(bpy_struct):
+    def __init__(self):
+        self._init(radius=Vector((0.25, 0.25)), use_root=False, use_loose=False)
+
+
+class MeshSkinVertexLayer(bpy_struct):
+    def __init__(self, name, mesh):
+        self._init(name=name, data=bpy_prop_collection(MeshSkinVertex() for _ in mesh.vertices))
+
+
+class MeshSkinVertexLayers(bpy_prop_collection):
+    def __init__(self, mesh):
+        super().__init__()
+        self._mesh = mesh
+
+    def new(self, name="Skin"):
+        layer = MeshSkinVertexLayer(name, self._mesh)
+        self.append(layer)
+        return layer
+
+
+class EditBone(bpy_struct):
+    def __init__(self, name):
+        self._init(
+            name=name,
+            head=Vector(),
+            tail=Vector((0, 1, 0)),
+            roll=0.0,
+            parent=None,
+            use_connect=False,
+            use_deform=True,
+            select=False,
+        )
+
+    @property
+    def length(self):
+        return (self.tail - self.head).length
+
+
+class ArmatureEditBones(bpy_prop_collection):
+    def __init__(self, armature):
+        super().__init__()
+        self._armature = armature
+
+    def new(self, name):
+        if not self._armature._in_edit_mode:
+            raise RuntimeError("edit_bones can only be changed in edit mode")
+        names = {bone.name for bone in self}
+        unique, i = name, 1
+        while unique in names:
+            unique, i = f"{name}.{i:03d}", i + 1
+        bone = EditBone(unique)
+        self.append(bone)
+        return bone
+
+    def remove(self, bone):
+        for other in self:
+            if other.parent is bone:
+                other.parent = bone.parent
+        self[:] = [b for b in self if b is not bone]
+
+
+class Bone(bpy_struct):
+    def __init__(self, name, head, tail, parent):
+        self._init(
+            name=name,
+            head_local=Vector(head),
+            tail_local=Vector(tail),
+            parent=parent,
+            children=bpy_prop_collection(),
+            use_deform=True,
+            select=False,
+        )
+
+    @property
+    def length(self):
+        return (self.tail_local - self.head_local).length
+
+
+class Armature(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self._init(bones=bpy_prop_collection(), _edit_bones=None, _in_edit_mode=False, display_type="OCTAHEDRAL")
+
+    @property
+    def edit_bones(self):
+        if not self._in_edit_mode:
+            return ArmatureEditBones(self)  # empty outside edit mode, just like in Blender
+        return self._edit_bones
+
+    def _enter_edit_mode(self):
+        edit_bones = ArmatureEditBones(self)
+        mapping = {}
+        self._in_edit_mode = True
+        for bone in self.bones:
+            edit_bone = EditBone(bone.name)
+            edit_bone._init(head=bone.head_local.copy(), tail=bone.tail_local.copy(), parent=mapping.get(id(bone.parent)))
+            mapping[id(bone)] = edit_bone
+            edit_bones.append(edit_bone)
+        self._edit_bones = edit_bones
+
+    def _exit_edit_mode(self):
+        bones = bpy_prop_collection()
+        mapping = {}
+        for edit_bone in self._edit_bones:
+            bones.append(Bone(edit_bone.name, edit_bone.head, edit_bone.tail, None))
+            mapping[id(edit_bone)] = bones[-1]
+        for edit_bone, bone in zip(self._edit_bones, bones):
+            if edit_bone.parent is not None:
+                bone._init(parent=mapping[id(edit_bone.parent)])
+                bone.parent.children.append(bone)
+        self._init(bones=bones, _edit_bones=None, _in_edit_mode=False)
+
+
+class BezierSplinePoint(bpy_struct):
+    def __init__(self):
+        self._init(
+            co=Vector(),
+            handle_left=Vector(),
+            handle_right=Vector(),
+            handle_left_type="AUTO",
+            handle_right_type="AUTO",
+            select_control_point=False,
+            select_left_handle=False,
+            select_right_handle=False,
+            radius=1.0,
+            tilt=0.0,
+        )
+
+
+class SplineBezierPoints(bpy_prop_collection):
+    def add(self, count=1):
+        self.extend(BezierSplinePoint() for _ in range(count))
+
+
+class SplinePoint(bpy_struct):
+    def __init__(self):
+        self._init(co=Vector((0, 0, 0, 1)), select=False, radius=1.0, tilt=0.0)
+
+
+class SplinePoints(bpy_prop_collection):
+    def add(self, count=1):
+        self.extend(SplinePoint() for _ in range(count))
+
+
+class Spline(bpy_struct):
+    def __init__(self, type):
+        self._init(type=type, bezier_points=SplineBezierPoints(), points=SplinePoints(), use_cyclic_u=False)
+        if type == "BEZIER":
+            self.bezier_points.add(1)
+        else:
+            self.points.add(1)
+
+
+class CurveSplines(bpy_prop_collection):
+    def new(self, type):
+        spline = Spline(type)
+        self.append(spline)
+        return spline
+
+    def clear(self):
+        del self[:]
+
+
+class Curve(ID):
+    def __init__(self, name, type="CURVE"):
+        super().__init__(name)
+        self._init(splines=CurveSplines(), dimensions="3D", bevel_depth=0.0)
+
+
+class Modifier(bpy_struct):
+    def __init__(self, name, type):
+        self._init(name=name, type=type, show_viewport=True, show_render=True)
+        if type == "HOOK":
+            self._init(object=None, subtarget="", center=Vector(), matrix_inverse=Matrix.Identity(4), _indices=[], strength=1.0, falloff_type="NONE")
+        elif type in ("ARMATURE", "CURVE", "LATTICE"):
+            self._init(object=None, use_vertex_groups=True, use_bone_envelopes=False)
+        elif type == "NODES":
+            self._init(node_group=None)
+        elif type == "SKIN":
+            self._init(use_x_symmetry=True, branch_smoothing=0.0, use_smooth_shade=False)
+        elif type == "SUBSURF":
+            self._init(levels=1, render_levels=2)
+        elif type == "DECIMATE":
+            self._init(decimate_type="COLLAPSE", ratio=1.0)
+
+    def vertex_indices_set(self, indices):
+        self._indices = list(indices)
+
+    @property
+    def vertex_indices(self):
+        return tuple(self._indices)
+
+
+HookModifier = Modifier
+
+
+class ObjectModifiers(bpy_prop_collection):
+    def __init__(self, ob):
+        super().__init__()
+        self._object = ob
+
+    def new(self, name, type):
+        modifier = Modifier(name, type)
+        self.append(modifier)
+        data = self._object.data
+        if type == "SKIN" and isinstance(data, Mesh) and not len(data.skin_vertices):
+            # just like Blender, adding a skin modifier adds the skin layer and marks a root
+            layer = data.skin_vertices.new()
+            if len(layer.data):
+                layer.data[0].use_root = True
+        headless_recorder.record("new", "Modifier", type)
+        return modifier
+
+    def remove(self, modifier):
+        self[:] = [m for m in self if m is not modifier]
+
+    def clear(self):
+        del self[:]
+
+
+class Constraint(bpy_struct):
+    def __init__(self, type):
+        name = type.replace("_", " ").title()
+        self._init(name=name, type=type, target=None, subtarget="", head_tail=0.0, mute=False, influence=1.0)
+
+
+class ObjectConstraints(bpy_prop_collection):
+    def new(self, type):
+        constraint = Constraint(type)
+        self.append(constraint)
+        headless_recorder.record("new", "Constraint", type)
+        return constraint
+
+    def remove(self, constraint):
+        self[:] = [c for c in self if c is not constraint]
+
+    def clear(self):
+        del self[:]
+
+
+class VertexGroup(bpy_struct):
+    def __init__(self, name, index, ob):
+        self._init(name=name, index=index, _object=ob)
+
+    def add(self, index, weight, type):
+        mesh = self._object.data
+        for i in index:
+            groups = mesh.vertices[i].groups
+            for element in groups:
+                if element.group == self.index:
+                    element.weight = weight if type == "REPLACE" else element.weight + weight
+                    break
+            else:
+                element = VertexGroupElement()
+                element._init(group=self.index, weight=weight)
+                groups.append(element)
+
+    def remove(self, index):
+        for i in index:
+            groups = self._object.data.vertices[i].groups
+            groups[:] = [g for g in groups if g.group != self.index]
+
+    def weight(self, index):
+        for element in self._object.data.vertices[index].groups:
+            if element.group == self.index:
+                return element.weight
+        raise RuntimeError("Error: Vertex not in group")
+
+
+class VertexGroupElement(bpy_struct):
+    pass
+
+
+class VertexGroups(bpy_prop_collection):
+    def __init__(self, ob):
+        super().__init__()
+        self._object = ob
+
+    def new(self, name="Group"):
+        group = VertexGroup(name, len(self), self._object)
+        self.append(group)
+        return group
+
+
+class PoseBone(bpy_struct):
+    def __init__(self, bone):
+        self._init(name=bone.name, bone=bone, constraints=ObjectConstraints(), location=Vector(), matrix=Matrix.Identity(4))
+
+
+class Pose(bpy_struct):
+    def __init__(self):
+        self._init(bones=bpy_prop_collection())
+
+
+class ActionSlot(bpy_struct):
+    def __init__(self, id_type, name):
+        self._init(id_type=id_type, name=name, identifier=f"OB{name}")
+
+
+class ActionSlots(bpy_prop_collection):
+    def new(self, id_type, name):
+        slot = ActionSlot(id_type, name)
+        self.append(slot)
+        return slot
+
+
+class Keyframe(bpy_struct):
+    def __init__(self):
+        self._init(co=Vector((0.0, 0.0)), handle_left=Vector((0.0, 0.0)), handle_right=Vector((0.0, 0.0)), interpolation="BEZIER")
+
+
+class FCurveKeyframePoints(bpy_prop_collection):
+    def add(self, count):
+        self.extend(Keyframe() for _ in range(count))
+
+    def insert(self, frame, value, options=set()):
+        for point in self:
+            if point.co[0] == frame:
+                point.co[1] = value
+                return point
+        point = Keyframe()
+        point.co[:] = (frame, value)
+        self.append(point)
+        self.sort(key=lambda p: p.co[0])
+        return point
+
+    def clear(self):
+        del self[:]
+
+
+class FCurve(bpy_struct):
+    def __init__(self, data_path, index):
+        self._init(data_path=data_path, array_index=index, keyframe_points=FCurveKeyframePoints(), mute=False)
+
+    def update(self):
+        self.keyframe_points.sort(key=lambda p: p.co[0])
+
+    def evaluate(self, frame):
+        points = self.keyframe_points
+        if not points:
+            return 0.0
+        if frame <= points[0].co[0]:
+            return points[0].co[1]
+        for a, b in zip(points, points[1:]):
+            if a.co[0] <= frame <= b.co[0]:
+                t = (frame - a.co[0]) / ((b.co[0] - a.co[0]) or 1)
+                return a.co[1] + t * (b.co[1] - a.co[1])
+        return points[-1].co[1]
+
+
+class ChannelbagFCurves(bpy_prop_collection):
+    def find(self, data_path, index=0):
+        for fcurve in self:
+            if fcurve.data_path == data_path and fcurve.array_index == index:
+                return fcurve
+        return None
+
+    def new(self, data_path, index=0, group_name=""):
+        if self.find(data_path, index) is not None:
+            raise RuntimeError(f"F-Curve '{data_path}[{index}]' already exists")
+        fcurve = FCurve(data_path, index)
+        self.append(fcurve)
+        return fcurve
+
+
+class ActionChannelbag(bpy_struct):
+    def __init__(self, slot):
+        self._init(slot=slot, fcurves=ChannelbagFCurves())
+
+
+class Action(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self._init(slots=ActionSlots(), _channelbags={})
+
+
+class AnimData(bpy_struct):
+    def __init__(self):
+        self._init(action=None, action_slot=None)
+
+
+class NodeSocket(bpy_struct):
+    def __init__(self, name, identifier=None):
+        self._init(name=name, identifier=identifier or name, default_value=0.0, links=[])
+
+
+class NodeSockets(bpy_prop_collection):
+    """Sockets are created on first access, so any node type works."""
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for socket in self:
+                if socket.name == key:
+                    return socket
+            socket = NodeSocket(key)
+        else:
+            while len(self) <= key:
+                self.append(NodeSocket(f"Socket_{len(self)}"))
+            return super().__getitem__(key)
+        self.append(socket)
+        return socket
+
+
+class Node(bpy_struct):
+    def __init__(self, type):
+        self._init(bl_idname=type, name=type, inputs=NodeSockets(), outputs=NodeSockets(), location=(0, 0))
+
+
+class Nodes(bpy_prop_collection):
+    def new(self, type):
+        node = Node(type)
+        self.append(node)
+        return node
+
+
+class NodeLinks(bpy_prop_collection):
+    def new(self, output, input):
+        link = (output, input)
+        self.append(link)
+        return link
+
+
+class NodeTreeInterfaceSocket(bpy_struct):
+    def __init__(self, name, in_out, socket_type, identifier):
+        self._init(name=name, in_out=in_out, socket_type=socket_type, identifier=identifier, default_value=0, min_value=0, max_value=0)
+
+
+class NodeTreeInterface(bpy_struct):
+    def __init__(self):
+        self._init(items_tree=bpy_prop_collection())
+
+    def new_socket(self, name, in_out="INPUT", socket_type="NodeSocketFloat"):
+        socket = NodeTreeInterfaceSocket(name, in_out, socket_type, f"Socket_{len(self.items_tree)}")
+        self.items_tree.append(socket)
+        return socket
+
+
+class NodeTree(ID):
+    def __init__(self, name, type):
+        super().__init__(name)
+        self._init(bl_idname=type, nodes=Nodes(), links=NodeLinks(), interface=NodeTreeInterface(), is_modifier=False)
+
+
+GeometryNodeTree = NodeTree
+
+
+class Object(ID):
+    def __getattribute__(self, name):
+        # just like in Blender, a removed object can still be compared and hashed, but not used
+        if not name.startswith("_") and object.__getattribute__(self, "__dict__").get("_removed"):
+            raise ReferenceError("StructRNA of type Object has been removed")
+        return object.__getattribute__(self, name)
+
+    def __init__(self, name, data):
+        super().__init__(name)
+        if data is None:
+            kind = "EMPTY"
+        else:
+            kind = {"Mesh": "MESH", "Armature": "ARMATURE", "Curve": "CURVE"}[type(data).__name__]
+        self._init(
+            data=data,
+            type=kind,
+            mode="OBJECT",
+            _location=Vector(),
+            _rotation_euler=Vector(),
+            _scale=Vector((1, 1, 1)),
+            rotation_mode="XYZ",
+            parent=None,
+            parent_type="OBJECT",
+            matrix_parent_inverse=Matrix.Identity(4),
+            modifiers=ObjectModifiers(self),
+            constraints=ObjectConstraints(),
+            vertex_groups=VertexGroups(self),
+            pose=Pose() if kind == "ARMATURE" else None,
+            animation_data=None,
+            empty_display_type="PLAIN_AXES",
+            empty_display_size=1.0,
+            show_in_front=False,
+            hide_viewport=False,
+            hide_render=False,
+            display_type="TEXTURED",
+            _select=False,
+            _hide=False,
+        )
+        if kind == "ARMATURE":
+            self._sync_pose()
+
+    def _vector_property(attr):
+        def get(self):
+            return self.__dict__[attr]
+
+        def set(self, value):
+            headless_recorder.record("set", "Object", attr[1:])
+            self.__dict__[attr][:] = tuple(value)
+
+        return property(get, set)
+
+    location = _vector_property("_location")
+    rotation_euler = _vector_property("_rotation_euler")
+    scale = _vector_property("_scale")
+    del _vector_property
+
+    @property
+    def matrix_basis(self):
+        return Matrix.LocRotScale(self._location, self._rotation_euler, self._scale)
+
+    @matrix_basis.setter
+    def matrix_basis(self, matrix):
+        headless_recorder.record("set", "Object", "matrix_basis")
+        location, rotation, scale = Matrix(matrix).decompose()
+        self._location[:] = location
+        self._rotation_euler[:] = rotation
+        self._scale[:] = scale
+
+    def _parent_matrix(self):
+        if self.parent is None:
+            return Matrix.Identity(4)
+        return self.parent.matrix_world @ self.matrix_parent_inverse
+
+    @property
+    def matrix_world(self):
+        return self._parent_matrix() @ self.matrix_basis
+
+    @matrix_world.setter
+    def matrix_world(self, matrix):
+        headless_recorder.record("set", "Object", "matrix_world")
+        location, rotation, scale = (self._parent_matrix().inverted() @ Matrix(matrix)).decompose()
+        self._location[:] = location
+        self._rotation_euler[:] = rotation
+        self._scale[:] = scale
+
+    @property
+    def bound_box(self):
+        if self.type == "MESH" and len(self.data.vertices):
+            coords = [v.co for v in self.data.vertices]
+            lo = [min(c[i] for c in coords) for i in range(3)]
+            hi = [max(c[i] for c in coords) for i in range(3)]
+        else:
+            lo, hi = [-1.0] * 3, [1.0] * 3
+        return bpy_prop_array(
+            bpy_prop_array(v)
+            for v in (
+                (lo[0], lo[1], lo[2]),
+                (lo[0], lo[1], hi[2]),
+                (lo[0], hi[1], hi[2]),
+                (lo[0], hi[1], lo[2]),
+                (hi[0], lo[1], lo[2]),
+                (hi[0], lo[1], hi[2]),
+                (hi[0], hi[1], hi[2]),
+                (hi[0], hi[1], lo[2]),
+            )
+        )
+
+    @property
+    def children(self):
+        import bpy
+
+        return tuple(ob for ob in bpy.data.objects if ob.parent is self)
+
+    def select_set(self, state, view_layer=None):
+        headless_recorder.record("select_set", "Object", self.name)
+        self._select = bool(state)
+
+    def select_get(self, view_layer=None):
+        return self._select
+
+    def hide_set(self, state, view_layer=None):
+        self._hide = bool(state)
+
+    def hide_get(self, view_layer=None):
+        return self._hide
+
+    def visible_get(self, view_layer=None, viewport=None):
+        return not (self._hide or self.hide_viewport)
+
+    def animation_data_create(self):
+        if self.animation_data is None:
+            self._init(animation_data=AnimData())
+        return self.animation_data
+
+    def animation_data_clear(self):
+        self._init(animation_data=None)
+
+    def keyframe_insert(self, data_path, index=-1, frame=None, group=""):
+        import bpy
+        from bpy_extras.anim_utils import action_ensure_channelbag_for_slot
+
+        if frame is None:
+            frame = bpy.context.scene.frame_current
+        animation_data = self.animation_data_create()
+        if animation_data.action is None:
+            animation_data.action = bpy.data.actions.new(f"{self.name}Action")
+        if animation_data.action_slot is None:
+            animation_data.action_slot = animation_data.action.slots.new(id_type="OBJECT", name=self.name)
+        fcurves = action_ensure_channelbag_for_slot(animation_data.action, animation_data.action_slot).fcurves
+        value = getattr(self, data_path)
+        indices = range(len(value)) if index < 0 else [index]
+        for i in indices:
+            fcurve = fcurves.find(data_path, index=i) or fcurves.new(data_path, index=i)
+            fcurve.keyframe_points.insert(frame, value[i])
+        headless_recorder.record("keyframe_insert", "Object", data_path)
+        return True
+
+    @property
+    def users_collection(self):
+        import bpy
+
+        collections = [scene.collection for scene in bpy.data.scenes] + list(bpy.data.collections)
+        return [collection for collection in collections if self in collection.objects]
+
+    def _sync_pose(self):
+        # like Blender, keep the pose bones (and their constraints) of bones that still exist
+        old = {pose_bone.name: pose_bone for pose_bone in self.pose.bones}
+        pose_bones = bpy_prop_collection()
+        for bone in self.data.bones:
+            pose_bone = old.get(bone.name) or PoseBone(bone)
+            pose_bone._init(bone=bone)
+            pose_bones.append(pose_bone)
+        self.pose._init(bones=pose_bones)
+
+    def to_mesh(self, preserve_all_data_layers=False, depsgraph=None):
+        return self.data
+
+    def to_mesh_clear(self):
+        pass
+
+    def to_curve(self, depsgraph, apply_modifiers=False):
+        return self.data
+
+    def to_curve_clear(self):
+        pass
+
+
+class Collection(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self._init(objects=CollectionObjects(), children=CollectionChildren(), hide_viewport=False)
+
+    @property
+    def all_objects(self):
+        seen = bpy_prop_collection()
+        for ob in self.objects:
+            if ob not in seen:
+                seen.append(ob)
+        for child in self.children:
+            for ob in child.all_objects:
+                if ob not in seen:
+                    seen.append(ob)
+        return seen
+
+
+class CollectionObjects(bpy_prop_collection):
+    def link(self, ob):
+        if ob in self:
+            raise RuntimeError(f"Object '{ob.name}' already in collection")
+        self.append(ob)
+        ob.users += 1
+
+    def unlink(self, ob):
+        self._unlink(ob)
+
+    def _unlink(self, ob):
+        self[:] = [o for o in self if o is not ob]
+        ob.users -= 1
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return super().__contains__(key)
+        return any(o is key for o in self)
+
+
+class CollectionChildren(bpy_prop_collection):
+    def link(self, collection):
+        self.append(collection)
+
+    def unlink(self, collection):
+        self[:] = [c for c in self if c is not collection]
+
+
+class LayerObjects(bpy_prop_collection):
+    """All objects in the view layer, with the active and selected ones."""
+
+    def __init__(self, scene):
+        super().__init__()
+        self._scene = scene
+        self._active = None
+
+    def _objects(self):
+        return self._scene.collection.all_objects
+
+    def __iter__(self):
+        return iter(self._objects())
+
+    def __len__(self):
+        return len(self._objects())
+
+    def __getitem__(self, key):
+        return self._objects()[key]
+
+    def __contains__(self, key):
+        return key in self._objects()
+
+    @property
+    def active(self):
+        if self._active is not None and self._active not in self._objects():
+            self._active = None
+        return self._active
+
+    @active.setter
+    def active(self, ob):
+        headless_recorder.record("set", "LayerObjects", "active")
+        self._active = ob
+
+    @property
+    def selected(self):
+        return bpy_prop_collection(ob for ob in self._objects() if ob._select)
+
+
+class ViewLayer(bpy_struct):
+    def __init__(self, scene):
+        self._init(name="ViewLayer", objects=LayerObjects(scene), depsgraph=None)
+
+    def update(self):
+        headless_recorder.record("update", "ViewLayer", self.name)
+
+
+class ToolSettings(bpy_struct):
+    def __init__(self):
+        self._init(mesh_select_mode=bpy_prop_array([True, False, False]))
+
+
+class View3DCursor(bpy_struct):
+    def __init__(self):
+        self._init(location=Vector(), rotation_euler=Vector(), matrix=Matrix.Identity(4))
+
+
+class Scene(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self._init(
+            collection=Collection("Scene Collection"),
+            tool_settings=ToolSettings(),
+            cursor=View3DCursor(),
+            frame_start=1,
+            frame_end=250,
+            frame_current=1,
+            render=RenderSettings(),
+            camera=None,
+        )
+        self._init(view_layers=bpy_prop_collection([ViewLayer(self)]))
+
+    @property
+    def objects(self):
+        return self.collection.all_objects
+
+    def frame_set(self, frame, subframe=0.0):
+        import bpy
+
+        self._init(frame_current=frame)
+        # like in Blender the new frame is already set, but nothing has been evaluated yet
+        for handler in list(bpy.app.handlers.frame_change_pre):
+            handler(self, None)
+        for ob in self.collection.all_objects:
+            if ob.animation_data and ob.animation_data.action:
+                bag = ob.animation_data.action._channelbags.get(id(ob.animation_data.action_slot))
+                for fcurve in bag.fcurves if bag else ():
+                    getattr(ob, fcurve.data_path)[fcurve.array_index] = fcurve.evaluate(frame)
+        for handler in list(bpy.app.handlers.frame_change_post):
+            handler(self, None)
+
+
+class RenderSettings(bpy_struct):
+    def __init__(self):
+        self._init(fps=24, resolution_x=1920, resolution_y=1080)
+
+
+class Screen(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self._init(areas=bpy_prop_collection([Area("VIEW_3D")]))
+
+
+class Area(bpy_struct):
+    def __init__(self, type):
+        self._init(type=type, regions=bpy_prop_collection([Region()]), spaces=bpy_prop_collection([SpaceView3D()]))
+
+    def tag_redraw(self):
+        headless_recorder.record("tag_redraw", "Area", self.type)
+
+    def header_text_set(self, text):
+        self.header_text = text
+        headless_recorder.record("header_text_set", "Area", text)
+
+
+class Region(bpy_struct):
+    def __init__(self, width=1920, height=1080):
+        self._init(type="WINDOW", width=width, height=height, x=0, y=0)
+
+    def tag_redraw(self):
+        headless_recorder.record("tag_redraw", "Region", self.type)
+
+
+class RegionView3D(bpy_struct):
+    """A camera 10 units in front of the origin, looking down the -Y axis."""
+
+    def __init__(self, width=1920, height=1080):
+        view = Matrix(((1, 0, 0, 0), (0, 0, 1, 0), (0, -1, 0, -10), (0, 0, 0, 1)))
+        near, far, focal = 0.1, 1000.0, 2.0
+        aspect = width / height
+        projection = Matrix(
+            (
+                (focal / aspect, 0, 0, 0),
+                (0, focal, 0, 0),
+                (0, 0, -(far + near) / (far - near), -2 * far * near / (far - near)),
+                (0, 0, -1, 0),
+            )
+        )
+        self._init(
+            view_matrix=view,
+            window_matrix=projection,
+            perspective_matrix=projection @ view,
+            is_perspective=True,
+            view_perspective="PERSP",
+            view_distance=10.0,
+            view_location=Vector(),
+        )
+
+
+class SpaceView3D(bpy_struct):
+    _handlers = []
+
+    def __init__(self):
+        self._init(type="VIEW_3D", region_3d=RegionView3D(), overlay=None, shading=None)
+
+    @classmethod
+    def draw_handler_add(cls, callback, args, region_type, draw_type):
+        handle = (callback, tuple(args), region_type, draw_type)
+        cls._handlers.append(handle)
+        headless_recorder.record("draw_handler_add", draw_type)
+        return handle
+
+    @classmethod
+    def draw_handler_remove(cls, handle, region_type):
+        for i, other in enumerate(cls._handlers):
+            if other is handle:
+                del cls._handlers[i]
+                headless_recorder.record("draw_handler_remove", handle[3])
+                return
+        raise ValueError("draw_handler_remove: handler not found")
+
+
+class Depsgraph(bpy_struct):
+    def __init__(self, scene, view_layer, updates=()):
+        self._init(scene=scene, view_layer=view_layer, updates=list(updates))
+
+    def id_type_updated(self, id_type):
+        names = {"OBJECT": Object, "SCENE": Scene, "MESH": Mesh, "ARMATURE": Armature, "CURVE": Curve}
+        return any(isinstance(update.id, names.get(id_type, ())) for update in self.updates)
+
+    def update(self):
+        pass
+
+    @property
+    def objects(self):
+        return self.view_layer.objects
+
+
+class DepsgraphUpdate(bpy_struct):
+    def __init__(self, id, transform=True, geometry=False):
+        self._init(id=id, is_updated_transform=transform, is_updated_geometry=geometry, is_updated_shading=False)
+
+
+class WindowManager(bpy_struct):
+    """Modal operators are kept in _modal_handlers, the harness sends them events."""
+
+    def __init__(self):
+        self._init(_modal_handlers=[])
+
+    def modal_handler_add(self, operator):
+        self._modal_handlers.append(operator)
+        headless_recorder.record("modal_handler_add", type(operator).__name__)
+        return True
+
+
+class Preferences(bpy_struct):
+    def __init__(self):
+        self._init(addons=bpy_prop_collection(), view=None)
+
+
+class Addon(bpy_struct):
+    def __init__(self, module, preferences):
+        self._init(module=module, name=module, preferences=preferences)
+
+
+class UILayout(bpy_struct):
+    """A layout that records what an add-on would draw."""
+
+    def _ui(self, what, *args):
+        headless_recorder.record("ui", what, *args)
+        return self
+
+    def __getattr__(self, name):
+        # any other layout function (box, split, grid_flow, ...) simply returns another layout
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self._ui(name)
+
+    def prop(self, data, property, **kwargs):
+        return self._ui("prop", property)
+
+    def prop_search(self, data, property, search_data, search_property, **kwargs):
+        return self._ui("prop_search", property)
+
+    def operator(self, operator, **kwargs):
+        return self._ui("operator", operator)
+
+    def label(self, text="", **kwargs):
+        return self._ui("label", text)
+
+    def row(self, **kwargs):
+        return self
+
+    def column(self, **kwargs):
+        return self
+
+    def separator(self, **kwargs):
+        return self._ui("separator")
+
+
+# classes an add-on derives from
+
+
+class _Registrable(bpy_struct):
+    bl_idname = ""
+    bl_label = ""
+    bl_options = set()
+    layout = UILayout()
+
+
+class Operator(_Registrable):
+    bl_description = ""
+    bl_options = {"REGISTER"}
+
+    def report(self, type, message):
+        headless_recorder.record("report", next(iter(type)), message)
+        self.__dict__.setdefault("_reports", []).append((set(type), message))
+
+    @property
+    def properties(self):
+        return _OperatorProperties(self)
+
+    def as_keywords(self, ignore=()):
+        return {k: v for k, v in self.__dict__.get("_properties", {}).items() if k not in ignore}
+
+
+class _OperatorProperties:
+    def __init__(self, operator):
+        self._operator = operator
+
+    def is_property_set(self, name):
+        return name in self._operator.__dict__.get("_set_by_caller", ())
+
+    def __getattr__(self, name):
+        return getattr(self._operator, name)
+
+
+class AddonPreferences(_Registrable):
+    pass
+
+
+class Panel(_Registrable):
+    pass
+
+
+class PropertyGroup(_Registrable):
+    pass
+
+
+class _DrawFunctions:
+    """Menus and panels that add-ons append draw functions to."""
+
+    _draw_functions = None
+
+    @classmethod
+    def append(cls, function):
+        cls._draw_functions.append(function)
+
+    @classmethod
+    def prepend(cls, function):
+        cls._draw_functions.insert(0, function)
+
+    @classmethod
+    def remove(cls, function):
+        cls._draw_functions.remove(function)
+
+
+class Menu(_Registrable, _DrawFunctions):
+    pass
+
+
+def _menu(name, base):
+    return type(name, (base, _DrawFunctions), {"_draw_functions": []})
+
+
+VIEW3D_MT_add = _menu("VIEW3D_MT_add", Menu)
+VIEW3D_MT_object = _menu("VIEW3D_MT_object", Menu)
+VIEW3D_MT_mesh_add = _menu("VIEW3D_MT_mesh_add", Menu)
+VIEW3D_PT_overlay_object = _menu("VIEW3D_PT_overlay_object", Panel)
+VIEW3D_PT_overlay = _menu("VIEW3D_PT_overlay", Panel)
+TOPBAR_MT_file_export = _menu("TOPBAR_MT_file_export", Menu)
+TOPBAR_MT_file_import = _menu("TOPBAR_MT_file_import", Menu)
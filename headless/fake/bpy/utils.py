@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Class registration.
+
+Registering a class binds the properties in its annotations, makes
+operators callable through bpy.ops and adds the preferences of an
+add-on to bpy.context.preferences.addons.
+"""
+
+import headless_recorder
+
+from . import types
+from .props import _PropertyDeferred
+
+registered = {}
+
+
+def _annotations(cls):
+    annotations = {}
+    for klass in reversed(cls.__mro__):
+        annotations.update(klass.__dict__.get("__annotations__", {}))
+    return annotations
+
+
+# the number of arguments Blender expects for the methods it calls, including self or cls
+_ARGUMENT_COUNTS = {"poll": 2, "execute": 2, "invoke": 3, "modal": 3, "cancel": 2, "check": 2, "draw": 2}
+
+
+def register_class(cls):
+    """Register a class, raise ValueError if it is already registered or a method has the wrong number of arguments."""
+    if cls in registered.values():
+        raise ValueError(f"register_class(...): already registered as a subclass '{cls.__name__}'")
+    for name, count in _ARGUMENT_COUNTS.items():
+        function = getattr(cls.__dict__.get(name), "__func__", cls.__dict__.get(name))
+        code = getattr(function, "__code__", None)
+        if code is not None and code.co_argcount != count:
+            raise ValueError(
+                f"expected {cls.__name__}, '{name}' class method to have {count} args, found {code.co_argcount}"
+            )
+    for name, value in _annotations(cls).items():
+        if isinstance(value, _PropertyDeferred):
+            setattr(cls, name, value)
+    key = cls.bl_idname or cls.__name__
+    registered[key] = cls
+    if issubclass(cls, types.AddonPreferences):
+        import bpy
+
+        bpy.context.preferences.addons.append(types.Addon(cls.bl_idname, cls()))
+    headless_recorder.record("register_class", cls.__name__)
+
+
+def unregister_class(cls):
+    """Unregister a class, raise RuntimeError if it is not registered."""
+    key = cls.bl_idname or cls.__name__
+    if registered.get(key) is not cls:
+        raise RuntimeError(f"unregister_class(...): missing bl_rna attribute from '{cls.__name__}' instance (may not be registered)")
+    del registered[key]
+    if issubclass(cls, types.AddonPreferences):
+        import bpy
+
+        addons = bpy.context.preferences.addons
+        addons[:] = [addon for addon in addons if addon.module != cls.bl_idname]
+    headless_recorder.record("unregister_class", cls.__name__)
+
+
+def register_classes_factory(classes):
+    def register():
+        for cls in classes:
+            register_class(cls)
+
+    def unregister():
+        for cls in reversed(classes):
+            unregister_class(cls)
+
+    return register, unregister
@@ -0,0 +1,5 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from . import object_utils, view3d_utils, anim_utils
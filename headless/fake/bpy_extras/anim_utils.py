@@ -0,0 +1,12 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from bpy.types import ActionChannelbag
+
+
+def action_ensure_channelbag_for_slot(action, slot):
+    bags = action._channelbags
+    if id(slot) not in bags:
+        bags[id(slot)] = ActionChannelbag(slot)
+    return bags[id(slot)]
@@ -0,0 +1,17 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import bpy
+
+
+def object_data_add(context, obdata, operator=None, name=None):
+    """Add an object using the data, make it the only selected object and make it active."""
+    ob = bpy.data.objects.new(name or obdata.name, obdata)
+    context.collection.objects.link(ob)
+    for other in context.view_layer.objects:
+        other._select = False
+    ob._select = True
+    context.view_layer.objects.active = ob
+    ob.location = context.scene.cursor.location
+    return ob
@@ -0,0 +1,27 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from mathutils import Vector
+
+
+def location_3d_to_region_2d(region, rv3d, coord, default=None):
+    prj = rv3d.perspective_matrix @ Vector((coord[0], coord[1], coord[2], 1.0))
+    if prj.w > 0.0:
+        width_half = region.width / 2.0
+        height_half = region.height / 2.0
+        return Vector((width_half + width_half * (prj.x / prj.w), height_half + height_half * (prj.y / prj.w)))
+    return default
+
+
+def region_2d_to_origin_3d(region, rv3d, coord, clamp=None):
+    return rv3d.view_matrix.inverted().translation
+
+
+def region_2d_to_vector_3d(region, rv3d, coord):
+    # unproject a point between the near and far planes and look at it from the eye
+    x = 2.0 * coord[0] / region.width - 1.0
+    y = 2.0 * coord[1] / region.height - 1.0
+    point = rv3d.perspective_matrix.inverted() @ Vector((x, y, -0.5, 1.0))
+    point = Vector(point[:3]) / point.w
+    return (point - region_2d_to_origin_3d(region, rv3d, coord)).normalized()
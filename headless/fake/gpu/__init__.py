@@ -0,0 +1,13 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+A headless stand-in for the gpu module.
+
+Nothing is drawn: shaders, buffers and batches only check their arguments
+and record what would have been drawn, as ("draw", shader name, primitive
+type, number of vertices or indices).
+"""
+
+from . import shader, state, types, matrix
@@ -0,0 +1,20 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from contextlib import contextmanager
+
+from mathutils import Matrix
+
+
+@contextmanager
+def push_pop():
+    yield
+
+
+def get_projection_matrix():
+    return Matrix.Identity(4)
+
+
+def get_model_view_matrix():
+    return Matrix.Identity(4)
@@ -0,0 +1,26 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import headless_recorder
+
+from .types import GPUShader
+
+BUILTIN = {
+    "UNIFORM_COLOR",
+    "FLAT_COLOR",
+    "SMOOTH_COLOR",
+    "IMAGE",
+    "POLYLINE_UNIFORM_COLOR",
+    "POLYLINE_FLAT_COLOR",
+    "POLYLINE_SMOOTH_COLOR",
+    "POINT_UNIFORM_COLOR",
+    "POINT_FLAT_COLOR",
+}
+
+
+def from_builtin(name, config="DEFAULT"):
+    if name not in BUILTIN:
+        raise ValueError(f"expected a string in {sorted(BUILTIN)}, got '{name}'")
+    headless_recorder.record("shader", name)
+    return GPUShader(name)
@@ -0,0 +1,32 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import headless_recorder
+
+_viewport = (0, 0, 1920, 1080)
+
+
+def viewport_get():
+    return _viewport
+
+
+def viewport_set(x, y, width, height):
+    global _viewport
+    _viewport = (x, y, width, height)
+
+
+def _setter(name):
+    def set(*args):
+        headless_recorder.record("state", name, *args)
+
+    set.__name__ = name
+    return set
+
+
+blend_set = _setter("blend_set")
+depth_test_set = _setter("depth_test_set")
+depth_mask_set = _setter("depth_mask_set")
+line_width_set = _setter("line_width_set")
+point_size_set = _setter("point_size_set")
+face_culling_set = _setter("face_culling_set")
@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import headless_recorder
+
+_PRIMITIVES = {"POINTS", "LINES", "TRIS", "LINE_STRIP", "LINE_LOOP", "TRI_STRIP", "TRI_FAN", "LINES_ADJ"}
+
+
+def _length(seq):
+    try:
+        return len(seq)
+    except TypeError:
+        return len(list(seq))
+
+
+class GPUShader:
+    def __init__(self, name):
+        self.name = name
+        self.uniforms = {}
+
+    def bind(self):
+        headless_recorder.record("bind", self.name)
+
+    def uniform_float(self, name, value):
+        self.uniforms[name] = value
+
+    def uniform_int(self, name, value):
+        self.uniforms[name] = value
+
+    def uniform_bool(self, name, value):
+        self.uniforms[name] = value
+
+    def attr_from_name(self, name):
+        return 0
+
+
+class GPUVertFormat:
+    def __init__(self):
+        self.attributes = []
+
+    def attr_add(self, id, comp_type, len, fetch_mode):
+        self.attributes.append(id)
+
+
+class GPUVertBuf:
+    def __init__(self, format, len):
+        self.format = format
+        self.len = len
+        self.filled = {}
+
+    def attr_fill(self, id, data):
+        if _length(data) != self.len:
+            raise ValueError(f"Expected a sequence of size {self.len}, got {_length(data)}")
+        self.filled[id] = data
+        headless_recorder.record("attr_fill", id, self.len)
+
+
+class GPUIndexBuf:
+    def __init__(self, type, seq):
+        if type not in _PRIMITIVES:
+            raise ValueError(f"unknown primitive type {type}")
+        self.type = type
+        self.len = _length(seq)
+
+
+class GPUBatch:
+    def __init__(self, type, buf, elem=None):
+        if type not in _PRIMITIVES:
+            raise ValueError(f"unknown primitive type {type}")
+        if elem is not None and elem.type != type:
+            raise ValueError("the primitive type of the index buffer does not match the batch")
+        self.type = type
+        self.buf = buf
+        self.elem = elem
+
+    def program_set(self, shader):
+        self.shader = shader
+
+    def draw(self, shader=None):
+        for name in self.buf.format.attributes:
+            if name not in self.buf.filled:
+                raise RuntimeError(f"attribute {name} was never filled")
+        count = self.elem.len if self.elem is not None else self.buf.len
+        headless_recorder.record("draw", getattr(shader, "name", None), self.type, count)
+
+
+class GPUOffScreen:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+    def bind(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def free(self):
+        pass
@@ -0,0 +1,19 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import gpu
+
+
+def batch_for_shader(shader, type, content, indices=None):
+    """Build a batch from a dict of attribute names and sequences, like gpu_extras.batch.batch_for_shader."""
+    fmt = gpu.types.GPUVertFormat()
+    length = None
+    for name, data in content.items():
+        fmt.attr_add(id=name, comp_type="F32", len=3, fetch_mode="FLOAT")
+        length = len(data) if length is None else length
+    vbo = gpu.types.GPUVertBuf(fmt, length or 0)
+    for name, data in content.items():
+        vbo.attr_fill(name, data)
+    ibo = None if indices is None else gpu.types.GPUIndexBuf(type=type, seq=indices)
+    return gpu.types.GPUBatch(type=type, buf=vbo, elem=ibo)
@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+The log shared by all fake modules.
+
+Every operator call, data-API write, draw call and font call is appended
+to `events` as a tuple whose first element is the kind of event, for example
+
+    ("op", "object.mode_set", {"mode": "EDIT"})
+    ("set", "Object", "location")
+    ("foreach_set", "MeshSkinVertex", "radius", 1000)
+    ("draw", "POLYLINE_UNIFORM_COLOR", "LINES", 2)
+    ("blf", "draw", "1.0000")
+
+Because the fake modules do the same work every run, the events (and
+counts of them) are deterministic and can be compared between revisions.
+"""
+
+from collections import Counter
+
+events = []
+enabled = True
+
+
+def record(*event):
+    """Add an event to the log."""
+    if enabled:
+        events.append(event)
+
+
+def clear():
+    """Forget all recorded events."""
+    events.clear()
+
+
+def count(kind=None, name=None):
+    """
+    Count events.
+
+    :param kind: Only count events of this kind, e.g. "op" or "draw"
+    :param name: Only count events whose second element is this name
+    :return: The number of matching events
+    """
+    return sum(
+        1
+        for event in events
+        if (kind is None or event[0] == kind) and (name is None or event[1] == name)
+    )
+
+
+def summary():
+    """Return a Counter with the number of events for each (kind, name) pair."""
+    return Counter(event[:2] for event in events)
@@ -0,0 +1,331 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+A pure Python stand-in for the parts of mathutils the add-ons use.
+
+Only Vector and Matrix are provided, with just enough operations to
+run the add-ons. Everything is implemented with plain lists, so the
+results are the same on every machine.
+"""
+
+from math import sqrt, sin, cos, atan2, hypot
+
+
+class Vector:
+    """A vector of any length with the usual arithmetic."""
+
+    __slots__ = ("_v",)
+
+    def __init__(self, seq=(0.0, 0.0, 0.0)):
+        self._v = [float(x) for x in seq]
+
+    def __len__(self):
+        return len(self._v)
+
+    def __iter__(self):
+        return iter(self._v)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self._v[index])
+        return self._v[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            values = [float(x) for x in value]
+            if len(values) != len(self._v[index]):
+                raise ValueError("Vector slice assignment: size mismatch")
+            self._v[index] = values
+        else:
+            self._v[index] = float(value)
+
+    def _component(index):
+        def get(self):
+            return self._v[index]
+
+        def set(self, value):
+            self._v[index] = float(value)
+
+        return property(get, set)
+
+    x = _component(0)
+    y = _component(1)
+    z = _component(2)
+    w = _component(3)
+    del _component
+
+    def __repr__(self):
+        return f"Vector(({', '.join(f'{x:.4f}' for x in self._v)}))"
+
+    def __eq__(self, other):
+        try:
+            return len(other) == len(self._v) and all(a == b for a, b in zip(self._v, other))
+        except TypeError:
+            return NotImplemented
+
+    def __hash__(self):
+        raise TypeError("Vector is mutable and not hashable, use to_tuple()")
+
+    def _check(self, other):
+        if len(other) != len(self._v):
+            raise ValueError("Vector addition: vectors must have the same dimensions")
+        return other
+
+    def __add__(self, other):
+        return Vector(a + b for a, b in zip(self._v, self._check(other)))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return Vector(a - b for a, b in zip(self._v, self._check(other)))
+
+    def __rsub__(self, other):
+        return Vector(b - a for a, b in zip(self._v, self._check(other)))
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return Vector(a * other for a in self._v)
+        return Vector(a * b for a, b in zip(self._v, self._check(other)))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        return Vector(a / other for a in self._v)
+
+    def __neg__(self):
+        return Vector(-a for a in self._v)
+
+    def __iadd__(self, other):
+        self._v = [a + b for a, b in zip(self._v, self._check(other))]
+        return self
+
+    def __isub__(self, other):
+        self._v = [a - b for a, b in zip(self._v, self._check(other))]
+        return self
+
+    def __matmul__(self, other):
+        if isinstance(other, Vector):
+            return self.dot(other)
+        return NotImplemented
+
+    @property
+    def length(self):
+        return sqrt(sum(a * a for a in self._v))
+
+    @property
+    def length_squared(self):
+        return sum(a * a for a in self._v)
+
+    def dot(self, other):
+        return sum(a * b for a, b in zip(self._v, other))
+
+    def cross(self, other):
+        a, b = self._v, list(other)
+        return Vector(
+            (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+        )
+
+    def normalized(self):
+        length = self.length
+        return Vector(self._v) if length == 0 else self / length
+
+    def normalize(self):
+        self._v = list(self.normalized())
+
+    def copy(self):
+        return Vector(self._v)
+
+    def to_tuple(self, precision=-1):
+        if precision < 0:
+            return tuple(self._v)
+        return tuple(round(a, precision) for a in self._v)
+
+    def to_3d(self):
+        return Vector((self._v + [0.0, 0.0, 0.0])[:3])
+
+    def to_4d(self):
+        return Vector(self.to_3d()._v + [1.0])
+
+    def freeze(self):
+        return self
+
+
+class Matrix:
+    """A square matrix stored as a list of rows."""
+
+    __slots__ = ("_rows",)
+
+    def __init__(self, rows=None):
+        if rows is None:
+            rows = Matrix.Identity(4)._rows
+        self._rows = [Vector(row) for row in rows]
+
+    @staticmethod
+    def Identity(size):
+        return Matrix([[1.0 if i == j else 0.0 for j in range(size)] for i in range(size)])
+
+    @staticmethod
+    def Translation(vector):
+        m = Matrix.Identity(4)
+        for i in range(3):
+            m._rows[i][3] = vector[i]
+        return m
+
+    @staticmethod
+    def Diagonal(vector):
+        n = len(vector)
+        return Matrix([[vector[i] if i == j else 0.0 for j in range(n)] for i in range(n)])
+
+    @staticmethod
+    def Rotation(angle, size, axis):
+        c, s = cos(angle), sin(angle)
+        if axis == "X":
+            m = [[1, 0, 0], [0, c, -s], [0, s, c]]
+        elif axis == "Y":
+            m = [[c, 0, s], [0, 1, 0], [-s, 0, c]]
+        else:
+            m = [[c, -s, 0], [s, c, 0], [0, 0, 1]]
+        if size == 4:
+            m = [row + [0] for row in m] + [[0, 0, 0, 1]]
+        return Matrix(m)
+
+    @staticmethod
+    def LocRotScale(location, rotation, scale):
+        """Compose a 4x4 matrix from a location, an XYZ euler and a scale."""
+        rx, ry, rz = rotation
+        r = (
+            Matrix.Rotation(rz, 3, "Z")
+            @ Matrix.Rotation(ry, 3, "Y")
+            @ Matrix.Rotation(rx, 3, "X")
+        )
+        m = Matrix.Identity(4)
+        for i in range(3):
+            for j in range(3):
+                m._rows[i][j] = r._rows[i][j] * scale[j]
+            m._rows[i][3] = location[i]
+        return m
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __getitem__(self, index):
+        return self._rows[index]
+
+    def __setitem__(self, index, value):
+        self._rows[index] = Vector(value)
+
+    def __repr__(self):
+        rows = ",\n        ".join(repr(row.to_tuple()) for row in self._rows)
+        return f"Matrix(({rows}))"
+
+    def __eq__(self, other):
+        try:
+            return all(a == b for a, b in zip(self._rows, other)) and len(other) == len(self)
+        except TypeError:
+            return NotImplemented
+
+    @property
+    def col(self):
+        return [Vector(row[j] for row in self._rows) for j in range(len(self._rows))]
+
+    @property
+    def translation(self):
+        return Vector(row[3] for row in self._rows[:3])
+
+    @translation.setter
+    def translation(self, value):
+        for i in range(3):
+            self._rows[i][3] = value[i]
+
+    def __matmul__(self, other):
+        if isinstance(other, Matrix):
+            n = len(self._rows)
+            cols = other.col
+            return Matrix([[row.dot(cols[j]) for j in range(n)] for row in self._rows])
+        other = list(other)
+        n = len(self._rows)
+        if n == 4 and len(other) == 3:
+            # just like Blender, a 3d vector is treated as a point without a perspective divide
+            return Vector((self @ Vector(other + [1.0]))[:3])
+        return Vector(row.dot(other) for row in self._rows)
+
+    def copy(self):
+        return Matrix(self._rows)
+
+    def transposed(self):
+        return Matrix(self.col)
+
+    def to_3x3(self):
+        return Matrix([row[:3] for row in self._rows[:3]])
+
+    def to_4x4(self):
+        m = Matrix.Identity(4)
+        for i, row in enumerate(self._rows[:3]):
+            for j in range(min(len(row), 4)):
+                m._rows[i][j] = row[j]
+        return m
+
+    def determinant(self):
+        return _determinant([list(row) for row in self._rows])
+
+    def inverted(self, fallback=None):
+        """Gauss-Jordan elimination with partial pivoting."""
+        n = len(self._rows)
+        a = [list(row) + [1.0 if i == j else 0.0 for j in range(n)] for i, row in enumerate(self._rows)]
+        for col in range(n):
+            pivot = max(range(col, n), key=lambda r: abs(a[r][col]))
+            if abs(a[pivot][col]) < 1e-12:
+                if fallback is not None:
+                    return fallback
+                raise ValueError("Matrix.inverted(): matrix does not have an inverse")
+            a[col], a[pivot] = a[pivot], a[col]
+            p = a[col][col]
+            a[col] = [x / p for x in a[col]]
+            for r in range(n):
+                if r != col and a[r][col] != 0.0:
+                    f = a[r][col]
+                    a[r] = [x - f * y for x, y in zip(a[r], a[col])]
+        return Matrix([row[n:] for row in a])
+
+    def invert(self):
+        self._rows = self.inverted()._rows
+
+    def decompose(self):
+        """Return location, XYZ euler rotation and scale (this stand-in has no Quaternion)."""
+        location = self.translation
+        cols = self.to_3x3().col
+        scale = Vector(c.length for c in cols)
+        if self.to_3x3().determinant() < 0:
+            scale[0] = -scale[0]
+        r = [[cols[j][i] / (scale[j] or 1.0) for j in range(3)] for i in range(3)]
+        rotation = Vector(
+            (
+                atan2(r[2][1], r[2][2]),
+                atan2(-r[2][0], hypot(r[0][0], r[1][0])),
+                atan2(r[1][0], r[0][0]),
+            )
+        )
+        return location, rotation, scale
+
+    def freeze(self):
+        return self
+
+
+def _determinant(m):
+    if len(m) == 1:
+        return m[0][0]
+    if len(m) == 2:
+        return m[0][0] * m[1][1] - m[0][1] * m[1][0]
+    return sum(
+        (-1) ** j * m[0][j] * _determinant([row[:j] + row[j + 1 :] for row in m[1:]])
+        for j in range(len(m))
+    )
+
+
+Euler = Vector
+Color = Vector
@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+mathutils.bvhtree
+
+A BVHTree without the tree: find_nearest() simply checks every triangle.
+That is far too slow for real meshes, but gives exactly the same answers.
+"""
+
+from . import Vector
+
+
+def _closest_on_triangle(p, a, b, c):
+    """The point of triangle abc closest to p (Real-Time Collision Detection, 5.1.5)."""
+    ab, ac, ap = b - a, c - a, p - a
+    d1, d2 = ab.dot(ap), ac.dot(ap)
+    if d1 <= 0 and d2 <= 0:
+        return a
+    bp = p - b
+    d3, d4 = ab.dot(bp), ac.dot(bp)
+    if d3 >= 0 and d4 <= d3:
+        return b
+    vc = d1 * d4 - d3 * d2
+    if vc <= 0 and d1 >= 0 and d3 <= 0:
+        return a + ab * (d1 / (d1 - d3))
+    cp = p - c
+    d5, d6 = ab.dot(cp), ac.dot(cp)
+    if d6 >= 0 and d5 <= d6:
+        return c
+    vb = d5 * d2 - d1 * d6
+    if vb <= 0 and d2 >= 0 and d6 <= 0:
+        return a + ac * (d2 / (d2 - d6))
+    va = d3 * d6 - d5 * d4
+    if va <= 0 and (d4 - d3) >= 0 and (d5 - d6) >= 0:
+        return b + (c - b) * ((d4 - d3) / ((d4 - d3) + (d5 - d6)))
+    denominator = 1 / (va + vb + vc)
+    return a + ab * (vb * denominator) + ac * (vc * denominator)
+
+
+class BVHTree:
+    def __init__(self, triangles):
+        self._triangles = triangles  # (index, a, b, c)
+
+    @classmethod
+    def FromPolygons(cls, vertices, polygons, all_triangles=False, epsilon=0.0):
+        vertices = [Vector(v) for v in vertices]
+        triangles = []
+        for index, polygon in enumerate(polygons):
+            for i in range(1, len(polygon) - 1):
+                triangles.append((index, vertices[polygon[0]], vertices[polygon[i]], vertices[polygon[i + 1]]))
+        return cls(triangles)
+
+    @classmethod
+    def FromObject(cls, object, depsgraph, deform=True, render=False, cage=False, epsilon=0.0):
+        mesh = object.evaluated_get(depsgraph).to_mesh()
+        return cls.FromPolygons([v.co for v in mesh.vertices], [p.vertices for p in mesh.polygons], epsilon=epsilon)
+
+    def find_nearest(self, origin, distance=1.84467e19):
+        origin = Vector(origin)
+        best = (None, None, None, None)
+        for index, a, b, c in self._triangles:
+            location = _closest_on_triangle(origin, a, b, c)
+            d = (location - origin).length
+            if d <= distance and (best[3] is None or d < best[3]):
+                best = (location, (b - a).cross(c - a).normalized(), index, d)
+        return best
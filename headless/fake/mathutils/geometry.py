@@ -0,0 +1,20 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+mathutils.geometry
+
+Only the intersection the add-ons use.
+"""
+
+from . import Vector
+
+
+def intersect_line_plane(line_a, line_b, plane_co, plane_no, no_flip=False):
+    line_a, line_b, plane_co, plane_no = Vector(line_a), Vector(line_b), Vector(plane_co), Vector(plane_no)
+    direction = line_b - line_a
+    dot = plane_no.dot(direction)
+    if abs(dot) < 1e-6:
+        return None  # the line is parallel to the plane
+    return line_a + direction * (plane_no.dot(plane_co - line_a) / dot)
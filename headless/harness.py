@@ -0,0 +1,790 @@
+# SPDX-FileCopyrightText: © 2016 Michel Anders (varkenvarken) & contributors
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Run the add-ons without Blender.
+
+The fake directory next to this file contains headless stand-ins for bpy,
+mathutils, gpu, gpu_extras, blf and bpy_extras. They are nowhere near
+complete, but they implement enough to import the add-ons in this repository,
+register them, run their operators and call their draw handlers. Every
+operator call, data-API write and draw call is recorded, so a run can be
+checked (did the overlay draw a batch?) and timed without a GPU.
+
+From the command line it runs some or all of the scenarios below and
+prints how long each took together with a count of what it recorded:
+
+    python headless/harness.py                 # all scenarios
+    python headless/harness.py rig_curve -v    # one scenario, all events
+
+Do not import this in Blender: install() puts the fake modules in front of
+the real ones.
+
+Timings are of the add-on code running on top of the fake modules, so they
+are only useful to compare two versions of an add-on, not to predict how long
+something takes in Blender. The recorded events on the other hand are
+deterministic and should be the same on every machine.
+"""
+
+import argparse
+import importlib.util
+import io
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parent.parent
+FAKE = Path(__file__).resolve().parent / "fake"
+
+
+def install():
+    """Make the fake modules importable (and take precedence over any real ones), and the add-ons, like Blender does."""
+    if str(FAKE) not in sys.path:
+        sys.path.insert(0, str(FAKE))
+    if str(ROOT / "add-ons") not in sys.path:
+        sys.path.append(str(ROOT / "add-ons"))
+    import bpy
+
+    return bpy
+
+
+def reset():
+    """Start with an empty file and an empty event log."""
+    bpy = install()
+    import headless_recorder
+
+    bpy.reset()
+    headless_recorder.clear()
+    return bpy
+
+
+# the names of the add-ons registered by load_addon(), add-ons can also import each other without registering
+loaded = set()
+
+
+def load_addon(name, directory="add-ons"):
+    """
+    Import an add-on (or snippet) by file name and register it.
+
+    :param name: The file name without the .py extension
+    :param directory: The directory relative to the repository root
+    :return: The imported module
+    """
+    install()
+    spec = importlib.util.spec_from_file_location(name, ROOT / directory / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    if hasattr(module, "register"):
+        module.register()
+    loaded.add(name)
+    return module
+
+
+def unload_addon(module):
+    """Unregister an add-on loaded with load_addon()."""
+    if hasattr(module, "unregister"):
+        module.unregister()
+    loaded.discard(module.__name__)
+    sys.modules.pop(module.__name__, None)
+
+
+def draw_view3d():
+    """Call all registered POST_VIEW draw handlers and then all POST_PIXEL handlers, like a redraw of the 3d view."""
+    import bpy
+
+    handlers = bpy.types.SpaceView3D._handlers
+    for draw_type in ("PRE_VIEW", "POST_VIEW", "POST_PIXEL"):
+        for callback, args, region_type, handler_draw_type in list(handlers):
+            if handler_draw_type == draw_type:
+                callback(*args)
+
+
+def depsgraph_update(*changed, geometry=False):
+    """
+    Call the depsgraph_update_post handlers as if the given IDs were changed.
+
+    :param changed: The objects (or other IDs) that were changed
+    :param geometry: Whether their geometry changed too (and not just their transform)
+    """
+    import bpy
+
+    context = bpy.context
+    updates = [bpy.types.DepsgraphUpdate(ID, transform=True, geometry=geometry) for ID in changed]
+    depsgraph = bpy.types.Depsgraph(context.scene, context.view_layer, updates)
+    for handler in list(bpy.app.handlers.depsgraph_update_post):
+        handler(context.scene, depsgraph)
+
+
+def modal_event(type, value="PRESS", x=0, y=0, **modifiers):
+    """
+    Send an event to the running modal operators, newest first, like Blender does.
+
+    :param type: The event type, for example "MOUSEMOVE" or "LEFTMOUSE"
+    :param value: The event value, for example "PRESS"
+    :param x: The mouse position in the region
+    :param y: The mouse position in the region
+    :param modifiers: shift, ctrl or alt
+    :return: What the last operator that got the event returned, or None if none is running
+    """
+    import bpy
+    from bpy.ops import Event
+
+    handlers = bpy.context.window_manager._modal_handlers
+    event = Event(type, value, x, y, **modifiers)
+    result = None
+    for operator in reversed(list(handlers)):
+        result = operator.modal(bpy.context, event)
+        if result & {"FINISHED", "CANCELLED"}:
+            handlers.remove(operator)
+        if "PASS_THROUGH" not in result:
+            break
+    return result
+
+
+def bezier_curve(points, name="Curve"):
+    """Add a curve object with a single Bezier spline through the points and make it active."""
+    import bpy
+
+    curve = bpy.data.curves.new(name, type="CURVE")
+    spline = curve.splines.new("BEZIER")
+    spline.bezier_points.add(len(points) - 1)
+    for bp, co in zip(spline.bezier_points, points):
+        bp.co = co
+    return _add_object(name, curve)
+
+
+def armature(bones, name="Armature"):
+    """
+    Add an armature object and make it active.
+
+    :param bones: A list of (head, tail, parent index or None) tuples
+    """
+    import bpy
+
+    data = bpy.data.armatures.new(name)
+    ob = _add_object(name, data)
+    bpy.ops.object.mode_set(mode="EDIT")
+    edit_bones = []
+    for i, (head, tail, parent) in enumerate(bones):
+        bone = data.edit_bones.new(f"Bone.{i:03d}")
+        bone.head = head
+        bone.tail = tail
+        if parent is not None:
+            bone.parent = edit_bones[parent]
+        edit_bones.append(bone)
+    bpy.ops.object.mode_set(mode="OBJECT")
+    return ob
+
+
+def _add_object(name, data):
+    from bpy_extras.object_utils import object_data_add
+    import bpy
+
+    return object_data_add(bpy.context, data, name=name)
+
+
+def stick_figure_bones():
+    """A spine with a head, two arms and two legs."""
+    return [
+        ((0, 0, 1), (0, 0, 1.5), None),
+        ((0, 0, 1.5), (0, 0, 1.8), 0),
+        ((0, 0, 1.5), (0.5, 0, 1.4), 0),
+        ((0.5, 0, 1.4), (0.9, 0, 1.2), 2),
+        ((0, 0, 1.5), (-0.5, 0, 1.4), 0),
+        ((-0.5, 0, 1.4), (-0.9, 0, 1.2), 4),
+        ((0, 0, 1), (0.2, 0, 0.5), 0),
+        ((0.2, 0, 0.5), (0.2, 0, 0), 6),
+        ((0, 0, 1), (-0.2, 0, 0.5), 0),
+        ((-0.2, 0, 0.5), (-0.2, 0, 0), 8),
+    ]
+
+
+# scenarios: each one starts from an empty file, sets up a scene, runs an add-on and returns a short description
+
+
+def scenario_add_star():
+    import bpy
+
+    load_addon("add_star")
+    bpy.ops.object.add_star(points=12)
+    mesh = bpy.context.active_object.data
+    return f"{len(mesh.vertices)} vertices, {len(mesh.polygons)} faces"
+
+
+def scenario_add_star_interactive():
+    import bpy
+    import headless_recorder
+    from bpy_extras.view3d_utils import location_3d_to_region_2d
+    from mathutils import Vector
+
+    load_addon("add_star")
+    context = bpy.context
+    context.scene.cursor.location = Vector((0, 0, 1))  # the horizontal plane through the cursor, seen from a little below
+    mouse = lambda x: location_3d_to_region_2d(context.region, context.region_data, (x, 0, 1))
+
+    bpy.ops.object.add_star_interactive("INVOKE_DEFAULT")
+    operator = context.window_manager._modal_handlers[-1]
+    modal_event("MOUSEMOVE", "NOTHING", *mouse(1), shift=True)  # the inner radius can not exceed the outer one
+    modal_event("MOUSEMOVE", "NOTHING", *mouse(4))
+    assert abs(operator.outer_radius - 4) < 1e-4 and abs(operator.inner_radius - 4 / 1.5) < 1e-4
+    for _ in range(100):
+        modal_event("WHEELUPMOUSE", ctrl=True)
+    draw_view3d()
+    modal_event("MOUSEMOVE", "NOTHING", *mouse(2))
+    draw_view3d()
+    assert headless_recorder.count("draw") == 2 and headless_recorder.count("attr_fill") == 2
+    assert len(bpy.data.meshes) == 0, "nothing is added while placing the star"
+
+    outline = operator.outline.coordinates
+    assert modal_event("LEFTMOUSE") == {"FINISHED"}
+    star = context.active_object
+    vertices = [tuple(star.location + v.co) for v in star.data.vertices]
+    assert len(vertices) == len(outline) == 2 * 1005
+    assert max(abs(a - b) for vertex, co in zip(vertices, outline) for a, b in zip(vertex, co)) < 1e-4
+    assert not bpy.types.SpaceView3D._handlers
+
+    bpy.ops.object.add_star_interactive("INVOKE_DEFAULT")
+    assert modal_event("ESC") == {"CANCELLED"} and len(bpy.data.meshes) == 1
+
+    # the draw handler only gets the outline, never the operator, which Blender may free
+    bpy.ops.object.add_star_interactive("INVOKE_DEFAULT")
+    assert [type(arg).__name__ for _, args, *_ in bpy.types.SpaceView3D._handlers for arg in args] == ["StarOutline"]
+    area, context.area = context.area, None  # the area was closed while placing the star
+    assert modal_event("MOUSEMOVE", "NOTHING") == {"CANCELLED"} and not bpy.types.SpaceView3D._handlers
+    context.area = area
+    # when a file is loaded, Blender stops the operator with cancel() instead of modal()
+    bpy.ops.object.add_star_interactive("INVOKE_DEFAULT")
+    context.window_manager._modal_handlers.pop().cancel(context)
+    assert not bpy.types.SpaceView3D._handlers and len(bpy.data.meshes) == 1
+    return f"{len(vertices)} vertices, {operator.outer_radius:.1f} outer radius"
+
+
+def scenario_operator_profiler():
+    import bpy
+
+    # loaded first, so the add-ons below find it and decorate their operators
+    profiler = load_addon("operator_profiler")
+    assert profiler.mode == "TIMER", "register() reads the mode from the preferences"
+    for name in ("rig_curve", "skin_armature", "skin_radii", "move_x_batch", "distance_overlay"):
+        load_addon(name)
+    armature(stick_figure_bones())
+    bpy.ops.object.skin_armature()
+    calls = {method: t.calls for (idname, method), t in profiler.timings.items() if idname == "object.skin_armature"}
+    assert calls == {"poll": 1, "execute": 1}, calls
+    return f"{len({idname for idname, _ in profiler.timings})} operator timed, {len(profiler.sources)} decorated"
+
+
+def scenario_add_star_with_operators():
+    import bpy
+
+    load_addon("add_star_with_operators")
+    bpy.ops.object.add_star(points=12, uv_method="SMART_PROJECT")
+    bpy.ops.object.add_star(points=12, uv_method="PLANAR")
+    mesh = bpy.context.active_object.data
+    return f"{len(mesh.vertices)} vertices, {len(mesh.uv_layers)} uv map"
+
+
+def scenario_add_star_with_modifier():
+    import bpy
+
+    load_addon("add_star_with_modifier")
+    bpy.ops.object.add_star(points=12, uv_method="PLANAR")
+    mesh = bpy.context.active_object.data
+    uv = [tuple(round(c, 3) for c in loop.uv) for loop in mesh.uv_layers.active.data]
+    assert min(uv) >= (0, 0) and max(uv) <= (1, 1), uv
+    return f"{len(mesh.vertices)} vertices, {len(mesh.uv_layers)} uv map, {len(bpy.context.active_object.modifiers)} modifiers"
+
+
+def scenario_rig_curve():
+    import bpy
+
+    load_addon("rig_curve")
+    curve = bezier_curve([(i, 0, 0) for i in range(6)])
+    bpy.ops.object.rig_curve(size=0.2, ik=True)
+    hooks = [m for m in curve.modifiers if m.type == "HOOK"]
+    return f"{len(hooks)} hooks, {len(bpy.data.armatures[0].bones)} bones"
+
+
+def scenario_skin_armature():
+    import bpy
+
+    load_addon("skin_armature")
+    armature(stick_figure_bones())
+    bpy.ops.object.skin_armature()
+    mesh = bpy.data.meshes[0]
+    roots = sum(skin.use_root for skin in mesh.skin_vertices[0].data)
+    return f"{len(mesh.vertices)} vertices, {len(mesh.edges)} edges, {roots} roots"
+
+
+def scenario_rig_curve_function():
+    import bpy
+
+    module = load_addon("rig_curve")
+    curve = bezier_curve([(i, 0, 0) for i in range(6)])
+    bpy.context.view_layer.objects.active = None  # the function does not need an active object
+    rig = module.rig_curve(curve, bpy.context.scene.collection, size=0.2, ik=True)
+    hooks = [m for m in curve.modifiers if m.type == "HOOK"]
+    return f"{len(hooks)} hooks, {len(rig.data.bones)} bones, {sum(1 for op in hooks if op.object)} empties"
+
+
+def scenario_rig_curve_update():
+    import bpy
+
+    module = load_addon("rig_curve")
+    curve = bezier_curve([(i, 0, 0) for i in range(6)])
+    bpy.ops.object.rig_curve(size=0.2, ik=True)
+    rig = module.find_rig(curve)
+    points = curve.data.splines[0].bezier_points
+    # move one point and add two at the end
+    points[2].co = (2, 1, 0)
+    points.add(2)
+    points[6].co, points[7].co = (6, 0, 0), (7, 0, 0)
+    bpy.context.view_layer.objects.active = curve
+    bpy.ops.object.rig_curve_update()
+    assert module.update_rig(curve, rig) == (0, 0, 0)  # nothing changed since
+    bones = rig.data.bones
+    assert len(bones) == 7 and tuple(bones[1].tail_local) == (2, 1, 0) and tuple(bones[6].tail_local) == (7, 0, 0)
+    assert [len(rig.pose.bones[i].constraints) for i in range(7)] == [0, 0, 0, 0, 0, 0, 1]
+    # delete the last three points, Blender leaves their hooks without vertices
+    del points[5:]
+    for hook in curve.modifiers:
+        if hook.vertex_indices[0] >= 3 * len(points):
+            hook.vertex_indices_set([])
+    # and remove the constraint of one empty by hand, the update puts it back
+    empty = module.rig_hooks(curve, rig)[0][1].object
+    empty.constraints.remove(empty.constraints[0])
+    added, removed, moved = module.update_rig(curve, rig)
+    hooks = [m for m in curve.modifiers if m.type == "HOOK"]
+    assert len(hooks) == 5 and len(rig.data.bones) == 4 and len(rig.pose.bones[3].constraints) == 1
+    assert [(c.type, c.subtarget, c.head_tail) for c in empty.constraints] == [("COPY_LOCATION", "Bone.000", 1.0)]
+    return f"{len(hooks)} hooks, {len(rig.data.bones)} bones, last update: {added} added, {removed} removed, {moved} moved"
+
+
+def scenario_rig_curve_bake():
+    import bpy
+    import tempfile
+
+    module = load_addon("rig_curve")
+    curve = bezier_curve([(i, 0, 0) for i in range(4)])
+    bpy.ops.object.rig_curve(size=0.2, ik=True)
+    curve.select_set(True)
+    bpy.ops.object.rig_curve_bake(frame_start=1, frame_end=5, use_disk=False)
+    _, frame_start, bake = module.baked_curves[curve.session_uid]
+    assert bake.shape == (6, 4, 3, 3) and not any(m.show_viewport for m in curve.modifiers)
+    bake[3, :, :, 2] += 1  # the rig has no effect here, so pretend it lifted the curve on frame 3
+    bpy.context.scene.frame_set(3)
+    lifted = [bp.co[2] for bp in curve.data.splines[0].bezier_points]
+    bpy.context.scene.frame_set(1)
+    assert lifted == [1, 1, 1, 1] and curve.data.splines[0].bezier_points[0].co[2] == 0
+
+    # an unsaved file has no directory that // could be relative to
+    try:
+        bpy.ops.object.rig_curve_bake(frame_start=1, frame_end=10, use_disk=True, directory="//rig_curve_bake")
+    except RuntimeError as e:
+        assert "Save the .blend file" in str(e)
+    else:
+        raise AssertionError("baked to a relative directory of an unsaved file")
+
+    # names that clean_name() makes the same still get their own files
+    assert module.bake_file_name("a.b") != module.bake_file_name("a_b")
+    with tempfile.TemporaryDirectory() as directory:
+        bpy.ops.object.rig_curve_bake(frame_start=1, frame_end=10, use_disk=True, directory=directory)
+        files = [path.name for path in Path(directory).iterdir()]
+        module.baked_curves.clear()  # as if the file was loaded again
+        module.sync_bakes()
+        assert len(module.baked_curves[curve.session_uid][2]) == 11
+        bpy.ops.object.rig_curve_free_bake()
+    assert not module.baked_curves and module.play_bakes not in bpy.app.handlers.frame_change_pre
+    assert all(m.show_viewport for m in curve.modifiers)
+    return f"baked to {files}, {len(curve.modifiers)} hooks on again"
+
+
+def scenario_skin_armature_function():
+    import bpy
+
+    module = load_addon("skin_armature")
+    rig = armature(stick_figure_bones())
+    bpy.context.view_layer.objects.active = None  # the function does not need an active object
+    figure = module.skin_armature(rig, bpy.context.scene.collection)
+    mesh = figure.data
+    roots = sum(skin.use_root for skin in mesh.skin_vertices[0].data)
+    return f"{len(mesh.vertices)} vertices, {len(mesh.edges)} edges, {roots} roots, {len(figure.vertex_groups)} groups"
+
+
+def scenario_skin_armature_update():
+    import bpy
+    import headless_recorder
+
+    module = load_addon("skin_armature")
+    rig = armature(stick_figure_bones())
+    figure = module.skin_armature(rig, bpy.context.scene.collection)
+    mesh = figure.data
+    hand = module.stored_bones(mesh)["Bone.003"][1]
+    mesh.skin_vertices[0].data[hand].radius = (0.1, 0.1)
+
+    # move a foot: only that vertex changes
+    bpy.context.view_layer.objects.active = rig
+    bpy.ops.object.mode_set(mode="EDIT")
+    rig.data.edit_bones["Bone.007"].tail = (0.3, 0, 0)
+    bpy.ops.object.mode_set(mode="OBJECT")
+    bpy.ops.object.skin_armature_update()
+    assert tuple(mesh.vertices[module.stored_bones(mesh)["Bone.007"][1]].co) == (0.3, 0, 0)
+    assert headless_recorder.count("bmesh") == 0
+
+    # delete the other foot and add a finger
+    bpy.ops.object.mode_set(mode="EDIT")
+    edit_bones = rig.data.edit_bones
+    edit_bones.remove(edit_bones["Bone.009"])
+    finger = edit_bones.new("Finger")
+    finger.head, finger.tail, finger.parent = (0.9, 0, 1.2), (1.1, 0, 1.1), edit_bones["Bone.003"]
+    bpy.ops.object.mode_set(mode="OBJECT")
+    added, removed, moved = module.update_skin(figure, rig)
+    mesh = figure.data
+    bones = module.stored_bones(mesh)
+    radii = mesh.skin_vertices[0].data
+    assert (added, removed, moved) == (1, 1, 0) and len(mesh.vertices) == 11
+    assert tuple(radii[bones["Bone.003"][1]].radius) == tuple(radii[bones["Finger"][1]].radius) == (0.1, 0.1)
+    assert "Bone.009" not in figure.vertex_groups and figure.vertex_groups["Finger"]
+    roots = sum(skin.use_root for skin in radii)
+    return f"{len(mesh.vertices)} vertices, {len(mesh.edges)} edges, {roots} roots, {len(figure.vertex_groups)} groups"
+
+
+def scenario_skin_armature_lod():
+    import bpy
+
+    module = load_addon("skin_armature")
+    collection = bpy.context.scene.collection
+    camera = _add_object("Camera", None)
+    bpy.context.scene.camera = camera
+    figures = []
+    for y in (0, 20, 40, 80):
+        rig = armature(stick_figure_bones(), name=f"Armature.{y}")
+        rig.location = (0, y, 0)
+        figures.append(module.skin_armature(rig, collection))
+    for ob in bpy.context.view_layer.objects.selected:
+        ob.select_set(False)
+    for figure in figures:
+        figure.parent.select_set(True)
+    bpy.ops.object.skin_armature_lod(distances=(10, 30, 60))
+    subdivision = [module.lod_modifiers(figure)[0] for figure in figures]
+    decimate = [module.lod_modifiers(figure)[1] for figure in figures]
+    assert [m.levels for m in subdivision] == [2, 1, 0, 0] and [m.show_viewport for m in decimate] == [False] * 3 + [True]
+    assert all(m.render_levels == 2 for m in subdivision) and not any(m.show_render for m in decimate)
+
+    # just past a distance nothing changes, well past it the figure switches
+    camera.location = (0, -10.3, 0)
+    depsgraph_update(camera)
+    assert subdivision[0].levels == 2 and subdivision[1].levels == 1
+    camera.location = (0, -12, 0)
+    depsgraph_update(camera)
+    assert subdivision[0].levels == 1 and subdivision[1].levels == 0
+    camera.location = (0, 15, 0)
+    bpy.context.scene.frame_set(2)
+    levels = [figure[module.LOD_PROPERTY]["level"] for figure in figures]
+    assert levels == [1, 0, 1, 3], levels
+
+    # modifiers deleted by hand: the handler carries on, a missing LOD Decimate is added again when needed
+    figures[0].modifiers.remove(subdivision[0])
+    figures[3].modifiers.remove(decimate[3])
+    camera.location = (0, 200, 0)
+    bpy.context.scene.frame_set(3)
+    assert figures[0].modifiers.get("LOD Decimate").show_viewport
+    camera.location = (0, 80, 0)
+    bpy.context.scene.frame_set(4)
+    camera.location = (0, 15, 0)
+    bpy.context.scene.frame_set(5)
+    assert figures[3].modifiers.get("LOD Decimate").show_viewport
+
+    bpy.ops.object.skin_armature_lod(use_lod=False)
+    assert [m.levels for m in subdivision[1:]] == [2] * 3 and not any(figure.modifiers.get("LOD Decimate") for figure in figures)
+    assert module.play_lod not in bpy.app.handlers.frame_change_post
+    return f"levels {levels} after moving the camera"
+
+
+def scenario_skin_skeleton():
+    import bpy
+    import tempfile
+
+    load_addon("skin_armature")
+    bvh = """HIERARCHY
+    ROOT Hips { OFFSET 0 0 0 CHANNELS 6 Xposition Yposition Zposition Zrotation Xrotation Yrotation
+        JOINT Spine { OFFSET 0 10 0 CHANNELS 3 Zrotation Xrotation Yrotation End Site { OFFSET 0 8 0 } }
+        JOINT Leg.L { OFFSET 2 0 0 CHANNELS 3 Zrotation Xrotation Yrotation End Site { OFFSET 0 -9 0 } }
+        JOINT Leg.R { OFFSET -2 0 0 CHANNELS 3 Zrotation Xrotation Yrotation End Site { OFFSET 0 -9 0 } }
+    }
+    MOTION
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "skeleton.bvh"
+        path.write_text(bvh)
+        bpy.ops.import_scene.skin_skeleton(filepath=str(path), scale=0.1)
+    mesh = bpy.context.active_object.data
+    roots = sum(skin.use_root for skin in mesh.skin_vertices[0].data)
+    return f"{len(mesh.vertices)} vertices, {len(mesh.edges)} edges, {roots} roots"
+
+
+def scenario_skin_radii():
+    import bpy
+
+    load_addon("skin_armature")
+    load_addon("skin_radii")
+    armature(stick_figure_bones())
+    bpy.ops.object.skin_armature()
+    bpy.context.view_layer.objects.active = bpy.data.objects["Stick figure"]
+    bpy.ops.object.skin_radii(mode="TAPER", start_radius=0.2, end_radius=0.05)
+    radii = [skin.radius[0] for skin in bpy.data.meshes[0].skin_vertices[0].data]
+    return f"radii from {min(radii):.3f} to {max(radii):.3f}"
+
+
+def scenario_move_x_batch():
+    import bpy
+
+    load_addon("move_x_batch")
+    from bpy_extras.object_utils import object_data_add
+
+    for i in range(100):
+        object_data_add(bpy.context, bpy.data.meshes.new("Mesh"), name="Cube").location = (i, 0, 0)
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.ops.object.move_x(mode="TRANSLATE", amount=1.0)
+    obs = bpy.data.objects
+    obs[0]["weight"], obs[1]["weight"], obs[2]["weight"], obs[3]["weight"] = 2, 0.5, "heavy", obs[0]
+    bpy.ops.object.move_x(mode="TRANSLATE", amount=1.0, source="PROPERTY", property_name="weight")
+    assert [ob.location.x for ob in obs[:5]] == [3, 2.5, 3, 4, 5], [ob.location.x for ob in obs[:5]]
+    return f"first object at x={obs[0].location.x:.1f}"
+
+
+def scenario_move_x_batch_parents():
+    import bpy
+    import headless_recorder
+    from math import radians
+    from mathutils import Matrix
+
+    load_addon("move_x_batch")
+    from bpy_extras.object_utils import object_data_add
+
+    grandparent, parent, child = (object_data_add(bpy.context, None, name=name) for name in ("Root", "Arm", "Hand"))
+    parent.parent, parent.location = grandparent, (0, 2, 0)
+    child.parent, child.location = parent, (0, 0, 3)
+    child.matrix_parent_inverse = Matrix.Translation((0, 0, -1))
+    bpy.ops.object.select_all(action="DESELECT")
+    grandparent.select_set(True)
+    child.select_set(True)  # its parent is not selected, but follows the grandparent
+    headless_recorder.clear()
+    bpy.ops.object.move_x(mode="ROTATE", axis=(0, 0, 1), angle=radians(90))
+    # Blender converts a written matrix_world with the parent matrix of the last depsgraph update,
+    # so only local matrices may be written, and only the grandparent's may change
+    assert not any(event[2] == "matrix_world" for event in headless_recorder.events if event[0] in ("set", "foreach_set"))
+    assert [round(v, 5) for v in parent.location] == [0, 2, 0], parent.location
+    assert [round(v, 5) for v in child.location] == [0, 0, 3], child.location
+    # world = grandparent @ parent @ parent inverse @ child, and the grandparent turned a quarter
+    world = [round(v, 5) + 0 for v in child.matrix_world.translation]
+    assert world == [-2, 0, 2], world
+    return f"hand at {world}"
+
+
+def scenario_distance_overlay():
+    import bpy
+    import headless_recorder
+
+    load_addon("distance_overlay")
+    from bpy_extras.object_utils import object_data_add
+
+    for i in range(5):
+        object_data_add(bpy.context, bpy.data.meshes.new("Mesh"), name="Cube").location = (i, i, 0)
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.ops.object.distance_overlay()
+    draw_view3d()
+    draw_view3d()
+    bpy.ops.object.distance_overlay_remove()
+    draw_view3d()
+    return f"{headless_recorder.count('draw')} lines, {headless_recorder.count('blf', 'draw')} labels"
+
+
+def scenario_distance_overlay_bands():
+    import bpy
+    import headless_recorder
+    import numpy as np
+
+    module = load_addon("distance_overlay")
+    from bpy_extras.object_utils import object_data_add
+
+    for i in range(50):
+        object_data_add(bpy.context, bpy.data.meshes.new("Mesh"), name="Cube").location = (i, 0, 0)
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.context.view_layer.objects.active = bpy.data.objects["Cube"]
+    prefs = bpy.context.preferences.addons["distance_overlay"].preferences
+    prefs.use_bands = True
+    prefs.near_distance, prefs.far_distance = 5, 20
+    bpy.ops.object.distance_overlay()
+    draw_view3d()
+    palette = (prefs.near_color, prefs.ok_color, prefs.far_color)
+    colors = module.band_colors(np.arange(1, 50, dtype=np.float64), (5, 20), palette)
+    bands = [int(np.all(colors == np.float32(color), axis=1).sum()) for color in palette]
+    assert bands == [4, 16, 29], bands
+    bpy.ops.object.distance_overlay_remove()
+    return f"{headless_recorder.count('draw')} line batches, {headless_recorder.count('blf', 'draw')} labels, bands {bands}"
+
+
+def scenario_distance_overlay_surface():
+    import bpy
+    import headless_recorder
+
+    module = load_addon("distance_overlay")
+    from bpy_extras.object_utils import object_data_add
+
+    mesh = bpy.data.meshes.new("Mesh")
+    mesh.from_pydata(
+        [(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)],
+        [],
+        [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)],
+    )
+    cubes = [object_data_add(bpy.context, mesh, name="Cube") for _ in range(3)]
+    for i, cube in enumerate(cubes):
+        cube.location = (3 * i, 0.5 * i, 0)
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.context.view_layer.objects.active = cubes[0]
+    bpy.context.scene.distance_mode = "SURFACE"
+    bpy.ops.object.distance_overlay()
+    endpoints, calls = module.endpoints, []
+    module.endpoints = lambda: calls.append(1) or endpoints()
+    draw_view3d()
+    assert len(calls) == 1, "the line and label handlers share the lines of a redraw"
+    distances = sorted(round((q - p).length, 3) for p, q, *_ in module.surface_distances.points.values())
+    assert distances == [1.0, 4.0], distances
+    draw_view3d()  # nothing moved, so nothing is recalculated
+    assert len(calls) == 1, calls
+    cubes[1].location = (2.5, 0, 0)
+    depsgraph_update(cubes[1])
+    draw_view3d()
+    assert len(calls) == 2, calls
+    module.endpoints = endpoints
+    distances = sorted(round((q - p).length, 3) for p, q, *_ in module.surface_distances.points.values())
+    assert distances == [0.5, 4.0], distances
+    depsgraph_update(cubes[2], geometry=True)
+    assert len(module.surface_distances.points) == 1
+    bpy.ops.object.distance_overlay_remove()
+    return f"{headless_recorder.count('draw')} lines, {headless_recorder.count('blf', 'draw')} labels, distances {distances}"
+
+
+def scenario_distance_overlay_export():
+    import bpy
+    import csv
+    import tempfile
+    import numpy as np
+
+    module = load_addon("distance_overlay")
+    from bpy_extras.object_utils import object_data_add
+
+    for i in range(5):
+        object_data_add(bpy.context, bpy.data.meshes.new("Mesh"), name="Cube").location = (3 * i, 4 * i, 0)
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.context.view_layer.objects.active = bpy.data.objects["Cube"]
+    bpy.ops.object.distance_overlay()
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "distances.csv"
+        bpy.ops.object.distance_overlay_export(filepath=str(path), use_frame_range=True, frame_start=1, frame_end=3)
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        path = Path(directory) / "distances.npy"
+        module.export_distances(path, module.active, module.targets, bpy.context.scene, chunk_size=3)
+        report = np.load(path)
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        module.export_distances(path, module.active, module.targets, bpy.context.scene, mode="SURFACE", depsgraph=depsgraph)
+        assert not module.surface_distances.surfaces, "the export keeps no surfaces"
+    assert [float(row["distance"]) for row in rows[:4]] == [5, 10, 15, 20], rows
+    assert report["distance"].tolist() == [5, 10, 15, 20] and report["midpoint"][0].tolist() == [1.5, 2, 0], report
+    bpy.ops.object.distance_overlay_remove()
+    return f"{len(rows)} csv rows, {len(report)} npy rows"
+
+
+def scenario_bounding_box_overlay():
+    import bpy
+    import headless_recorder
+
+    module = load_addon("bounding_box_overlay")
+    from bpy_extras.object_utils import object_data_add
+
+    mesh = bpy.data.meshes.new("Mesh")
+    mesh.from_pydata([(0, 0, 0), (1, 1, 1)], [(0, 1)], [])
+    obs = [object_data_add(bpy.context, mesh, name="Cube") for _ in range(50)]
+    bpy.ops.object.select_all(action="SELECT")
+    bpy.context.scene.show_bounding_boxes = True
+    draw_view3d()
+    obs[0].location = (5, 0, 0)
+    depsgraph_update(obs[0])
+    draw_view3d()
+    # a removed object keeps its last box, so there is nothing to upload
+    uploads = headless_recorder.count("attr_fill")
+    bpy.data.objects.remove(obs[1])
+    module.boxes.tag(obs[1])
+    draw_view3d()
+    assert headless_recorder.count("attr_fill") == uploads, "nothing changed"
+    # a file saved with the overlay switched on shows its boxes right after loading
+    module.boxes = None
+    for handler in list(bpy.app.handlers.load_post):
+        handler(None)
+    draws = headless_recorder.count("draw")
+    draw_view3d()
+    assert headless_recorder.count("draw") == draws + 1, "boxes drawn after loading"
+    bpy.context.scene.show_bounding_boxes = False
+    return f"{headless_recorder.count('draw')} batches, {headless_recorder.count('attr_fill')} uploads"
+
+
+SCENARIOS = {
+    name[len("scenario_") :]: function for name, function in globals().items() if name.startswith("scenario_")
+}
+
+
+def run(name, quiet=True):
+    """
+    Run a scenario in an empty file, then unregister the add-ons it loaded.
+
+    :param name: The name of the scenario
+    :param quiet: Swallow anything the add-ons print
+    :return: The description the scenario returns, the time it took and the recorded events
+    """
+    reset()
+    import headless_recorder
+
+    modules = set(sys.modules)
+    with redirect_stdout(io.StringIO() if quiet else sys.stdout):
+        start = perf_counter()
+        description = SCENARIOS[name]()
+        elapsed = perf_counter() - start
+    events = list(headless_recorder.events)
+    for module_name in set(sys.modules) - modules:
+        module = sys.modules[module_name]
+        if module_name in loaded:
+            unload_addon(module)
+        elif getattr(module, "__file__", "") and Path(module.__file__).parent.parent == ROOT:
+            sys.modules.pop(module_name)  # imported by another add-on, but never registered
+    return description, elapsed, events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the add-ons with the headless stand-in for bpy")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run, all by default: {', '.join(SCENARIOS)}")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every recorded event")
+    args = parser.parse_args()
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name}")
+
+    from collections import Counter
+
+    for name in args.scenarios or SCENARIOS:
+        description, elapsed, events = run(name, quiet=not args.verbose)
+        print(f"{name:<28} {elapsed * 1000:8.1f} ms  {description}")
+        counts = Counter(event[:2] for event in events)
+        for (kind, what), count in sorted(counts.items(), key=str):
+            print(f"    {kind:<16} {str(what):<32} {count:6d}")
+        if args.verbose:
+            for event in events:
+                print("       ", event)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,49 +4,29 @@
 
 import bpy
 import gpu
+import numpy as np
 
 from gpu_extras.batch import batch_for_shader
-from mathutils import Vector
 
 # UNIFORM_COLOR is deprecated, so use POLYLINE_UNIFORM_COLOR
 uniform_shader = gpu.shader.from_builtin("POLYLINE_UNIFORM_COLOR")
 
-
-def draw_line(p0, p1, color, width):
-    """
-    Draw a line from p0 -> p0 in 3d space.
-
-    :param p0: Vector
-    :param p1: Vector
-    :param color: Vector (4 elements, rgba)
-    """
-    batch = batch_for_shader(uniform_shader, "LINES", {"pos": [p0, p1]})
-    uniform_shader.bind()
-    uniform_shader.uniform_float("color", color)
-    uniform_shader.uniform_float("viewportSize", gpu.state.viewport_get()[2:])
-    uniform_shader.uniform_float("lineWidth", width)
-    batch.draw(uniform_shader)
-
-
-def draw_handler_post_view():
-    """
-    This handler is responsible for drawing items in the 3d view.
-
-    It deals with view camera settings like perspective and clipping automatically.
-
-    It is a simple example, drawing a 2x2x2 cube centered on the origin.
-    """
-    verts = [
-        Vector((-1, -1, -1)),
-        Vector((1, -1, -1)),
-        Vector((1, 1, -1)),
-        Vector((-1, 1, -1)),
-        Vector((-1, -1, 1)),
-        Vector((1, -1, 1)),
-        Vector((1, 1, 1)),
-        Vector((-1, 1, 1)),
-    ]
-    edges = [
+# a 2x2x2 cube centered on the origin
+CUBE_VERTS = np.array(
+    [
+        (-1, -1, -1),
+        (1, -1, -1),
+        (1, 1, -1),
+        (-1, 1, -1),
+        (-1, -1, 1),
+        (1, -1, 1),
+        (1, 1, 1),
+        (-1, 1, 1),
+    ],
+    dtype=np.float32,
+)
+CUBE_EDGES = np.array(
+    [
         (0, 1),
         (1, 2),
         (2, 3),
@@ -59,11 +39,96 @@ def draw_handler_post_view():
         (1, 5),
         (2, 6),
         (3, 7),
-    ]
-    line_color = Vector((1, 0, 0, 1))  # red
-    width = 5
-    for v1, v2 in edges:
-        draw_line(verts[v1], verts[v2], line_color, width)
+    ],
+    dtype=np.int32,
+)
+
+
+def bounding_box_geometry(objects):
+    """
+    Return the world space bounding boxes of objects as one set of vertices and edges.
+
+    :param objects: A list of objects
+    :return: An array of shape (8n, 3) with vertices and one of shape (12n, 2) with edges
+
+    The eight corners of each box are transformed by the world matrix of its
+    object with a single matrix multiplication for all objects.
+    """
+    n = len(objects)
+    corners = np.array([ob.bound_box for ob in objects], dtype=np.float32).reshape(n, 8, 3)
+    matrices = np.array([ob.matrix_world for ob in objects], dtype=np.float32).reshape(n, 4, 4)
+    verts = corners @ matrices[:, :3, :3].transpose(0, 2, 1) + matrices[:, None, :3, 3]
+    # the corners in Object.bound_box are ordered differently from our cube,
+    # but they happen to be connected in exactly the same way, so we can reuse the edges
+    edges = CUBE_EDGES[None, :, :] + 8 * np.arange(n, dtype=np.int32)[:, None, None]
+    return verts.reshape(-1, 3), edges.reshape(-1, 2)
+
+
+def mesh_geometry(ob):
+    """
+    Return the world space vertices and the edges of a mesh object.
+
+    :param ob: A mesh object
+    :return: An array of shape (n, 3) with vertices and one of shape (m, 2) with edges
+    """
+    mesh = ob.data
+    verts = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", verts)
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+    matrix = np.array(ob.matrix_world, dtype=np.float32)
+    verts = verts.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+    return verts, edges.reshape(-1, 2)
+
+
+class WireframeOverlay:
+    """
+    A wireframe that is drawn in the 3d view with a single draw call.
+
+    The geometry is uploaded to the GPU once, as a vertex buffer plus an index
+    buffer with the edges, when the overlay is created. Drawing a frame then
+    only means binding the shader and drawing that one batch, no matter how many
+    edges there are.
+
+    The geometry is fixed; if it changes, simply create a new overlay.
+    """
+
+    def __init__(self, verts, edges, color=(1, 0, 0, 1), width=5):
+        """
+        :param verts: A sequence of 3d coordinates (anything that is convertible to a (n, 3) float array)
+        :param edges: A sequence of pairs of vertex indices
+        :param color: The line color (4 elements, rgba)
+        :param width: The line width in pixels
+        """
+        verts = np.ascontiguousarray(verts, dtype=np.float32)
+        edges = np.ascontiguousarray(edges, dtype=np.int32)
+        self.batch = batch_for_shader(uniform_shader, "LINES", {"pos": verts}, indices=edges)
+        self.color = color
+        self.width = width
+        self.handler = None
+
+    def draw(self):
+        """Draw the complete wireframe."""
+        uniform_shader.bind()
+        uniform_shader.uniform_float("color", self.color)
+        uniform_shader.uniform_float("viewportSize", gpu.state.viewport_get()[2:])
+        uniform_shader.uniform_float("lineWidth", self.width)
+        self.batch.draw(uniform_shader)
+
+    def show(self):
+        """Start drawing the wireframe in every 3d view."""
+        if self.handler is None:
+            self.handler = bpy.types.SpaceView3D.draw_handler_add(
+                self.draw, (), "WINDOW", "POST_VIEW"
+            )
+            redraw()
+
+    def hide(self):
+        """Stop drawing the wireframe."""
+        if self.handler is not None:
+            bpy.types.SpaceView3D.draw_handler_remove(self.handler, "WINDOW")
+            self.handler = None
+            redraw()
 
 
 def redraw():
@@ -79,14 +144,16 @@ def redraw():
 
 
 if __name__ == "__main__":
-    handler = bpy.types.SpaceView3D.draw_handler_add(
-        draw_handler_post_view, (), "WINDOW", "POST_VIEW"
-    )
-
-    redraw()
-
-    # evil hack so we can remove the handler from the Python console
-    __builtins__["handler"] = handler
-    
-    # in the Python console us the following line to remove the handler:
-    # bpy.types.SpaceView3D.draw_handler_remove(__builtins__.handler, "WINDOW")
\ No newline at end of file
+    # a simple example, drawing a 2x2x2 cube centered on the origin
+    # if any objects are selected, we draw their bounding boxes instead
+    if bpy.context.selected_objects:
+        overlay = WireframeOverlay(*bounding_box_geometry(bpy.context.selected_objects))
+    else:
+        overlay = WireframeOverlay(CUBE_VERTS, CUBE_EDGES)
+    overlay.show()
+
+    # evil hack so we can remove the overlay from the Python console
+    __builtins__["overlay"] = overlay
+
+    # in the Python console us the following line to remove the overlay:
+    # __builtins__.overlay.hide()
@@ -2,24 +2,165 @@
 #
 # SPDX-License-Identifier: GPL-2.0-or-later
 
+from functools import lru_cache
+
 import bpy
 import gpu
 import blf
+import numpy as np
 
-from bpy_extras import view3d_utils
 from mathutils import Vector
 
-def draw_handler_post_pixel():
-    verts = [
-        Vector((-1, -1, -1)),
-        Vector((1, -1, -1)),
-        Vector((1, 1, -1)),
-        Vector((-1, 1, -1)),
-        Vector((-1, -1, 1)),
-        Vector((1, -1, 1)),
-        Vector((1, 1, 1)),
-        Vector((-1, 1, 1)),
+
+def project(coords, region, rv3d):
+    """
+    Convert many 3d coordinates to 2d locations inside a VIEW3D region at once.
+
+    :param coords: An array of shape (n, 3)
+    :param region: The region, for example bpy.context.region
+    :param rv3d: The 3d region data, for example bpy.context.space_data.region_3d
+    :return: An array of shape (n, 2) and a boolean array that is True for points in front of the viewer
+
+    This does exactly what bpy_extras.view3d_utils.location_3d_to_region_2d() does,
+    but for all points in a single matrix multiplication.
+    """
+    matrix = np.array(rv3d.perspective_matrix, dtype=np.float64)
+    clip = coords @ matrix[:3, :3].T + matrix[:3, 3]
+    w = coords @ matrix[3, :3] + matrix[3, 3]
+    in_front = w > 0
+    w = np.where(in_front, w, 1)
+    half = np.array((region.width / 2, region.height / 2))
+    return half + half * clip[:, :2] / w[:, None], in_front
+
+
+@lru_cache(maxsize=65536)
+def format_label(fmt, value):
+    """Return a formatted label, remembering the result so the same label is formatted only once."""
+    return fmt.format(value)
+
+
+class LabelCache:
+    """
+    Draw many labels at 3d positions without doing the same work every redraw.
+
+    - the 2d positions and texts are only recalculated if the view, the region
+      size, the coordinates or the values changed since the previous redraw
+    - labels outside the region or behind the viewer are dropped
+    - if a bin size is given, the region is divided into square bins and only
+      one label is drawn per bin, so the number of labels drawn is limited by
+      the size of the region, not by the number of points (and they don't overlap)
+    """
+
+    def __init__(self, fmt="{}", bin_size=32):
+        """
+        :param fmt: A format string for the label values
+        :param bin_size: The size of a bin in pixels, or None to draw all visible labels
+        """
+        self.fmt = fmt
+        self.bin_size = bin_size
+        self.key = None
+        self.coords = None
+        self.values = None
+        self.labels = []
+
+    def unchanged(self, key, coords, values):
+        """Check if the view, coordinates and values are the same as the previous time."""
+        return (
+            key == self.key
+            and self.coords is not None
+            and np.array_equal(coords, self.coords)
+            and (values is None) == (self.values is None)
+            and (values is None or np.array_equal(values, self.values))
+        )
+
+    def layout(self, coords, values, region, rv3d):
+        """
+        Return a list of (x, y, text) tuples for the labels that should be drawn.
+
+        :param coords: An array of shape (n, 3) with the 3d positions of the labels
+        :param values: An array with n values to format, or None to use the index of each position
+        :param region: The region, for example bpy.context.region
+        :param rv3d: The 3d region data, for example bpy.context.space_data.region_3d
+        """
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        key = (region.width, region.height, tuple(v for row in rv3d.perspective_matrix for v in row))
+        if self.unchanged(key, coords, values):
+            return self.labels
+        self.key = key
+        self.coords = coords.copy()
+        self.values = None if values is None else np.array(values)
+
+        positions, visible = project(coords, region, rv3d)
+        visible &= (positions[:, 0] >= 0) & (positions[:, 0] < region.width)
+        visible &= (positions[:, 1] >= 0) & (positions[:, 1] < region.height)
+        indices = np.flatnonzero(visible)
+
+        if self.bin_size and len(indices):
+            bins = (positions[indices] // self.bin_size).astype(np.int64)
+            columns = region.width // self.bin_size + 1
+            # np.unique returns the first occurrence of every bin
+            _, first = np.unique(bins[:, 1] * columns + bins[:, 0], return_index=True)
+            indices = indices[np.sort(first)]
+
+        self.labels = [
+            (
+                x,
+                y,
+                format_label(self.fmt, i.item() if values is None else self.values[i].item()),
+            )
+            for i, (x, y) in zip(indices, positions[indices].tolist())
+        ]
+        return self.labels
+
+    def draw(self, font_id, coords, values, region, rv3d):
+        """
+        Draw the labels with the current font settings.
+
+        :param font_id: The blf font id
+        See layout() for the other parameters.
+        """
+        for x, y, text in self.layout(coords, values, region, rv3d):
+            blf.position(font_id, x, y, 0)
+            blf.draw(font_id, text)
+
+
+def vertex_coordinates(ob):
+    """Return the world space coordinates of all vertices of a mesh object as an (n, 3) array."""
+    mesh = ob.data
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    matrix = np.array(ob.matrix_world)
+    return coords.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+cube_verts = np.array(
+    [
+        (-1, -1, -1),
+        (1, -1, -1),
+        (1, 1, -1),
+        (-1, 1, -1),
+        (-1, -1, 1),
+        (1, -1, 1),
+        (1, 1, 1),
+        (-1, 1, 1),
     ]
+)
+
+vertex_labels = LabelCache()
+
+
+def draw_handler_post_pixel():
+    """
+    Draw the vertex indices of the active mesh object, or of a cube if there is none.
+
+    Even for meshes with hundreds of thousands of vertices this stays interactive,
+    because only one label per 32x32 pixel bin is drawn.
+    """
+    ob = bpy.context.active_object
+    if ob is not None and ob.type == "MESH" and ob.mode == "OBJECT":
+        verts = vertex_coordinates(ob)
+    else:
+        verts = cube_verts
 
     gpu.state.blend_set("ALPHA")  # necessary for font shadows to work as intended if they are (partially) transparent
 
@@ -36,14 +177,10 @@ def draw_handler_post_pixel():
     blf.position(0, 100, 100, 0)
     blf.draw(font_id, "Hello, world!")
 
-    for index, coords_3d in enumerate(verts):
-        coords_2d = view3d_utils.location_3d_to_region_2d(
-            region=bpy.context.region,
-            rv3d=bpy.context.space_data.region_3d,
-            coord=coords_3d,
-        )
-        blf.position(0, *coords_2d, 0)
-        blf.draw(font_id, f"{index}")
+    vertex_labels.draw(
+        font_id, verts, None, bpy.context.region, bpy.context.space_data.region_3d
+    )
+
 
 def redraw():
     for s in bpy.data.screens:
@@ -60,6 +197,6 @@ if __name__ == "__main__":
 
     # evil hack so we can remove the handler from the Python console
     __builtins__["label_handler"] = label_handler
-    
+
     # in the Python console us the following line to remove the handler:
-    # bpy.types.SpaceView3D.draw_handler_remove(__builtins__.label_handler, "WINDOW")
\ No newline at end of file
+    # bpy.types.SpaceView3D.draw_handler_remove(__builtins__.label_handler, "WINDOW")